@@ -0,0 +1,64 @@
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 1.2
+
+Prints the time and memory ratio (candidate / baseline) for every case
+present in both files and exits with status 1 if any wall time ratio
+exceeds the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def _index(doc):
+    return {
+        (r["benchmark"], r["n_skus"], r["n_periods"]): r
+        for r in doc["results"]
+        if "error" not in r
+    }
+
+
+def compare(baseline: dict, candidate: dict, threshold: float = 1.2):
+    """
+    Rows of (key, time_ratio, mem_ratio, regressed) for cases in both runs.
+    """
+    base, cand = _index(baseline), _index(candidate)
+    rows = []
+    for key in sorted(base.keys() & cand.keys(), key=str):
+        b, c = base[key], cand[key]
+        time_ratio = (
+            c["wall_s_min"] / b["wall_s_min"] if b["wall_s_min"] else float("nan")
+        )
+        mem_ratio = (
+            c["peak_mem_mb"] / b["peak_mem_mb"] if b["peak_mem_mb"] else float("nan")
+        )
+        rows.append((key, time_ratio, mem_ratio, time_ratio > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare benchmark results.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.threshold)
+    for (name, n_skus, n_periods), t, m, bad in rows:
+        flag = "  REGRESSION" if bad else ""
+        print(
+            f"{name:<28} skus={n_skus:<7} periods={n_periods}  time x{t:.2f}  mem x{m:.2f}{flag}"
+        )
+    return 1 if any(r[3] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
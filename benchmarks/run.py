@@ -0,0 +1,371 @@
+"""
+Benchmark the forecasting and inventory hot paths on synthetic data.
+
+    python -m benchmarks.run --skus 1 100 1000 --periods 24 120 --out bench.json
+    python -m benchmarks.run --preset full --out bench.json
+    python -m benchmarks.compare old.json new.json
+
+Per-series functions are timed over at most --per-series-cap SKUs of each
+panel and report per-SKU time; panel functions run on the whole panel.
+Wall time is the best of --repeat runs; peak memory is the tracemalloc
+high-water mark of one extra run (Python allocations only, native XGBoost
+buffers are not included). Results are written as JSON.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost
+
+from src.feature_engineering import make_time_features
+from src.forecasting.xgb_model import train_xgb, forecast_xgb
+from src.forecasting.croston import croston_sba
+from src.forecasting.batch_forecast import hybrid_forecast_batch
+from src.forecasting.hierarchy import Hierarchy, reconcile
+from src.forecasting.hybrid_forecast import automatic_hybrid_weight_panel
+from src.inventory.demand_reconstruction import (
+    reconstruct_demand,
+    reconstruct_demand_fast,
+)
+from src.inventory.safety_stock import (
+    compute_safety_stock,
+    compute_safety_stock_panel,
+)
+from src.inventory.inventory_simulation import simulate_inventory_with_rop
+
+from .synthetic import make_panel, make_orders, panel_series
+
+PRESETS = {
+    "quick": {"skus": [1, 100], "periods": [24, 60]},
+    "default": {"skus": [1, 100, 1000], "periods": [24, 60, 120]},
+    "full": {"skus": [1, 100, 1000, 10_000, 100_000], "periods": [24, 60, 120, 240]},
+}
+STEPS = 6
+SMALL_XGB = {"n_estimators": 50, "max_depth": 3}
+
+
+# ----------------------------------------------------------------------
+# cases: each takes the prepared inputs and returns a zero-arg callable
+# ----------------------------------------------------------------------
+def _per_series(fn):
+    def case(data):
+        items = list(data["series"].items())
+
+        def run():
+            for sku, ts in items:
+                fn(data, sku, ts)
+
+        return run, len(items)
+
+    return case
+
+
+def _train_xgb(data, sku, ts):
+    train_xgb(ts)
+
+
+def _forecast_xgb(data, sku, ts):
+    model, df_model, features = data["models"][sku]
+    forecast_xgb(model, df_model, features, steps=STEPS)
+
+
+def _croston(data, sku, ts):
+    croston_sba(ts, h=STEPS)
+
+
+def _reconstruct(data, sku, ts):
+    sales, purchase = data["orders"][sku]
+    reconstruct_demand(sales, purchase)
+
+
+def _safety_stock(data, sku, ts):
+    compute_safety_stock(data["inv"][sku], 7, 2, 1)
+
+
+def _simulate(data, sku, ts):
+    inv_df = data["inv"][sku]
+    fc = pd.Series(
+        np.full(STEPS, ts.mean()),
+        index=pd.date_range(ts.index[-1], periods=STEPS + 1, freq="ME")[1:],
+    )
+    simulate_inventory_with_rop(inv_df, fc, 10.0, 7)
+
+
+def _make_features(data, sku, ts):
+    make_time_features(ts)
+
+
+def _batch_forecast(data):
+    return (
+        lambda: hybrid_forecast_batch(
+            data["panel"], steps=STEPS, model_kwargs=dict(SMALL_XGB)
+        ),
+        data["n_skus"],
+    )
+
+
+def _reconstruct_fast(data):
+    sales, purchase = data["orders_panel"]
+    return (
+        lambda: reconstruct_demand_fast(sales, purchase, sku_col="sku"),
+        data["n_skus"],
+    )
+
+
+def _safety_stock_panel(data):
+    sales, purchase = data["orders_panel"]
+    inv_all = reconstruct_demand_fast(sales, purchase, sku_col="sku")
+    return (
+        lambda: compute_safety_stock_panel(inv_all, 7, 2, 1, target_fill_rate=0.98),
+        data["n_skus"],
+    )
+
+
+def _segment_panel(data):
+    return lambda: automatic_hybrid_weight_panel(data["panel"]), data["n_skus"]
+
+
+def _reconcile_mint(data, crossed=False):
+    panel = data["panel"]
+    skus = pd.unique(panel["sku"])
+    codes = np.arange(len(skus))
+    n_families = max(1, len(skus) // 100)
+    mapping = pd.DataFrame(
+        {"sku": skus, "family": codes % n_families, "warehouse": codes % 10}
+    )
+    levels = ["family", "warehouse"]
+    if crossed:
+        # warehouses independent of families, so every pair is a node
+        mapping["warehouse"] = (codes // n_families) % 10
+        levels.append(("family", "warehouse"))
+    hierarchy = Hierarchy.from_frame(mapping, levels)
+    # the last STEPS aggregated periods stand in for base forecasts
+    nodes = hierarchy.aggregate(panel)
+    base = nodes.pivot(index="node", columns="date", values="demand").iloc[:, -STEPS:]
+    return lambda: reconcile(hierarchy, base, method="mint"), data["n_skus"]
+
+
+def _reconcile_mint_crossed(data):
+    return _reconcile_mint(data, crossed=True)
+
+
+CASES = {
+    "make_time_features": _per_series(_make_features),
+    "train_xgb": _per_series(_train_xgb),
+    "forecast_xgb": _per_series(_forecast_xgb),
+    "croston_sba": _per_series(_croston),
+    "reconstruct_demand": _per_series(_reconstruct),
+    "compute_safety_stock": _per_series(_safety_stock),
+    "simulate_inventory_with_rop": _per_series(_simulate),
+    "hybrid_forecast_batch": _batch_forecast,
+    "reconstruct_demand_fast": _reconstruct_fast,
+    "compute_safety_stock_panel": _safety_stock_panel,
+    "reconcile_mint": _reconcile_mint,
+    "reconcile_mint_crossed": _reconcile_mint_crossed,
+    "automatic_hybrid_weight_panel": _segment_panel,
+}
+
+
+def prepare(n_skus: int, n_periods: int, per_series_cap: int, seed: int = 0):
+    """
+    Synthetic inputs for one (n_skus, n_periods) grid point. Expensive
+    per-series fixtures (fitted models, reconstructed inventory) are only
+    built for the capped subset.
+    """
+    panel = make_panel(n_skus, n_periods, seed=seed)
+    sales, purchase = make_orders(panel, seed=seed)
+    series = dict(list(panel_series(panel).items())[:per_series_cap])
+
+    sub_sales = sales[sales["sku"].isin(series)]
+    sub_purchase = purchase[purchase["sku"].isin(series)]
+    orders = {
+        sku: (s.drop(columns="sku"), p.drop(columns="sku"))
+        for (sku, s), (_, p) in zip(
+            sub_sales.groupby("sku", sort=False),
+            sub_purchase.groupby("sku", sort=False),
+        )
+    }
+    return {
+        "n_skus": n_skus,
+        "panel": panel,
+        "series": series,
+        "orders": orders,
+        "orders_panel": (sales, purchase),
+        "models": None,
+        "inv": None,
+    }
+
+
+def _ensure_fixtures(data, name):
+    if name == "forecast_xgb" and data["models"] is None:
+        data["models"] = {sku: train_xgb(ts) for sku, ts in data["series"].items()}
+    if name in ("compute_safety_stock", "simulate_inventory_with_rop"):
+        if data["inv"] is None:
+            data["inv"] = {
+                sku: reconstruct_demand(s, p) for sku, (s, p) in data["orders"].items()
+            }
+
+
+def measure(fn, repeat: int):
+    """
+    Best and median wall time over repeat runs, then tracemalloc peak of
+    one more run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "wall_s_min": min(times),
+        "wall_s_median": float(np.median(times)),
+        "peak_mem_mb": peak / 1024**2,
+    }
+
+
+def run_pipeline_case(repeat: int):
+    """
+    End-to-end run_training_pipeline on the bundled sample data, inside a
+    scratch directory so artifacts and mlruns do not touch the checkout.
+    """
+    import mlflow
+    from src.mlops.train_pipeline import run_training_pipeline
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            stats = measure(run_training_pipeline, repeat)
+        finally:
+            if mlflow.active_run() is not None:
+                mlflow.end_run()
+            os.chdir(cwd)
+    return stats
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "xgboost": xgboost.__version__,
+    }
+
+
+def run_benchmarks(
+    skus,
+    periods,
+    cases=None,
+    repeat: int = 3,
+    per_series_cap: int = 200,
+    pipeline: bool = False,
+    log=print,
+):
+    """
+    Run the selected cases over the skus x periods grid. Returns the
+    results document (environment + one record per case and grid point).
+    """
+    cases = list(CASES) if cases is None else cases
+    results = []
+    for n_periods in periods:
+        for n_skus in skus:
+            data = prepare(n_skus, n_periods, per_series_cap)
+            for name in cases:
+                record = {"benchmark": name, "n_skus": n_skus, "n_periods": n_periods}
+                try:
+                    _ensure_fixtures(data, name)
+                    fn, n_timed = CASES[name](data)
+                    stats = measure(fn, repeat)
+                    record.update(stats, n_skus_timed=n_timed)
+                    record["per_sku_ms"] = 1000 * stats["wall_s_min"] / max(n_timed, 1)
+                    record["est_total_s"] = record["per_sku_ms"] * n_skus / 1000
+                except Exception as exc:  # record and keep benchmarking
+                    record["error"] = repr(exc)
+                results.append(record)
+                log(_format(record))
+
+    if pipeline:
+        record = {"benchmark": "run_training_pipeline", "n_skus": 1, "n_periods": None}
+        try:
+            record.update(run_pipeline_case(repeat), n_skus_timed=1)
+        except Exception as exc:
+            record["error"] = repr(exc)
+        results.append(record)
+        log(_format(record))
+
+    return {"environment": environment(), "results": results}
+
+
+def _format(record):
+    head = f"{record['benchmark']:<28} skus={record['n_skus']:<7} periods={record['n_periods']}"
+    if "error" in record:
+        return f"{head}  ERROR {record['error']}"
+    return (
+        f"{head}  {record['wall_s_min']:.4f}s  "
+        f"peak={record['peak_mem_mb']:.1f}MB  timed={record['n_skus_timed']}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default")
+    parser.add_argument("--skus", type=int, nargs="+")
+    parser.add_argument("--periods", type=int, nargs="+")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--per-series-cap", type=int, default=200)
+    parser.add_argument(
+        "--pipeline", action="store_true", help="also time run_training_pipeline"
+    )
+    parser.add_argument("--out", default="benchmarks/results.json")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    doc = run_benchmarks(
+        skus=args.skus or preset["skus"],
+        periods=args.periods or preset["periods"],
+        cases=args.cases,
+        repeat=args.repeat,
+        per_series_cap=args.per_series_cap,
+        pipeline=args.pipeline,
+    )
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2, default=str))
+    print(f"wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
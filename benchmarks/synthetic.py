@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+
+def make_panel(
+    n_skus: int,
+    n_periods: int,
+    seed: int = 0,
+    zero_share: float = 0.3,
+    start: str = "2015-01-31",
+):
+    """
+    Long-format monthly demand panel (sku, date, demand).
+
+    Each SKU gets a log-normal demand level, a mild trend and yearly
+    season; zero_share of its periods are zeroed on average, with the
+    share varying per SKU so the panel mixes smooth and intermittent
+    series.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_periods, freq="ME")
+    t = np.arange(n_periods)
+
+    level = rng.lognormal(mean=1.5, sigma=1.0, size=(n_skus, 1))
+    trend = 1 + rng.normal(0, 0.002, size=(n_skus, 1)) * t
+    season = 1 + 0.2 * np.sin(2 * np.pi * (t + rng.integers(0, 12, (n_skus, 1))) / 12)
+    mean = np.clip(level * trend * season, 0, None)
+
+    p_zero = np.clip(rng.beta(2, 2, size=(n_skus, 1)) * 2 * zero_share, 0, 0.95)
+    demand = rng.poisson(mean) * (rng.random((n_skus, n_periods)) >= p_zero)
+
+    return pd.DataFrame(
+        {
+            "sku": np.repeat([f"SKU{i:06d}" for i in range(n_skus)], n_periods),
+            "date": np.tile(dates, n_skus),
+            "demand": demand.ravel().astype(float),
+        }
+    )
+
+
+def panel_series(panel: pd.DataFrame):
+    """
+    {sku: monthly demand Series} for a panel from make_panel.
+    """
+    return {
+        sku: pd.Series(
+            g["demand"].to_numpy(), index=pd.DatetimeIndex(g["date"])
+        ).asfreq("ME")
+        for sku, g in panel.groupby("sku", sort=False)
+    }
+
+
+def make_orders(panel: pd.DataFrame, seed: int = 0, orders_per_period: int = 3):
+    """
+    Order-level sales and purchase frames in the load_data layout (plus a
+    sku column) whose monthly totals follow the panel's demand.
+
+    Purchases replenish roughly the same volume one month earlier, with
+    some noise so stockouts occur.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(panel)
+    k = orders_per_period
+
+    month_start = (panel["date"] - pd.offsets.MonthBegin(1)).to_numpy()
+    offsets = rng.integers(0, 28, size=n * k).astype("timedelta64[D]")
+    sales_dates = np.repeat(month_start, k) + offsets
+    share = rng.dirichlet(np.ones(k), size=n).ravel()
+    sales_qty = np.round(np.repeat(panel["demand"].to_numpy(), k) * share)
+
+    sales_df = pd.DataFrame(
+        {
+            "sku": np.repeat(panel["sku"].to_numpy(), k),
+            "DeliveryDate": sales_dates,
+            "DeliveredQuantity": sales_qty,
+        }
+    )
+
+    qty = np.round(panel["demand"].to_numpy() * rng.uniform(0.7, 1.3, size=n))
+    purchase_df = pd.DataFrame(
+        {
+            "sku": panel["sku"].to_numpy(),
+            "DeliveryDate": month_start - np.timedelta64(20, "D"),
+            "DeliveredQuantity": qty,
+            "IsConfirmed": rng.random(n) > 0.05,
+            "RestQuantity": 0.0,
+            "OrderedQuantity": qty,
+        }
+    )
+    return sales_df, purchase_df
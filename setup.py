@@ -1,10 +1,10 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 setup(
     name="demandforecast",
     version="0.1.0",
-    packages=find_packages("src"),
-    package_dir={"": "src"},
+    # modules import each other as src.*, so src is installed as a package
+    packages=find_namespace_packages(include=["src", "src.*"]),
     install_requires=[
         "pandas",
         "numpy",
@@ -12,7 +12,11 @@ setup(
         "scikit-learn",
         "xgboost",
         "statsmodels",
+        "pyarrow",
+        "scipy",
+        "threadpoolctl",
     ],
+    entry_points={"console_scripts": ["demandforecast=src.cli:main"]},
     author="Dhany Saputra",
     description="Hybrid demand forecasting and inventory optimization system.",
     license="MIT",
@@ -1,3 +1,288 @@
-# src/cli.py
+"""
+demandforecast command line entry point (also python -m src.cli).
+
+Runs reconstruction, hybrid forecast, safety stock and inventory simulation
+(batch_runner.run_sku_pipeline on --workers processes) for the SKUs of a
+sales/purchase extract and writes forecast, safety_stock and simulation
+tables to --output-dir.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+DEFAULT_SKU = "ALL"  # single-series extracts without a SKU column
+STATE_FILE = "cli_state.json"
+OUTPUTS = ("forecast", "safety_stock", "simulation")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="demandforecast",
+        description="Hybrid demand forecast and inventory simulation per SKU.",
+    )
+    io = parser.add_argument_group("input/output")
+    io.add_argument("--sales", required=True, help="sales extract (CSV or pickle)")
+    io.add_argument(
+        "--purchases", required=True, help="purchase extract (CSV or pickle)"
+    )
+    io.add_argument("--sku-col", help="SKU column; omit for a single series")
+    io.add_argument("--start", help="first DeliveryDate to load")
+    io.add_argument("--end", help="last DeliveryDate to load")
+    io.add_argument("--cache-dir", help="Parquet cache for the extracts")
+    io.add_argument("--output-dir", default="artifacts/cli")
+    io.add_argument("--format", default="parquet", choices=["csv", "parquet", "arrow"])
+
+    select = parser.add_argument_group("SKU selection")
+    select.add_argument("--skus", nargs="+", help="only these SKUs")
+    select.add_argument("--skus-file", help="file with one SKU per line")
+    select.add_argument("--exclude-skus", nargs="+", default=[])
+
+    model = parser.add_argument_group("model")
+    model.add_argument("--freq", default="ME", choices=["ME", "W", "D"])
+    model.add_argument("--steps", type=int, default=6)
+    model.add_argument("--alpha", type=float, default=0.1)
+    model.add_argument("--abc-class", default="A", choices=["A", "B", "C"])
+    model.add_argument("--lead-time-days", type=float, default=7)
+    model.add_argument("--tolerance-early-days", type=float, default=2)
+    model.add_argument("--tolerance-late-days", type=float, default=1)
+    model.add_argument("--target-fill-rate", type=float)
+
+    run = parser.add_argument_group("execution")
+    run.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (see batch_runner.run_sku_pipeline)",
+    )
+    run.add_argument("--chunk-size", type=int, default=100, help="SKUs per worker task")
+    run.add_argument(
+        "--only-changed",
+        action="store_true",
+        help="skip SKUs whose inputs and parameters match the last run",
+    )
+    run.add_argument(
+        "--dry-run", action="store_true", help="print the plan, run nothing"
+    )
+    run.add_argument(
+        "--profile", action="store_true", help="print a per-stage timing table"
+    )
+    return parser
+
+
+def _params(args) -> dict:
+    """
+    Parameters that change results or the output files; a change reruns
+    every SKU.
+    """
+    keys = (
+        "format",
+        "freq",
+        "steps",
+        "alpha",
+        "abc_class",
+        "lead_time_days",
+        "tolerance_early_days",
+        "tolerance_late_days",
+        "target_fill_rate",
+        "start",
+        "end",
+    )
+    return {k: getattr(args, k) for k in keys}
+
+
+def _wanted_skus(args):
+    wanted = set(args.skus or [])
+    if args.skus_file:
+        lines = Path(args.skus_file).read_text().splitlines()
+        wanted |= {line.strip() for line in lines if line.strip()}
+    return wanted or None
+
+
+def _fingerprints(sales, purchase) -> dict:
+    """
+    Content hash per SKU over its sales and purchase rows (row order does
+    not matter).
+    """
+    import numpy as np
+    import pandas as pd
+
+    digests = {}
+    for df in (sales, purchase):
+        cols = [c for c in df.columns if c != "sku"]
+        hashes = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+        for sku, idx in df.groupby("sku", sort=False).indices.items():
+            h = digests.setdefault(sku, hashlib.sha256())
+            h.update(np.sort(hashes[idx]).tobytes())
+            h.update(b"|")
+    return {sku: h.hexdigest() for sku, h in digests.items()}
+
+
+def _load_state(output_dir: Path) -> dict:
+    path = output_dir / STATE_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save_state(output_dir: Path, state: dict):
+    path = output_dir / STATE_FILE
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, path)
+
+
+def _merge_previous(name, df, output_dir, keep_skus):
+    """
+    Previous rows of SKUs that were skipped, followed by the new rows.
+    """
+    import pandas as pd
+
+    from src.mlops.persist import load_dataframe
+
+    try:
+        old = load_dataframe(name, directory=output_dir)
+    except FileNotFoundError:
+        return df
+    old = old[old.index.astype(str).isin(keep_skus)]
+    if "date" in old.columns:
+        old["date"] = pd.to_datetime(old["date"])
+    return pd.concat([old, df]) if len(old) else df
+
+
+def run(args) -> dict:
+    """
+    Execute one CLI run. Returns a summary dict.
+    """
+    import pandas as pd
+
+    from src.data_loader import load_data_fast
+    from src.mlops.instrumentation import StageTimer
+
+    timer = StageTimer()
+    output_dir = Path(args.output_dir)
+    params = _params(args)
+    wanted = _wanted_skus(args)
+
+    with timer.stage("load"):
+        sales, purchase = load_data_fast(
+            args.sales,
+            args.purchases,
+            start=args.start,
+            end=args.end,
+            skus=sorted(wanted) if wanted and args.sku_col else None,
+            sku_col=args.sku_col,
+            cache_dir=args.cache_dir,
+        )
+        if args.sku_col:
+            # SKU filters and the run state compare SKUs as strings
+            sales = sales.rename(columns={args.sku_col: "sku"})
+            purchase = purchase.rename(columns={args.sku_col: "sku"})
+            sales["sku"] = sales["sku"].astype(str)
+            purchase["sku"] = purchase["sku"].astype(str)
+        else:
+            sales["sku"] = DEFAULT_SKU
+            purchase["sku"] = DEFAULT_SKU
+
+    with timer.stage("select"):
+        skus = pd.unique(pd.concat([sales["sku"], purchase["sku"]]))
+        if wanted is not None:
+            skus = [s for s in skus if s in wanted]
+        excluded = set(args.exclude_skus)
+        skus = [s for s in skus if s not in excluded]
+
+        fingerprints = _fingerprints(
+            sales[sales["sku"].isin(skus)], purchase[purchase["sku"].isin(skus)]
+        )
+        state = _load_state(output_dir)
+        unchanged = set()
+        # skipped SKUs are copied from the previous outputs, so those must exist
+        previous_outputs = all(
+            (output_dir / f"{name}.{args.format}").exists() for name in OUTPUTS
+        )
+        if args.only_changed and state.get("params") == params and previous_outputs:
+            previous = state.get("skus", {})
+            unchanged = {s for s in skus if previous.get(s) == fingerprints.get(s)}
+        todo = [s for s in skus if s not in unchanged]
+
+    summary = {
+        "n_selected": len(skus),
+        "n_run": len(todo),
+        "n_skipped": len(unchanged),
+        "skus": todo,
+        "output_dir": str(output_dir),
+    }
+    if args.dry_run or not todo:
+        summary["timer"] = timer
+        return summary
+
+    from src.mlops.batch_runner import run_sku_pipeline
+    from src.mlops.persist import save_dataframe
+
+    sales = sales[sales["sku"].isin(todo)]
+    purchase = purchase[purchase["sku"].isin(todo)]
+
+    with timer.stage("pipeline"):
+        result = run_sku_pipeline(
+            sales,
+            purchase,
+            output_dir=None,
+            n_workers=args.workers,
+            chunk_size=args.chunk_size,
+            steps=args.steps,
+            lead_time_days=args.lead_time_days,
+            tolerance_early_days=args.tolerance_early_days,
+            tolerance_late_days=args.tolerance_late_days,
+            target_fill_rate=args.target_fill_rate,
+            abc_class=args.abc_class,
+            alpha=args.alpha,
+            freq=args.freq,
+        )
+        if result["errors"]:
+            failed = "; ".join(f"chunk {i}: {e}" for i, e in result["errors"].items())
+            raise RuntimeError(f"{len(result['errors'])} chunk(s) failed: {failed}")
+
+    with timer.stage("write"):
+        keep = {s for s in skus if s in unchanged}
+        tables = {
+            "forecast": result["tables"]["forecast"].set_index("sku"),
+            "safety_stock": result["tables"]["safety_stock"],
+            "simulation": result["tables"]["simulation"].set_index("sku"),
+        }
+        paths = []
+        for name in OUTPUTS:
+            file_name = f"{name}.{args.format}"
+            df = tables[name]
+            if unchanged:
+                df = _merge_previous(file_name, df, output_dir, keep)
+            paths.append(str(save_dataframe(df, file_name, directory=output_dir)))
+        _save_state(output_dir, {"params": params, "skus": fingerprints})
+
+    summary["paths"] = paths
+    summary["timer"] = timer
+    return summary
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    summary = run(args)
+    timer = summary.pop("timer")
+
+    verb = "would run" if args.dry_run else "ran"
+    print(
+        f"{summary['n_selected']} SKUs selected, {verb} {summary['n_run']}, "
+        f"skipped {summary['n_skipped']} unchanged"
+    )
+    if args.dry_run:
+        for sku in summary["skus"]:
+            print(f"  {sku}")
+    for path in summary.get("paths", []):
+        print(f"wrote {path}")
+    if args.profile:
+        print(timer.summary())
+    return 0
+
+
 if __name__ == "__main__":
-    print("Demand forecasting pipeline entrypoint.")
+    sys.exit(main())
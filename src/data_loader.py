@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 import pandas as pd
 from pathlib import Path
 
@@ -47,5 +50,296 @@ def load_data(
 
     sales_df["DeliveryDate"] = pd.to_datetime(sales_df["DeliveryDate"])
     purchase_df["DeliveryDate"] = pd.to_datetime(purchase_df["DeliveryDate"])
+    if "IsConfirmed" in purchase_df.columns:
+        purchase_df["IsConfirmed"] = _as_bool(purchase_df["IsConfirmed"])
 
     return sales_df, purchase_df
+
+
+SALES_DTYPES = {
+    "DeliveryDate": "timestamp",
+    "DeliveredQuantity": "float64",
+}
+PURCHASE_DTYPES = {
+    "DeliveryDate": "timestamp",
+    "DeliveredQuantity": "float64",
+    "IsConfirmed": "bool",
+    "RestQuantity": "float64",
+    "OrderedQuantity": "float64",
+}
+CACHE_DIR = DATA_DIR / ".cache"
+TRUE_VALUES = ("true", "t", "yes", "y", "1", "1.0")
+
+
+def _as_bool(values: pd.Series) -> pd.Series:
+    """
+    Parse a flag column explicitly: "true"/"false" strings (any case), 1/0
+    and real booleans. Missing or unrecognised values count as False;
+    astype(bool) would turn every non-empty string, "false" included, into
+    True.
+    """
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    text = values.astype("string").str.strip().str.lower()
+    return text.isin(TRUE_VALUES).fillna(False).astype(bool)
+
+
+def _file_sha256(path: Path, block_size: int = 1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_columns(path, names):
+    """
+    Map each standard column name to its header name in a raw CSV extract,
+    which may carry the ERP "__c" suffix.
+    """
+    with open(path, newline="") as f:
+        header = [c.strip().strip('"') for c in f.readline().split(",")]
+
+    source = {}
+    for name in names:
+        for raw in (name, f"{name}__c"):
+            if raw in header:
+                source[name] = raw
+                break
+    return source
+
+
+def _csv_to_table(path: Path, dtypes: dict, sku_col: str):
+    """
+    Read only the needed columns of a raw extract with explicit types,
+    accepting both the plain and the ERP "__c" column names.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    wanted = dict(dtypes)
+    if sku_col is not None:
+        wanted[sku_col] = "string"
+
+    arrow_types = {
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "string": pa.string(),
+    }
+    source = _source_columns(path, wanted)
+
+    def read(ts_type):
+        types = {
+            source[n]: ts_type if t == "timestamp" else arrow_types[t]
+            for n, t in wanted.items()
+            if n in source
+        }
+        return pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(source.values()), column_types=types
+            ),
+        )
+
+    try:
+        table = read(pa.timestamp("ns", tz="UTC"))
+    except pa.ArrowInvalid:
+        # dates without a zone offset
+        table = read(pa.timestamp("ns"))
+
+    return table.rename_columns(
+        [{raw: n for n, raw in source.items()}[c] for c in table.column_names]
+    )
+
+
+def cached_parquet(
+    source_path, dtypes: dict, cache_dir=None, sku_col: str = None
+) -> Path:
+    """
+    Convert a CSV (or pickled DataFrame) extract to Parquet once and return
+    the cached file. The cache entry is keyed on the source's mtime/size
+    and, when those changed, on its SHA-256, so a touched but unchanged file
+    is not converted again.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    source_path = Path(source_path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    stat = source_path.stat()
+    key = hashlib.sha1(str(source_path.resolve()).encode()).hexdigest()[:8]
+    meta_path = cache_dir / f"{source_path.stem}-{key}.json"
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+    cached = cache_dir / meta.get("parquet", "")
+
+    if (
+        meta.get("source") == str(source_path.resolve())
+        and meta.get("sku_col") == sku_col
+        and cached.is_file()
+    ):
+        if meta["mtime_ns"] == stat.st_mtime_ns and meta["size"] == stat.st_size:
+            return cached
+        sha = _file_sha256(source_path)
+        if sha == meta["sha256"]:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            meta_path.write_text(json.dumps(meta))
+            return cached
+    else:
+        sha = _file_sha256(source_path)
+
+    if source_path.suffix == ".pkl":
+        df = pd.read_pickle(source_path)
+        df.columns = [c.strip().removesuffix("__c") for c in df.columns]
+        keep = [c for c in list(dtypes) + [sku_col] if c in df.columns]
+        df = df[keep]
+        for c in [c for c, t in dtypes.items() if t == "bool" and c in df]:
+            df[c] = _as_bool(df[c])
+        df = df.astype(
+            {c: t for c, t in dtypes.items() if t != "timestamp" and c in df}
+        )
+        if sku_col in df:
+            df[sku_col] = df[sku_col].astype(str)
+        df["DeliveryDate"] = pd.to_datetime(df["DeliveryDate"]).dt.as_unit("ns")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    else:
+        table = _csv_to_table(source_path, dtypes, sku_col)
+
+    # sorted dates give tight row-group statistics for date-range pushdown
+    table = table.sort_by("DeliveryDate")
+    parquet = cache_dir / f"{source_path.stem}-{sha[:16]}.parquet"
+    pq.write_table(table, parquet, row_group_size=256_000)
+
+    if cached.is_file() and cached != parquet:
+        cached.unlink()
+    meta_path.write_text(
+        json.dumps(
+            {
+                "source": str(source_path.resolve()),
+                "parquet": parquet.name,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": sha,
+                "sku_col": sku_col,
+            }
+        )
+    )
+    return parquet
+
+
+def _read_cached(path: Path, start=None, end=None, skus=None, sku_col=None):
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    tz = schema.field("DeliveryDate").type.tz
+
+    def stamp(value):
+        value = pd.Timestamp(value)
+        if tz is not None and value.tzinfo is None:
+            value = value.tz_localize(tz)
+        return value
+
+    filters = []
+    if start is not None:
+        filters.append(("DeliveryDate", ">=", stamp(start)))
+    if end is not None:
+        end = stamp(end)
+        if end == end.normalize():
+            # a date-only end covers that whole day
+            filters.append(("DeliveryDate", "<", end + pd.Timedelta(days=1)))
+        else:
+            filters.append(("DeliveryDate", "<=", end))
+    if skus is not None and sku_col is not None:
+        filters.append((sku_col, "in", list(skus)))
+
+    table = pq.read_table(path, filters=filters or None, memory_map=True)
+    return table.to_pandas()
+
+
+def load_data_fast(
+    sales_path: str = None,
+    purchase_path: str = None,
+    start=None,
+    end=None,
+    skus=None,
+    sku_col: str = None,
+    cache_dir: str = None,
+):
+    """
+    Columnar variant of load_data.
+
+    Each extract is converted once to a Parquet cache holding only the
+    needed columns with explicit dtypes (see cached_parquet); later runs
+    memory-map the cached file and push the DeliveryDate range
+    [start, end] and the skus filter down into the Parquet reader; a
+    date-only end includes every row of that day.
+    Returns (sales_df, purchase_df) with the column names of load_data.
+    """
+    if sales_path is None:
+        sales_path = DATA_DIR / "sample_sales.csv"
+    if purchase_path is None:
+        purchase_path = DATA_DIR / "sample_purchase.csv"
+
+    frames = []
+    for path, dtypes in ((sales_path, SALES_DTYPES), (purchase_path, PURCHASE_DTYPES)):
+        parquet = cached_parquet(path, dtypes, cache_dir=cache_dir, sku_col=sku_col)
+        frames.append(
+            _read_cached(parquet, start=start, end=end, skus=skus, sku_col=sku_col)
+        )
+
+    return frames[0], frames[1]
+
+
+def load_periodic_totals(
+    sales_path: str = None,
+    purchase_path: str = None,
+    freq: str = "ME",
+    chunksize: int = 500_000,
+    sku_col: str = None,
+    confirmed_only: bool = True,
+):
+    """
+    Stream the sales and purchase extracts in chunks of chunksize rows and
+    accumulate per-period (and per-SKU) DeliveredQuantity totals, applying
+    the IsConfirmed and RestQuantity < OrderedQuantity purchase filters per
+    chunk. Peak memory grows with the number of SKU-periods, not with the
+    number of raw rows.
+
+    Returns (sales_totals, purchase_totals), one row per SKU-period with
+    columns [sku_col,] DeliveryDate, DeliveredQuantity, ready to be passed
+    to reconstruct_demand / reconstruct_demand_fast.
+    """
+    if sales_path is None:
+        sales_path = DATA_DIR / "sample_sales.csv"
+    if purchase_path is None:
+        purchase_path = DATA_DIR / "sample_purchase.csv"
+
+    keys = [sku_col] if sku_col is not None else []
+    out = []
+    for path, names in ((sales_path, SALES_DTYPES), (purchase_path, PURCHASE_DTYPES)):
+        source = _source_columns(path, list(names) + keys)
+        rename = {raw: name for name, raw in source.items()}
+        total = None
+
+        for chunk in pd.read_csv(
+            path, usecols=list(source.values()), chunksize=chunksize
+        ):
+            chunk = chunk.rename(columns=rename)
+            chunk["DeliveryDate"] = pd.to_datetime(chunk["DeliveryDate"])
+
+            if confirmed_only and "IsConfirmed" in chunk.columns:
+                chunk = chunk[_as_bool(chunk["IsConfirmed"])]
+            if "RestQuantity" in chunk.columns and "OrderedQuantity" in chunk.columns:
+                chunk = chunk[chunk["RestQuantity"] < chunk["OrderedQuantity"]]
+
+            part = chunk.groupby(keys + [pd.Grouper(key="DeliveryDate", freq=freq)])[
+                "DeliveredQuantity"
+            ].sum()
+            total = part if total is None else total.add(part, fill_value=0)
+
+        if total is None:
+            total = pd.Series(dtype=float, name="DeliveredQuantity")
+        out.append(total.astype(float).sort_index().reset_index())
+
+    return out[0], out[1]
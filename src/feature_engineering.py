@@ -1,22 +1,34 @@
 import numpy as np
 import pandas as pd
 
+from .frequency import (
+    CALENDAR_COLUMNS,
+    calendar_feature,
+    calendar_values,
+    resolve_freq,
+    shift_dates,
+)
+
 
 def make_time_features(
     demand_ts: pd.Series,
     lags=(1, 2, 3),
     roll_windows=(3, 6),
+    freq: str = None,
 ):
     """
-    Create supervised learning features from a monthly demand series.
+    Create supervised learning features from a monthly, weekly or daily
+    demand series (freq inferred from the index when not given).
 
     Returns DataFrame with columns:
       date, y, t, month, lagk, rolling_mean_w, rolling_std_w, rolling_min_3,
       rolling_max_3, rolling_mean_6, rolling_std_6, trend
+    where month is replaced by week (weekly) or dayofweek (daily).
     """
+    freq = resolve_freq(freq, demand_ts.index)
     df = demand_ts.to_frame(name="y").reset_index().rename(columns={"index": "date"})
     df["t"] = np.arange(len(df))
-    df["month"] = df["date"].dt.month
+    df[calendar_feature(freq)] = calendar_values(df["date"], freq)
 
     for lag in lags:
         df[f"lag{lag}"] = df["y"].shift(lag)
@@ -31,3 +43,103 @@ def make_time_features(
 
     df["trend"] = df["t"]
     return df.dropna().reset_index(drop=True)
+
+
+def make_origin_features(
+    demand_ts: pd.Series,
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Feature row for the period right after the last observation of demand_ts,
+    i.e. the row make_time_features will produce once that period arrives.
+    Returns a one-row DataFrame without y.
+    """
+    freq = resolve_freq(freq, demand_ts.index)
+    next_date = shift_dates(demand_ts.index[-1:], 1, freq)
+    extended = pd.concat([demand_ts.astype(float), pd.Series([0.0], index=next_date)])
+    df = make_time_features(extended, lags=lags, roll_windows=roll_windows, freq=freq)
+    return df.iloc[[-1]].drop(columns="y").reset_index(drop=True)
+
+
+def make_direct_features(df_model: pd.DataFrame, steps: int = 6, freq: str = None):
+    """
+    Stack a make_time_features frame into a direct multi-horizon design.
+
+    Every row's lag/rolling features (known at the forecast origin) are paired
+    with the target h - 1 periods later, for h = 1..steps. t, the calendar
+    column and trend describe the target period and a horizon column is
+    added. Rows of a panel frame (with a sku column) are shifted within their
+    SKU; targets beyond the end of the data are dropped.
+    """
+    grouped = df_model.groupby("sku", sort=False) if "sku" in df_model else None
+    calendar = next(c for c in CALENDAR_COLUMNS if c in df_model)
+    if calendar != "month":
+        freq = resolve_freq(freq, df_model["date"])
+
+    parts = []
+    for h in range(1, steps + 1):
+        part = df_model.copy()
+        if grouped is None:
+            part["y"] = df_model["y"].shift(1 - h)
+        else:
+            part["y"] = grouped["y"].shift(1 - h)
+        part["t"] = part["t"] + h - 1
+        part["trend"] = part["trend"] + h - 1
+        if calendar == "month":
+            part["month"] = (part["month"] + h - 2) % 12 + 1
+        else:
+            target = shift_dates(part["date"], h - 1, freq)
+            part[calendar] = calendar_values(target, freq)
+        part["horizon"] = h
+        parts.append(part)
+
+    return pd.concat(parts, ignore_index=True).dropna(subset=["y"])
+
+
+def make_panel_time_features(
+    panel: pd.DataFrame,
+    sku_col: str = "sku",
+    date_col: str = "date",
+    value_col: str = "demand",
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Panel version of make_time_features for a long-format (sku, date, demand)
+    frame. Features are computed for all SKUs in one pass over the stacked
+    column; windows that would reach into the previous SKU are masked out.
+
+    Returns DataFrame with a leading sku column followed by the same columns,
+    per SKU, as make_time_features.
+    """
+    df = (
+        panel[[sku_col, date_col, value_col]]
+        .rename(columns={sku_col: "sku", date_col: "date", value_col: "y"})
+        .sort_values(["sku", "date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    df["y"] = df["y"].astype(float)
+
+    pos = df.groupby("sku", sort=False).cumcount().to_numpy()
+    df["t"] = pos
+    freq = resolve_freq(freq, df["date"])
+    df[calendar_feature(freq)] = calendar_values(df["date"], freq)
+
+    y = df["y"]
+    for lag in lags:
+        df[f"lag{lag}"] = y.shift(lag).where(pos >= lag)
+
+    for w in roll_windows:
+        valid = pos >= w
+        df[f"rolling_mean_{w}"] = y.rolling(w).mean().shift(1).where(valid)
+        df[f"rolling_std_{w}"] = y.rolling(w).std().shift(1).where(valid)
+
+    valid = pos >= 3
+    df["rolling_min_3"] = y.rolling(3).min().shift(1).where(valid)
+    df["rolling_max_3"] = y.rolling(3).max().shift(1).where(valid)
+
+    df["trend"] = df["t"]
+    return df.dropna().reset_index(drop=True)
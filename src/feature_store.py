@@ -0,0 +1,222 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureStore:
+    """
+    Persistent per-series store of make_time_features rows.
+
+    All SKUs share one append-only, memory-mapped record file (rows.bin)
+    plus a small JSON index (meta.json) mapping each SKU to its row ranges.
+    update() only computes lags and rolling windows for periods newer than
+    what is stored; if the stored history no longer matches the incoming
+    series the SKU is rebuilt and its old rows become dead space until
+    compact() is called. Single writer only.
+    """
+
+    def __init__(self, path, lags=(1, 2, 3), roll_windows=(3, 6)):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.path / "meta.json"
+        self.rows_path = self.path / "rows.bin"
+
+        if self.meta_path.exists():
+            self.meta = json.loads(self.meta_path.read_text())
+            if tuple(self.meta["lags"]) != tuple(lags) or tuple(
+                self.meta["roll_windows"]
+            ) != tuple(roll_windows):
+                raise ValueError(
+                    f"Feature store at {self.path} was built with "
+                    f"lags={self.meta['lags']} roll_windows={self.meta['roll_windows']}"
+                )
+        else:
+            self.meta = {
+                "lags": list(lags),
+                "roll_windows": list(roll_windows),
+                "tz": None,
+                "unit": "ns",
+                "n_rows": 0,
+                "skus": {},
+            }
+
+        self.lags = tuple(self.meta["lags"])
+        self.roll_windows = tuple(self.meta["roll_windows"])
+        self.columns = (
+            ["y", "t", "month"]
+            + [f"lag{lag}" for lag in self.lags]
+            + [
+                f"rolling_{stat}_{w}"
+                for w in self.roll_windows
+                for stat in ("mean", "std")
+            ]
+            + ["rolling_min_3", "rolling_max_3", "trend"]
+        )
+        self.dtype = np.dtype([("date", "<i8")] + [(c, "<f8") for c in self.columns])
+
+    # ------------------------------------------------------------------
+    # reading
+    # ------------------------------------------------------------------
+    def _records(self):
+        if self.meta["n_rows"] == 0:
+            return np.empty(0, dtype=self.dtype)
+        return np.memmap(
+            self.rows_path, dtype=self.dtype, mode="r", shape=(self.meta["n_rows"],)
+        )
+
+    def _sku_records(self, sku, records=None):
+        records = self._records() if records is None else records
+        ranges = self.meta["skus"].get(str(sku), [])
+        if not ranges:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate([records[a:b] for a, b in ranges])
+
+    def skus(self):
+        return list(self.meta["skus"])
+
+    def features(self, sku) -> pd.DataFrame:
+        """
+        Feature frame for sku, identical to make_time_features on its series.
+        """
+        rec = self._sku_records(sku)
+        dates = pd.to_datetime(rec["date"], unit="ns", utc=self.meta["tz"] is not None)
+        if self.meta["tz"] is not None:
+            dates = dates.tz_convert(self.meta["tz"])
+        dates = dates.as_unit(self.meta.get("unit", "ns"))
+
+        df = pd.DataFrame({"date": dates})
+        for c in self.columns:
+            df[c] = rec[c]
+        df["t"] = df["t"].astype("int64")
+        df["month"] = df["month"].astype("int32")
+        df["trend"] = df["trend"].astype("int64")
+        return df.dropna().reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # writing
+    # ------------------------------------------------------------------
+    def _new_rows(self, y_hist: np.ndarray, t0: int, dates: pd.DatetimeIndex, y_new):
+        """
+        Feature records for y_new given the preceding history y_hist.
+        """
+        y_all = np.concatenate([y_hist, y_new]).astype(float)
+        n_hist, n_new = len(y_hist), len(y_new)
+        pos = np.arange(n_hist, n_hist + n_new)
+
+        rec = np.empty(n_new, dtype=self.dtype)
+        rec["date"] = dates.as_unit("ns").asi8
+        rec["y"] = y_new
+        rec["t"] = t0 + np.arange(n_new)
+        rec["month"] = dates.month
+        rec["trend"] = rec["t"]
+
+        for lag in self.lags:
+            rec[f"lag{lag}"] = np.where(
+                pos >= lag, y_all[np.maximum(pos - lag, 0)], np.nan
+            )
+
+        def window(w):
+            idx = pos[:, None] - w + np.arange(w)[None, :]
+            return y_all[np.maximum(idx, 0)], pos >= w
+
+        for w in self.roll_windows:
+            win, ok = window(w)
+            rec[f"rolling_mean_{w}"] = np.where(ok, win.mean(axis=1), np.nan)
+            std = win.std(axis=1, ddof=1) if w > 1 else np.full(n_new, np.nan)
+            rec[f"rolling_std_{w}"] = np.where(ok, std, np.nan)
+
+        win, ok = window(3)
+        rec["rolling_min_3"] = np.where(ok, win.min(axis=1), np.nan)
+        rec["rolling_max_3"] = np.where(ok, win.max(axis=1), np.nan)
+        return rec
+
+    def _plan(self, sku, demand_ts: pd.Series, records):
+        """
+        Decide what to append for one SKU. Returns (records, rebuild).
+        """
+        dates = pd.DatetimeIndex(demand_ts.index)
+        if self.meta["n_rows"] == 0:
+            self.meta["tz"] = None if dates.tz is None else str(dates.tz)
+            self.meta["unit"] = dates.unit
+        y = demand_ts.to_numpy(dtype=float)
+        stamps = dates.as_unit("ns").asi8
+
+        stored = self._sku_records(sku, records)
+        n_old = len(stored)
+        if (
+            n_old
+            and n_old <= len(y)
+            and np.array_equal(stored["date"], stamps[:n_old])
+            and np.array_equal(stored["y"], y[:n_old], equal_nan=True)
+        ):
+            new = self._new_rows(stored["y"], n_old, dates[n_old:], y[n_old:])
+            return new, False
+
+        return self._new_rows(np.empty(0), 0, dates, y), True
+
+    def update_many(self, series: dict):
+        """
+        Append new periods for many SKUs ({sku: demand_ts}) in one write.
+        Returns the number of rows appended.
+        """
+        records = self._records()
+        chunks = []
+        n_rows = self.meta["n_rows"]
+
+        for sku, demand_ts in series.items():
+            new, rebuild = self._plan(sku, demand_ts, records)
+            if len(new) == 0:
+                continue
+            key = str(sku)
+            span = [n_rows, n_rows + len(new)]
+            if rebuild:
+                self.meta["skus"][key] = [span]
+            else:
+                self.meta["skus"].setdefault(key, []).append(span)
+            chunks.append(new)
+            n_rows += len(new)
+
+        del records
+        if chunks:
+            with open(self.rows_path, "ab") as f:
+                f.write(np.concatenate(chunks).tobytes())
+            self.meta["n_rows"] = n_rows
+            self._save_meta()
+        return sum(len(c) for c in chunks)
+
+    def update(self, sku, demand_ts: pd.Series):
+        """
+        Append the periods of demand_ts that are not stored yet for sku.
+        """
+        return self.update_many({sku: demand_ts})
+
+    def compact(self):
+        """
+        Rewrite rows.bin keeping only live rows, one contiguous range per SKU.
+        """
+        records = self._records()
+        chunks = []
+        skus = {}
+        n_rows = 0
+        for sku in self.meta["skus"]:
+            rec = self._sku_records(sku, records)
+            skus[sku] = [[n_rows, n_rows + len(rec)]]
+            chunks.append(rec)
+            n_rows += len(rec)
+
+        data = np.concatenate(chunks) if chunks else np.empty(0, dtype=self.dtype)
+        del records
+        tmp = self.rows_path.with_suffix(".tmp")
+        tmp.write_bytes(data.tobytes())
+        tmp.replace(self.rows_path)
+
+        self.meta["skus"] = skus
+        self.meta["n_rows"] = n_rows
+        self._save_meta()
+
+    def _save_meta(self):
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.meta))
+        tmp.replace(self.meta_path)
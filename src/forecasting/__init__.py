@@ -1,10 +1,38 @@
-from .xgb_model import train_xgb, forecast_xgb  # noqa: F401
-from .croston import croston_sba  # noqa: F401
+import importlib
+
+# bound eagerly: the submodule of the same name would otherwise shadow the
+# function as soon as anything imports src.forecasting.hybrid_forecast
 from .hybrid_forecast import hybrid_forecast  # noqa: F401
 
-__all__ = [
-    "train_xgb",
-    "forecast_xgb",
-    "croston_sba",
-    "hybrid_forecast",
-]
+# public name -> submodule; the others (and scipy.sparse behind them) are
+# only imported on first attribute access (PEP 562). xgboost itself is
+# imported by the functions that fit models.
+_EXPORTS = {
+    "train_xgb": ".xgb_model",
+    "forecast_xgb": ".xgb_model",
+    "croston_sba": ".croston",
+    "croston_sba_sparse": ".croston",
+    "hybrid_forecast": ".hybrid_forecast",
+    "hybrid_forecast_batch": ".batch_forecast",
+    "train_global_xgb": ".global_model",
+    "forecast_global_xgb": ".global_model",
+    "ForecastCache": ".cache",
+    "SparseSeries": ".sparse",
+    "Hierarchy": ".hierarchy",
+    "reconcile": ".hierarchy",
+    "hierarchical_forecast": ".hierarchy",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,193 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ..feature_engineering import make_panel_time_features
+from ..frequency import future_index, resolve_freq
+from .xgb_model import DEFAULT_MODEL_KWARGS, forecast_xgb_many
+from .croston import croston_sba_matrix
+from .hybrid_forecast import automatic_hybrid_weight_panel
+from .global_model import train_global_xgb, forecast_global_xgb
+
+
+def _fit_one(df_model: pd.DataFrame, features: list, model_kwargs: dict):
+    from xgboost import XGBRegressor
+
+    model = XGBRegressor(**model_kwargs)
+    model.fit(df_model[features], df_model["y"])
+    return model
+
+
+def hybrid_forecast_batch(
+    panel: pd.DataFrame,
+    abc_class="A",
+    steps: int = 6,
+    alpha: float = 0.1,
+    model_kwargs: dict = None,
+    sku_col: str = "sku",
+    date_col: str = "date",
+    value_col: str = "demand",
+    n_jobs: int = 1,
+    mode: str = "local",
+    category_col: str = None,
+    freq: str = None,
+):
+    """
+    Hybrid forecast for every SKU of a long-format (sku, date, demand) panel.
+
+    Features are built once for the whole panel, Croston SBA runs as one
+    vectorized pass over all SKUs, XGB models are fitted concurrently on
+    n_jobs threads and rolled forward together with forecast_xgb_many.
+    abc_class is either one class for all SKUs or a mapping sku -> class.
+    SKUs are segmented in one pass with automatic_hybrid_weight_panel;
+    SKUs routed to "croston" (no positive demand) and SKUs too short to
+    produce a single feature row get no XGB model and fall back to pure
+    Croston (w = 0).
+
+    mode="global" replaces the per-SKU fits with one booster trained on the
+    stacked panel (see global_model.train_global_xgb); category_col is an
+    optional panel column used as an extra SKU-level feature in that mode.
+    freq (ME, W or D) is inferred from the panel dates when not given.
+
+    Returns (forecast_df, debug) where forecast_df has columns
+      sku, date, y_pred_xgb, y_pred_sba, w, y_pred_hybrid
+    and debug maps sku -> the debug dict of hybrid_forecast.
+    """
+    if mode not in ("local", "global"):
+        raise ValueError(f"Unknown mode: {mode!r} (expected 'local' or 'global')")
+    if model_kwargs is None and mode == "local":
+        model_kwargs = dict(DEFAULT_MODEL_KWARGS)
+    if n_jobs > 1 and mode == "local" and "n_jobs" not in model_kwargs:
+        model_kwargs = {**model_kwargs, "n_jobs": 1}
+
+    freq = resolve_freq(freq, panel[date_col])
+    panel_feats = make_panel_time_features(
+        panel, sku_col=sku_col, date_col=date_col, value_col=value_col, freq=freq
+    )
+    features = [c for c in panel_feats.columns if c not in ("sku", "date", "y")]
+
+    ordered = panel.sort_values([sku_col, date_col], kind="stable")
+    series = {
+        sku: pd.Series(
+            g[value_col].to_numpy(dtype=float),
+            index=pd.DatetimeIndex(g[date_col].to_numpy()),
+        )
+        for sku, g in ordered.groupby(sku_col, sort=False)
+    }
+    frames = {
+        sku: g.drop(columns="sku").reset_index(drop=True)
+        for sku, g in panel_feats.groupby("sku", sort=False)
+    }
+
+    segments = automatic_hybrid_weight_panel(
+        panel, abc_class=abc_class, sku_col=sku_col, value_col=value_col
+    )
+    route = segments["route"]
+    fit_skus = [sku for sku in series if sku in frames and route[sku] == "hybrid"]
+    if mode == "global":
+        global_model, global_features, sku_info = train_global_xgb(
+            panel,
+            steps=steps,
+            abc_class=abc_class,
+            model_kwargs=model_kwargs,
+            sku_col=sku_col,
+            date_col=date_col,
+            value_col=value_col,
+            category_col=category_col,
+            freq=freq,
+        )
+        models = {sku: global_model for sku in fit_skus}
+        features = global_features
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, n_jobs)) as pool:
+            models = dict(
+                zip(
+                    fit_skus,
+                    pool.map(
+                        lambda sku: _fit_one(frames[sku], features, model_kwargs),
+                        fit_skus,
+                    ),
+                )
+            )
+
+    # zero left-padding leaves Croston's fitted tail and forecast unchanged
+    n_max = max(len(ts) for ts in series.values())
+    Y = np.zeros((len(series), n_max))
+    for i, ts in enumerate(series.values()):
+        start = n_max - len(ts)
+        Y[i, start:] = ts.values
+    _, sba_matrix = croston_sba_matrix(Y, alpha=alpha, h=steps)
+
+    if mode == "global":
+        preds = forecast_global_xgb(
+            global_model,
+            panel,
+            features,
+            sku_info,
+            steps=steps,
+            sku_col=sku_col,
+            date_col=date_col,
+            value_col=value_col,
+            freq=freq,
+        )
+        xgb_rows = {
+            sku: g["y_pred_xgb"].to_numpy()
+            for sku, g in preds.groupby("sku", sort=False)
+            if sku in models
+        }
+    else:
+        xgb_matrix = forecast_xgb_many(
+            [models[sku] for sku in fit_skus],
+            [frames[sku] for sku in fit_skus],
+            features,
+            steps=steps,
+        )
+        xgb_rows = dict(zip(fit_skus, xgb_matrix))
+
+    out = []
+    debug = {}
+    for i, (sku, ts) in enumerate(series.items()):
+        future_sba = pd.Series(
+            sba_matrix[i],
+            index=future_index(ts.index[-1], steps, freq),
+        )
+        segment = segments.loc[sku]
+        w = float(segment["w"])
+        info = {k: segment[k] for k in ("ADI", "CV2", "class")}
+
+        if sku in xgb_rows:
+            xgb_future = pd.Series(
+                xgb_rows[sku], index=future_sba.index, name="y_pred_xgb"
+            )
+        else:
+            w = 0.0
+            xgb_future = pd.Series(np.zeros(steps), index=future_sba.index)
+
+        sba_future = future_sba.reindex(xgb_future.index).values
+        hybrid = w * xgb_future.values + (1 - w) * sba_future
+
+        out.append(
+            pd.DataFrame(
+                {
+                    "sku": sku,
+                    "date": xgb_future.index,
+                    "y_pred_xgb": xgb_future.values,
+                    "y_pred_sba": sba_future,
+                    "w": w,
+                    "y_pred_hybrid": hybrid,
+                }
+            )
+        )
+        debug[sku] = {
+            "w": w,
+            "intermittency": info,
+            "xgb_future": xgb_future,
+            "sba_future": future_sba,
+            "xgb_model": models.get(sku),
+            "df_model": frames.get(sku),
+            "features": features,
+        }
+
+    forecast_df = pd.concat(out, ignore_index=True)
+    return forecast_df, debug
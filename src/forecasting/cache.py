@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+# once over max_bytes, put() evicts down to this fraction of it, so the
+# directory is rescanned only every few puts rather than on each one
+EVICT_TO = 0.9
+
+
+def series_fingerprint(demand_ts: pd.Series, **params) -> str:
+    """
+    Content hash of a demand series (values and index) and the forecast
+    parameters. Identical inputs map to the same key across runs.
+    """
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(demand_ts.to_numpy(dtype=float)).tobytes())
+    index = pd.DatetimeIndex(demand_ts.index)
+    h.update(index.as_unit("ns").asi8.tobytes())
+    h.update(str(index.tz).encode())
+    h.update(
+        json.dumps(
+            {"version": CACHE_VERSION, **params}, sort_keys=True, default=str
+        ).encode()
+    )
+    return h.hexdigest()
+
+
+class ForecastCache:
+    """
+    On-disk cache of forecast results keyed by series_fingerprint.
+
+    Each entry is one joblib file; its mtime is refreshed on every hit and
+    the least recently used entries are evicted once the directory grows
+    beyond max_bytes. The directory size is tracked incrementally (and
+    re-read on every eviction), so put() costs O(1) filesystem calls.
+    Unreadable entries count as misses and are removed. hits and misses
+    count lookups of this instance.
+    """
+
+    def __init__(self, path="artifacts/forecast_cache", max_bytes=512 * 1024**2):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        entries = list(self.path.glob("*.pkl"))
+        self._entries = len(entries)
+        self._size = sum(p.stat().st_size for p in entries)
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}.pkl"
+
+    def get(self, key: str):
+        """
+        Cached value for key, or None on a miss.
+        """
+        entry = self._entry(key)
+        try:
+            value = joblib.load(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:  # truncated/corrupted pickles fail in many ways
+            self._remove(entry)
+            self.misses += 1
+            return None
+        os.utime(entry)
+        self.hits += 1
+        return value
+
+    def _remove(self, entry: Path):
+        try:
+            size = entry.stat().st_size
+            entry.unlink()
+        except FileNotFoundError:
+            return
+        self._size -= size
+        self._entries -= 1
+
+    def put(self, key: str, value):
+        entry = self._entry(key)
+        tmp = entry.with_suffix(".tmp")
+        joblib.dump(value, tmp)
+        size = tmp.stat().st_size
+        try:
+            size -= entry.stat().st_size  # overwriting an existing entry
+        except FileNotFoundError:
+            self._entries += 1
+        tmp.replace(entry)
+        self._size += size
+        if self._size > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_TO))
+
+    def evict(self, target_bytes: int = None):
+        """
+        Drop least recently used entries until the cache fits target_bytes
+        (default max_bytes).
+        """
+        if target_bytes is None:
+            target_bytes = self.max_bytes
+        entries = [(p, p.stat()) for p in self.path.glob("*.pkl")]
+        total = sum(st.st_size for _, st in entries)
+        kept = len(entries)
+        for p, st in sorted(entries, key=lambda e: e[1].st_mtime_ns):
+            if total <= target_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= st.st_size
+            kept -= 1
+        self._size = total
+        self._entries = kept
+
+    def clear(self):
+        for p in self.path.glob("*.pkl"):
+            p.unlink(missing_ok=True)
+        self._size = 0
+        self._entries = 0
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.path.glob("*.pkl"))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+            "size_bytes": self._size,
+        }
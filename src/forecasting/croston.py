@@ -1,24 +1,23 @@
 import numpy as np
 import pandas as pd
 
+from ..frequency import future_index, resolve_freq, shift_dates
 
-def croston_sba(ts: pd.Series, alpha: float = 0.1, h: int = 6):
+
+def croston_sba(ts: pd.Series, alpha: float = 0.1, h: int = 6, freq: str = None):
     """
     Croston's method with SBA correction for intermittent demand.
     Returns:
       fitted_sba (Series aligned to ts)
-      future_sba (Series length h)
+      future_sba (Series length h, at the next h periods of freq)
     """
     y = ts.values.astype(float)
     n = len(y)
+    freq = resolve_freq(freq, ts.index)
 
     if np.all(y == 0):
         fitted = pd.Series(np.zeros(n), index=ts.index)
-        future_idx = pd.date_range(
-            ts.index[-1] + pd.offsets.MonthEnd(1),
-            periods=h,
-            freq="ME",
-        )
+        future_idx = future_index(ts.index[-1], h, freq)
         future = pd.Series(np.zeros(h), index=future_idx)
         return fitted, future
 
@@ -45,13 +44,151 @@ def croston_sba(ts: pd.Series, alpha: float = 0.1, h: int = 6):
         f[t] = (q[t] / a[t]) if a[t] > 0 else 0.0
 
     fitted_sba = (1 - alpha / 2) * f
-    future_idx = pd.date_range(
-        ts.index[-1] + pd.offsets.MonthEnd(1),
-        periods=h,
-        freq="ME",
-    )
+    future_idx = future_index(ts.index[-1], h, freq)
     future_sba = np.repeat(fitted_sba[-1], h)
 
     return pd.Series(fitted_sba, index=ts.index), pd.Series(
         future_sba, index=future_idx
     )
+
+
+def _smooth(x: np.ndarray, alpha: float, init: float) -> np.ndarray:
+    """
+    s[0] = init, s[k] = alpha * x[k] + (1 - alpha) * s[k - 1].
+    """
+    from scipy.signal import lfilter
+
+    out = np.empty(len(x))
+    out[0] = init
+    if len(x) > 1:
+        out[1:], _ = lfilter(
+            [alpha], [1.0, alpha - 1.0], x[1:], zi=[(1 - alpha) * init]
+        )
+    return out
+
+
+def croston_sba_sparse(sparse, alpha: float = 0.1, h: int = 6):
+    """
+    Croston SBA on a SparseSeries in O(number of demand events), matching
+    croston_sba on the dense series. Size and interval are only updated on
+    demand periods, so the fitted values form a step function that changes
+    at the events alone.
+    Returns:
+      fitted_sba (Series at the event dates, holding until the next event;
+                  zero before the first one)
+      future_sba (Series length h after the end of the calendar)
+    """
+    pos = sparse.values > 0
+    positions = sparse.positions[pos]
+    future_idx = future_index(sparse.last_date, h, sparse.freq)
+    if len(positions) == 0:
+        return pd.Series(dtype=float), pd.Series(np.zeros(h), index=future_idx)
+
+    sizes = sparse.values[pos]
+    intervals = np.diff(positions, prepend=positions[0]).astype(float)
+    q = _smooth(sizes, alpha, sizes[0])
+    a = _smooth(intervals, alpha, 1.0)
+    fitted_sba = (1 - alpha / 2) * q / a
+
+    start = pd.DatetimeIndex([sparse.start]).repeat(len(positions))
+    fitted_idx = shift_dates(start, positions, sparse.freq)
+    return pd.Series(fitted_sba, index=fitted_idx), pd.Series(
+        np.repeat(fitted_sba[-1], h), index=future_idx
+    )
+
+
+def _as_matrix(Y, alpha):
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (Y.shape[0],))
+    return Y, alpha
+
+
+def _croston_ratio(Y: np.ndarray, alpha: np.ndarray):
+    """
+    Croston size/interval recursion for all rows of Y at once.
+    Returns f = q / a with the exact update order of croston_sba.
+    """
+    n_series, n = Y.shape
+    q = np.zeros(n_series)
+    a = np.zeros(n_series)
+    last = np.zeros(n_series)
+    started = np.zeros(n_series, dtype=bool)
+    f = np.zeros((n_series, n))
+
+    for t in range(n):
+        y = Y[:, t]
+        pos = y > 0
+
+        first = pos & ~started
+        q = np.where(first, y, q)
+        a = np.where(first, 1.0, a)
+
+        upd = pos & started
+        q = np.where(upd, alpha * y + (1 - alpha) * q, q)
+        a = np.where(upd, alpha * (t - last) + (1 - alpha) * a, a)
+
+        last = np.where(pos, t, last)
+        started |= pos
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f[:, t] = np.where(a > 0, q / a, 0.0)
+
+    return f
+
+
+def croston_matrix(Y, alpha=0.1, h: int = 6):
+    """
+    Plain Croston for many series at once.
+    Y is (n_series x n_periods), alpha a scalar or one value per series.
+    Returns (fitted, future) arrays of shape (n_series, n_periods) and
+    (n_series, h). Ragged panels can be left-padded with zeros.
+    """
+    Y, alpha = _as_matrix(Y, alpha)
+    f = _croston_ratio(Y, alpha)
+    return f, np.repeat(f[:, -1:], h, axis=1)
+
+
+def croston_sba_matrix(Y, alpha=0.1, h: int = 6):
+    """
+    Croston SBA for many series at once, matching croston_sba row by row.
+    Y is (n_series x n_periods), alpha a scalar or one value per series.
+    Returns (fitted, future) arrays of shape (n_series, n_periods) and
+    (n_series, h). Ragged panels can be left-padded with zeros.
+    """
+    Y, alpha = _as_matrix(Y, alpha)
+    fitted = (1 - alpha[:, None] / 2) * _croston_ratio(Y, alpha)
+    return fitted, np.repeat(fitted[:, -1:], h, axis=1)
+
+
+def tsb_matrix(Y, alpha=0.1, beta=0.1, h: int = 6):
+    """
+    Teunter-Syntetos-Babai for many series at once.
+    Demand size z is smoothed with alpha on demand periods only, demand
+    probability p is smoothed with beta every period after the first demand
+    (initialised at z = first demand, p = 1). Forecast is p * z.
+    Returns (fitted, future) arrays of shape (n_series, n_periods) and
+    (n_series, h).
+    """
+    Y, alpha = _as_matrix(Y, alpha)
+    beta = np.broadcast_to(np.asarray(beta, dtype=float), alpha.shape)
+    n_series, n = Y.shape
+
+    z = np.zeros(n_series)
+    p = np.zeros(n_series)
+    started = np.zeros(n_series, dtype=bool)
+    fitted = np.zeros((n_series, n))
+
+    for t in range(n):
+        y = Y[:, t]
+        pos = y > 0
+
+        first = pos & ~started
+        z = np.where(first, y, z)
+        p = np.where(first, 1.0, p)
+
+        z = np.where(pos & started, z + alpha * (y - z), z)
+        p = np.where(started, p + beta * (pos - p), p)
+
+        started |= pos
+        fitted[:, t] = p * z
+
+    return fitted, np.repeat(fitted[:, -1:], h, axis=1)
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from ..feature_engineering import make_panel_time_features, make_direct_features
+from ..frequency import calendar_feature, calendar_values, resolve_freq, shift_dates
+from .xgb_model import DEFAULT_MODEL_KWARGS
+from .hybrid_forecast import classify_adi_cv2_panel
+
+GLOBAL_MODEL_KWARGS = {
+    **DEFAULT_MODEL_KWARGS,
+    "n_estimators": 400,
+    "max_depth": 6,
+    "tree_method": "hist",
+    "n_jobs": -1,
+}
+
+_CLASS_CODES = {"X": 0, "Y": 1, "Z": 2}
+_ABC_CODES = {"A": 0, "B": 1, "C": 2}
+
+
+def sku_features(
+    panel: pd.DataFrame,
+    abc_class="A",
+    sku_col: str = "sku",
+    value_col: str = "demand",
+    category_col: str = None,
+):
+    """
+    Static per-SKU features for the global model: integer SKU code, category
+    code, ABC code, mean demand level and the ADI/CV2 intermittency class.
+    Returns DataFrame indexed by sku.
+    """
+    segments = classify_adi_cv2_panel(panel, sku_col=sku_col, value_col=value_col)
+    skus = segments.index
+    if isinstance(abc_class, dict):
+        abc = pd.Series([abc_class.get(sku, "A") for sku in skus], index=skus)
+    else:
+        abc = pd.Series(abc_class, index=skus)
+    info = pd.DataFrame(
+        {
+            "sku_code": np.arange(len(skus)),
+            "abc_code": abc.astype(str)
+            .str.upper()
+            .map(_ABC_CODES)
+            .fillna(1)
+            .astype(int),
+            "sku_level": panel.groupby(sku_col, sort=True)[value_col].mean(),
+            # SKUs without demand have infinite ADI/CV2: missing for XGB
+            "ADI": segments["ADI"].replace(np.inf, np.nan),
+            "CV2": segments["CV2"].replace(np.inf, np.nan),
+            "class_code": segments["class"].map(_CLASS_CODES),
+        },
+        index=skus,
+    )
+
+    if category_col is not None:
+        category = panel.groupby(sku_col, sort=True)[category_col].first()
+        info["category_code"] = category.astype("category").cat.codes.values
+    return info
+
+
+def _origin_rows(panel, sku_col, date_col, value_col, lags, roll_windows, freq):
+    """
+    Feature row for the period after each SKU's last observation.
+    """
+    last = panel.sort_values(date_col).groupby(sku_col, sort=False).tail(1)
+    nxt = last[[sku_col, date_col]].copy()
+    nxt[date_col] = shift_dates(nxt[date_col], 1, freq)
+    nxt[value_col] = 0.0
+
+    extended = pd.concat(
+        [panel[[sku_col, date_col, value_col]], nxt], ignore_index=True
+    )
+    feats = make_panel_time_features(
+        extended,
+        sku_col=sku_col,
+        date_col=date_col,
+        value_col=value_col,
+        lags=lags,
+        roll_windows=roll_windows,
+        freq=freq,
+    )
+    return feats.groupby("sku", sort=False).tail(1).drop(columns="y")
+
+
+def train_global_xgb(
+    panel: pd.DataFrame,
+    steps: int = 6,
+    abc_class="A",
+    model_kwargs: dict = None,
+    sku_col: str = "sku",
+    date_col: str = "date",
+    value_col: str = "demand",
+    category_col: str = None,
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Train one direct multi-horizon XGB model on all SKUs of a long-format
+    panel. Time features of every SKU are stacked (make_panel_time_features,
+    make_direct_features) and joined with sku_features; the booster uses the
+    histogram tree method on all cores by default.
+    Returns (model, features, sku_info).
+    """
+    from xgboost import XGBRegressor
+
+    if model_kwargs is None:
+        model_kwargs = dict(GLOBAL_MODEL_KWARGS)
+    freq = resolve_freq(freq, panel[date_col])
+
+    sku_info = sku_features(
+        panel,
+        abc_class=abc_class,
+        sku_col=sku_col,
+        value_col=value_col,
+        category_col=category_col,
+    )
+    panel_feats = make_panel_time_features(
+        panel,
+        sku_col=sku_col,
+        date_col=date_col,
+        value_col=value_col,
+        lags=lags,
+        roll_windows=roll_windows,
+        freq=freq,
+    )
+    design = make_direct_features(panel_feats, steps=steps, freq=freq).join(
+        sku_info, on="sku"
+    )
+    features = [c for c in design.columns if c not in ("sku", "date", "y")]
+
+    model = XGBRegressor(**model_kwargs)
+    model.fit(design[features], design["y"])
+
+    return model, features, sku_info
+
+
+def forecast_global_xgb(
+    model,
+    panel: pd.DataFrame,
+    features: list,
+    sku_info: pd.DataFrame,
+    steps: int = 6,
+    sku_col: str = "sku",
+    date_col: str = "date",
+    value_col: str = "demand",
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Forecast every SKU's horizon with a global model in one predict call.
+    SKUs too short to build an origin feature row are left out.
+    Returns DataFrame with columns sku, date, horizon, y_pred_xgb.
+    """
+    freq = resolve_freq(freq, panel[date_col])
+    origin = _origin_rows(panel, sku_col, date_col, value_col, lags, roll_windows, freq)
+    rows = origin.loc[origin.index.repeat(steps)].reset_index(drop=True)
+
+    h = np.tile(np.arange(1, steps + 1), len(origin))
+    rows["t"] += h - 1
+    rows["trend"] += h - 1
+    rows["date"] = shift_dates(rows["date"], h - 1, freq)
+    rows[calendar_feature(freq)] = calendar_values(rows["date"], freq)
+    rows["horizon"] = h
+    rows = rows.join(sku_info, on="sku")
+
+    rows["y_pred_xgb"] = model.predict(rows[features]).astype(float)
+    return rows[["sku", "date", "horizon", "y_pred_xgb"]]
@@ -0,0 +1,336 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import cg, splu
+
+from .batch_forecast import hybrid_forecast_batch
+
+METHODS = ("bottom_up", "top_down", "mint")
+MINT_WEIGHTS = ("ols", "struct", "var")
+CG_RTOL = 1e-10
+
+
+class Hierarchy:
+    """
+    Aggregation structure of a set of bottom-level series (SKUs).
+
+    S is the sparse (n_nodes x n_bottom) summing matrix: the rows of the
+    aggregate nodes come first (total, then every level in the given order),
+    followed by an identity block for the bottom series, so that
+    all_nodes = S @ bottom. nodes names every row and level maps each node
+    to its level name ("total", a grouping column, "a/b" for a crossed
+    grouping, or the SKU column for the bottom level).
+    """
+
+    def __init__(self, S, nodes, level, bottom_level: str = "sku"):
+        self.S = sparse.csr_matrix(S)
+        self.nodes = pd.Index(nodes, name="node")
+        self.level = pd.Series(np.asarray(level), index=self.nodes, name="level")
+        self.bottom_level = bottom_level
+        self.n_bottom = self.S.shape[1]
+        self.n_agg = self.S.shape[0] - self.n_bottom
+
+    @classmethod
+    def from_frame(
+        cls, mapping: pd.DataFrame, levels, sku_col: str = "sku", total: bool = True
+    ):
+        """
+        Build the hierarchy from one row per SKU carrying its parent labels,
+        e.g. columns sku, family, warehouse. levels lists grouping columns,
+        or tuples of columns for crossed groupings (family x warehouse).
+        """
+        mapping = mapping.drop_duplicates(sku_col).reset_index(drop=True)
+        bottom = mapping[sku_col].to_numpy()
+        n_bottom = len(bottom)
+        cols = np.arange(n_bottom)
+
+        names, level_names, rows, row_cols = [], [], [], []
+        if total:
+            names.append("total")
+            level_names.append("total")
+            rows.append(np.zeros(n_bottom, dtype=np.int64))
+            row_cols.append(cols)
+
+        for spec in levels:
+            keys = [spec] if isinstance(spec, str) else list(spec)
+            codes, uniques = pd.MultiIndex.from_frame(mapping[keys]).factorize()
+            offset = len(names)
+            for values in uniques:
+                values = values if isinstance(values, tuple) else (values,)
+                names.append("/".join(f"{k}={v}" for k, v in zip(keys, values)))
+                level_names.append("/".join(keys))
+            rows.append(offset + codes)
+            row_cols.append(cols)
+
+        n_agg = len(names)
+        agg = sparse.csr_matrix(
+            (
+                np.ones(sum(len(r) for r in rows)),
+                (np.concatenate(rows), np.concatenate(row_cols)),
+            ),
+            shape=(n_agg, n_bottom),
+        )
+        S = sparse.vstack([agg, sparse.identity(n_bottom, format="csr")], "csr")
+        return cls(
+            S,
+            names + list(bottom),
+            level_names + [sku_col] * n_bottom,
+            bottom_level=sku_col,
+        )
+
+    @property
+    def bottom(self) -> pd.Index:
+        n_agg = self.n_agg
+        return self.nodes[n_agg:]
+
+    @property
+    def C(self):
+        """
+        Aggregation block of S (aggregate nodes x bottom series).
+        """
+        n_agg = self.n_agg
+        return self.S[:n_agg]
+
+    def levels(self) -> list:
+        return list(dict.fromkeys(self.level))
+
+    def nodes_at(self, levels) -> pd.Index:
+        levels = [levels] if isinstance(levels, str) else list(levels)
+        return self.nodes[self.level.isin(levels).to_numpy()]
+
+    def bottom_matrix(
+        self,
+        panel: pd.DataFrame,
+        sku_col: str = "sku",
+        date_col: str = "date",
+        value_col: str = "demand",
+    ) -> pd.DataFrame:
+        """
+        Bottom-level series of a long-format panel as a wide (n_bottom x
+        n_dates) frame in hierarchy order; missing periods are zero.
+        """
+        dates, date_codes = np.unique(panel[date_col].to_numpy(), return_inverse=True)
+        sku_codes = self.bottom.get_indexer(panel[sku_col])
+        if (sku_codes < 0).any():
+            unknown = panel.loc[sku_codes < 0, sku_col].unique()[:5]
+            raise ValueError(f"SKUs missing from the hierarchy: {list(unknown)}")
+        Y = np.zeros((self.n_bottom, len(dates)))
+        np.add.at(Y, (sku_codes, date_codes), panel[value_col].to_numpy(dtype=float))
+        return pd.DataFrame(Y, index=self.bottom, columns=pd.DatetimeIndex(dates))
+
+    def aggregate(
+        self,
+        panel: pd.DataFrame,
+        sku_col: str = "sku",
+        date_col: str = "date",
+        value_col: str = "demand",
+    ) -> pd.DataFrame:
+        """
+        Every node's series (S @ bottom) as a long frame with columns
+        node, level, date, demand.
+        """
+        wide = self.bottom_matrix(panel, sku_col, date_col, value_col)
+        values = self.S @ wide.to_numpy()
+        return pd.DataFrame(
+            {
+                "node": np.repeat(self.nodes.to_numpy(), values.shape[1]),
+                "level": np.repeat(self.level.to_numpy(), values.shape[1]),
+                "date": np.tile(wide.columns.to_numpy(), len(self.nodes)),
+                "demand": values.ravel(),
+            }
+        )
+
+
+def _solve_spd(K, rhs):
+    """
+    Solve K x = rhs (one column per forecast date) for a sparse symmetric
+    positive definite K: Jacobi-preconditioned conjugate gradients, which
+    avoids the fill-in a sparse LU suffers with crossed levels. Columns
+    that do not converge are solved with a symmetric-ordered sparse LU.
+    """
+    K = sparse.csr_matrix(K)
+    M = sparse.diags(1.0 / K.diagonal())
+    x = np.empty_like(rhs)
+    lu = None
+    for j in range(rhs.shape[1]):
+        x[:, j], info = cg(K, rhs[:, j], M=M, rtol=CG_RTOL, atol=0.0)
+        if info != 0:
+            if lu is None:
+                lu = splu(sparse.csc_matrix(K), permc_spec="MMD_AT_PLUS_A")
+            x[:, j] = lu.solve(np.ascontiguousarray(rhs[:, j]))
+    return x
+
+
+def _mint_bottom(hierarchy: Hierarchy, base: np.ndarray, w: np.ndarray):
+    """
+    Bottom-level MinT/WLS solution for a diagonal error covariance w.
+
+    Uses the constraint form: with coherence errors e = a - C b and
+    K = W_a + C W_b C', the reconciled bottom is b + W_b C' K^-1 e. K is
+    sparse, SPD and only n_agg x n_agg, so no dense n_bottom system is
+    formed.
+    """
+    n_agg = hierarchy.n_agg
+    C = hierarchy.C
+    w_agg, w_bottom = w[:n_agg], w[n_agg:]
+    a, b = base[:n_agg], base[n_agg:]
+
+    K = sparse.diags(w_agg) + C @ sparse.diags(w_bottom) @ C.T
+    lam = _solve_spd(K, np.asarray(a - C @ b, dtype=float))
+    return b + w_bottom[:, None] * (C.T @ lam)
+
+
+def reconcile(
+    hierarchy: Hierarchy,
+    base: pd.DataFrame,
+    method: str = "mint",
+    weights: str = "struct",
+    variances=None,
+    proportions=None,
+) -> pd.DataFrame:
+    """
+    Coherent forecasts for every node from base forecasts.
+
+    base is a wide frame indexed by node with one column per forecast date;
+    nodes that were not forecast may be missing or NaN.
+      bottom_up - sum the bottom forecasts (S @ b)
+      top_down  - split the total forecast by proportions (per bottom series,
+                  e.g. historical_proportions)
+      mint      - minimum-trace/WLS projection of all base forecasts with a
+                  diagonal error covariance: "ols" (identity), "struct"
+                  (number of series under each node) or "var" (per-node
+                  variances, e.g. in-sample residual variances)
+    Returns a wide frame indexed by node (all nodes of the hierarchy).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method!r} (expected one of {METHODS})")
+    base = base.reindex(hierarchy.nodes)
+    Yhat = base.to_numpy(dtype=float)
+    n_agg = hierarchy.n_agg
+
+    if method == "bottom_up":
+        bottom = Yhat[n_agg:]
+        if np.isnan(bottom).any():
+            raise ValueError("bottom_up needs a forecast for every bottom series")
+    elif method == "top_down":
+        if "total" not in hierarchy.nodes or base.loc["total"].isna().any():
+            raise ValueError("top_down needs a forecast for the total node")
+        if proportions is None:
+            raise ValueError("top_down needs proportions per bottom series")
+        p = pd.Series(proportions).reindex(hierarchy.bottom).fillna(0.0).to_numpy()
+        bottom = np.outer(p, base.loc["total"].to_numpy(dtype=float))
+    else:
+        if np.isnan(Yhat).any():
+            raise ValueError("mint needs a forecast for every node")
+        if weights == "ols":
+            w = np.ones(len(hierarchy.nodes))
+        elif weights == "struct":
+            w = np.asarray(hierarchy.S.sum(axis=1)).ravel()
+        elif weights == "var":
+            if variances is None:
+                raise ValueError('weights="var" needs per-node variances')
+            w = pd.Series(variances).reindex(hierarchy.nodes).to_numpy(dtype=float)
+            if np.isnan(w).any() or (w <= 0).any():
+                raise ValueError("variances must be positive for every node")
+        else:
+            raise ValueError(
+                f"Unknown weights: {weights!r} (expected one of {MINT_WEIGHTS})"
+            )
+        bottom = _mint_bottom(hierarchy, Yhat, w)
+
+    return pd.DataFrame(
+        hierarchy.S @ bottom, index=hierarchy.nodes, columns=base.columns
+    )
+
+
+def historical_proportions(hierarchy: Hierarchy, bottom_wide: pd.DataFrame):
+    """
+    Share of each bottom series in total historical demand (top-down
+    "proportions of historical averages").
+    """
+    totals = bottom_wide.reindex(hierarchy.bottom).fillna(0.0).sum(axis=1)
+    grand = totals.sum()
+    if grand <= 0:
+        return pd.Series(1.0 / hierarchy.n_bottom, index=hierarchy.bottom)
+    return totals / grand
+
+
+def hierarchical_forecast(
+    panel: pd.DataFrame,
+    hierarchy: Hierarchy,
+    levels=None,
+    method: str = "mint",
+    weights: str = "struct",
+    steps: int = 6,
+    variances=None,
+    sku_col: str = "sku",
+    date_col: str = "date",
+    value_col: str = "demand",
+    **forecast_kwargs,
+):
+    """
+    Forecast the chosen levels of a hierarchy and reconcile them.
+
+    The bottom panel is aggregated to every node with the summing matrix,
+    the nodes of levels are forecast in one hybrid_forecast_batch call
+    (forecast_kwargs are passed on, e.g. mode="global") and the base
+    forecasts are reconciled with method. levels defaults to what the
+    method needs: the bottom level for bottom_up, total for top_down and
+    every level for mint.
+
+    Returns (forecast_df, debug) where forecast_df has columns
+      node, level, date, y_pred_base, y_pred_reconciled
+    and debug holds the base forecast frame and the top-down proportions.
+    """
+    if levels is None:
+        levels = {
+            "bottom_up": [hierarchy.bottom_level],
+            "top_down": ["total"],
+            "mint": hierarchy.levels(),
+        }.get(method, hierarchy.levels())
+    if method == "top_down" and "total" not in hierarchy.nodes:
+        raise ValueError(
+            "top_down needs a total node; build the hierarchy with total=True"
+        )
+    targets = hierarchy.nodes_at(levels)
+    if targets.empty:
+        raise ValueError(f"The hierarchy has no nodes at levels {list(levels)}")
+
+    all_nodes = hierarchy.aggregate(panel, sku_col, date_col, value_col)
+    node_panel = all_nodes[all_nodes["node"].isin(targets)]
+    base_df, _ = hybrid_forecast_batch(
+        node_panel,
+        steps=steps,
+        sku_col="node",
+        date_col="date",
+        value_col="demand",
+        **forecast_kwargs,
+    )
+    base = base_df.pivot(index="sku", columns="date", values="y_pred_hybrid")
+
+    proportions = None
+    if method == "top_down":
+        proportions = historical_proportions(
+            hierarchy, hierarchy.bottom_matrix(panel, sku_col, date_col, value_col)
+        )
+    reconciled = reconcile(
+        hierarchy,
+        base,
+        method=method,
+        weights=weights,
+        variances=variances,
+        proportions=proportions,
+    )
+
+    base = base.reindex(index=hierarchy.nodes, columns=reconciled.columns)
+    n_dates = reconciled.shape[1]
+    forecast_df = pd.DataFrame(
+        {
+            "node": np.repeat(hierarchy.nodes.to_numpy(), n_dates),
+            "level": np.repeat(hierarchy.level.to_numpy(), n_dates),
+            "date": np.tile(reconciled.columns.to_numpy(), len(hierarchy.nodes)),
+            "y_pred_base": base.to_numpy().ravel(),
+            "y_pred_reconciled": reconciled.to_numpy().ravel(),
+        }
+    )
+    return forecast_df, {"base": base_df, "proportions": proportions}
@@ -1,27 +1,49 @@
 import numpy as np
 import pandas as pd
 
-from .xgb_model import train_xgb, forecast_xgb
+from ..feature_engineering import make_time_features
+from .xgb_model import (
+    train_xgb,
+    forecast_xgb_fast,
+    train_xgb_direct,
+    forecast_xgb_direct,
+)
 from .croston import croston_sba
+from .cache import series_fingerprint
+from .sparse import SparseSeries
+from ..frequency import resolve_freq
 
+# Syntetos–Boylan cut-offs and the blend weight per class / ABC class
+ADI_CUTOFF = 1.32
+CV2_CUTOFF = 0.49
+CLASS_WEIGHTS = {"X": 0.85, "Y": 0.70, "Z": 0.55}
+ABC_ADJUSTMENT = {"A": 0.05, "C": -0.05}
+W_MIN, W_MAX = 0.3, 0.9
 
-def classify_adi_cv2(ts: pd.Series):
+
+def classify_adi_cv2(ts):
     """
-    Syntetos–Boylan intermittency classification.
+    Syntetos–Boylan intermittency classification of a Series or a
+    SparseSeries (which only touches its demand events).
     Returns dict with ADI, CV2, class in {"X","Y","Z"}.
     """
-    y = ts.values.astype(float)
-    nz = y[y > 0]
+    if isinstance(ts, SparseSeries):
+        n = ts.n_periods
+        nz = ts.values[ts.values > 0]
+    else:
+        y = ts.values.astype(float)
+        n = len(y)
+        nz = y[y > 0]
 
     if len(nz) == 0:
         return {"ADI": np.inf, "CV2": np.inf, "class": "Z"}
 
-    adi = len(y) / len(nz)
+    adi = n / len(nz)
     cv2 = (nz.std() / nz.mean()) ** 2 if nz.mean() > 0 else np.inf
 
-    if adi < 1.32 and cv2 < 0.49:
+    if adi < ADI_CUTOFF and cv2 < CV2_CUTOFF:
         klass = "X"
-    elif adi < 1.32 and cv2 >= 0.49:
+    elif adi < ADI_CUTOFF and cv2 >= CV2_CUTOFF:
         klass = "Y"
     else:
         klass = "Z"
@@ -35,22 +57,95 @@ def automatic_hybrid_weight(ts: pd.Series, abc_class: str = "A"):
       y_hybrid = w * y_xgb + (1-w) * y_croston
     """
     info = classify_adi_cv2(ts)
-    klass = info["class"]
+    w = CLASS_WEIGHTS[info["class"]] + ABC_ADJUSTMENT.get(abc_class.upper(), 0.0)
+    return max(W_MIN, min(W_MAX, w)), info
 
-    if klass == "X":
-        w = 0.85
-    elif klass == "Y":
-        w = 0.70
-    else:
-        w = 0.55
 
-    abc_class = abc_class.upper()
-    if abc_class == "A":
-        w += 0.05
-    elif abc_class == "C":
-        w -= 0.05
+def _group_moments(data, sku_col, value_col):
+    """
+    Per-SKU period count, number of demand periods and mean/variance of the
+    positive demands, from a long frame (one row per SKU and period) or a
+    2-D array (one row per SKU, NaN outside a series).
+    """
+    if isinstance(data, pd.DataFrame):
+        codes, skus = pd.factorize(data[sku_col], sort=True)
+        y = data[value_col].to_numpy(dtype=float)
+        pos = y > 0
+        n_skus = len(skus)
+        n = np.bincount(codes, minlength=n_skus)
+        k = np.bincount(codes, weights=pos, minlength=n_skus)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(codes, weights=y * pos, minlength=n_skus) / k
+            dev = np.where(pos, y - mean[codes], 0.0)
+            var = np.bincount(codes, weights=dev * dev, minlength=n_skus) / k
+        return pd.Index(skus, name="sku"), n, k, mean, var
+
+    Y = np.asarray(data, dtype=float)
+    if Y.ndim != 2:
+        raise ValueError("expected a long DataFrame or a 2-D array (SKUs x periods)")
+    pos = Y > 0
+    n = np.isfinite(Y).sum(axis=1)
+    k = pos.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(pos, Y, 0.0).sum(axis=1) / k
+        dev = np.where(pos, Y - mean[:, None], 0.0)
+        var = (dev * dev).sum(axis=1) / k
+    return pd.RangeIndex(len(Y), name="sku"), n, k, mean, var
+
+
+def classify_adi_cv2_panel(
+    data, sku_col: str = "sku", value_col: str = "demand", index=None
+) -> pd.DataFrame:
+    """
+    classify_adi_cv2 for every SKU in one vectorized pass.
 
-    return max(0.3, min(0.9, w)), info
+    data is a long-format frame with one row per SKU and period (sku_col,
+    value_col) or a 2-D array with one row per SKU, where NaN marks periods
+    outside a series; index optionally labels the rows of an array.
+    Returns DataFrame indexed by sku with ADI, CV2 and class.
+    """
+    skus, n, k, mean, var = _group_moments(data, sku_col, value_col)
+    if index is not None:
+        skus = pd.Index(index, name="sku")
+
+    has_demand = k > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        adi = np.where(has_demand, n / k, np.inf)
+        cv2 = np.where(has_demand, var / mean**2, np.inf)
+    smooth_timing = adi < ADI_CUTOFF
+    klass = np.where(
+        smooth_timing & (cv2 < CV2_CUTOFF),
+        "X",
+        np.where(smooth_timing, "Y", "Z"),
+    )
+    return pd.DataFrame({"ADI": adi, "CV2": cv2, "class": klass}, index=skus)
+
+
+def automatic_hybrid_weight_panel(
+    data,
+    abc_class="A",
+    sku_col: str = "sku",
+    value_col: str = "demand",
+    index=None,
+) -> pd.DataFrame:
+    """
+    automatic_hybrid_weight for every SKU: the classify_adi_cv2_panel table
+    plus the blend weight w and the model route, "hybrid" (XGB + Croston
+    blended with w) or "croston" for SKUs without any positive demand,
+    which leave XGB nothing to learn. abc_class is one class for all SKUs
+    or a mapping sku -> class (default "A").
+    """
+    table = classify_adi_cv2_panel(data, sku_col, value_col, index=index)
+    if isinstance(abc_class, (dict, pd.Series)):
+        abc = pd.Series(abc_class).reindex(table.index).fillna("A")
+    else:
+        abc = pd.Series(abc_class, index=table.index)
+    adjustment = abc.astype(str).str.upper().map(ABC_ADJUSTMENT).fillna(0.0)
+
+    w = table["class"].map(CLASS_WEIGHTS) + adjustment
+    table["w"] = w.clip(W_MIN, W_MAX)
+    table["route"] = np.where(np.isfinite(table["ADI"]), "hybrid", "croston")
+    return table
 
 
 def hybrid_forecast(
@@ -58,15 +153,72 @@ def hybrid_forecast(
     abc_class: str = "A",
     steps: int = 6,
     alpha: float = 0.1,
+    strategy: str = "recursive",
+    model_kwargs: dict = None,
+    xgb_model=None,
+    cache=None,
+    freq: str = None,
 ):
     """
     Hybrid intermittent-demand forecast.
+    strategy selects the XGB multi-step mode: "recursive" rolls a one-step
+    model forward, "direct" predicts all steps at once with a horizon-aware
+    model. model_kwargs are passed on to XGBRegressor. A fitted recursive
+    xgb_model (e.g. from update_xgb) is used as is instead of training one;
+    it cannot drive the direct strategy (ValueError).
+    With a ForecastCache, results for an identical series and parameters
+    are returned from disk without retraining. demand_ts may be monthly,
+    weekly or daily (freq is inferred from its index when not given); a
+    SparseSeries is densified for the XGB features.
     Returns (full_pred, debug_dict)
     """
-    xgb_model, df_model, features = train_xgb(demand_ts)
-    xgb_future = forecast_xgb(xgb_model, df_model, features, steps=steps)
+    if isinstance(demand_ts, SparseSeries):
+        freq = demand_ts.freq if freq is None else freq
+        demand_ts = demand_ts.to_dense()
+    freq = resolve_freq(freq, demand_ts.index)
+    if xgb_model is not None and strategy == "direct":
+        raise ValueError(
+            "xgb_model is a recursive one-step model; strategy='direct' "
+            "would discard it and train a horizon-aware model instead"
+        )
+
+    key = None
+    if cache is not None and xgb_model is None:
+        key = series_fingerprint(
+            demand_ts,
+            abc_class=abc_class,
+            steps=steps,
+            alpha=alpha,
+            strategy=strategy,
+            model_kwargs=model_kwargs,
+            freq=freq,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if strategy == "recursive":
+        if xgb_model is None:
+            xgb_model, df_model, features = train_xgb(
+                demand_ts, model_kwargs=model_kwargs, freq=freq
+            )
+        else:
+            df_model = make_time_features(demand_ts, freq=freq)
+            features = [c for c in df_model.columns if c not in ("date", "y")]
+        xgb_future = forecast_xgb_fast(
+            xgb_model, df_model, features, steps=steps, freq=freq
+        )
+    elif strategy == "direct":
+        xgb_model, df_model, features = train_xgb_direct(
+            demand_ts, steps=steps, model_kwargs=model_kwargs, freq=freq
+        )
+        xgb_future = forecast_xgb_direct(
+            xgb_model, demand_ts, features, steps=steps, freq=freq
+        )
+    else:
+        raise ValueError(f"Unknown strategy: {strategy!r}")
 
-    fitted_sba, future_sba = croston_sba(demand_ts, alpha=alpha, h=steps)
+    fitted_sba, future_sba = croston_sba(demand_ts, alpha=alpha, h=steps, freq=freq)
 
     w, info = automatic_hybrid_weight(demand_ts, abc_class=abc_class)
 
@@ -86,6 +238,9 @@ def hybrid_forecast(
         "xgb_model": xgb_model,
         "df_model": df_model,
         "features": features,
+        "strategy": strategy,
     }
 
+    if key is not None:
+        cache.put(key, (hybrid_future, debug))
     return hybrid_future, debug
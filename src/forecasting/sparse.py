@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+from ..frequency import period_alias, resolve_freq, shift_dates
+
+
+class SparseSeries:
+    """
+    Intermittent demand series stored as its non-zero periods only.
+
+    positions are the integer period offsets (0-based, increasing) of the
+    demand events within a regular calendar of n_periods periods of freq
+    starting at start; values are the demand in those periods. Memory and
+    the sparse routines (croston_sba_sparse, classify_adi_cv2) scale with
+    the number of events rather than the calendar length.
+    """
+
+    __slots__ = ("positions", "values", "start", "n_periods", "freq", "name")
+
+    def __init__(self, positions, values, start, n_periods, freq="D", name=None):
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.values = np.asarray(values, dtype=float)
+        self.start = pd.Timestamp(start)
+        self.n_periods = int(n_periods)
+        self.freq = freq
+        self.name = name
+        if self.positions.shape != self.values.shape:
+            raise ValueError("positions and values must have the same length")
+        if len(self.positions) and (
+            self.positions[0] < 0 or self.positions[-1] >= self.n_periods
+        ):
+            raise ValueError("positions must lie within [0, n_periods)")
+
+    @classmethod
+    def from_series(cls, ts: pd.Series, freq: str = None):
+        """
+        Sparse copy of a regular dense series (freq inferred from its index).
+        """
+        y = ts.to_numpy(dtype=float)
+        nz = np.flatnonzero(y)
+        return cls(
+            nz,
+            y[nz],
+            ts.index[0],
+            len(y),
+            freq=resolve_freq(freq, ts.index),
+            name=ts.name,
+        )
+
+    @classmethod
+    def from_events(cls, dates, quantities, freq: str = "D", start=None, end=None):
+        """
+        Aggregate raw demand events (e.g. order lines) into periods of freq
+        without materialising the empty periods. The calendar spans the
+        events unless start/end widen it.
+        """
+        alias = period_alias(freq)
+        periods = pd.PeriodIndex(pd.DatetimeIndex(dates), freq=alias)
+        ordinals = periods.asi8
+        qty = np.asarray(quantities, dtype=float)
+
+        first = ordinals.min() if len(ordinals) else None
+        last = ordinals.max() if len(ordinals) else None
+        if start is not None:
+            first = pd.Period(start, freq=alias).ordinal
+        if end is not None:
+            last = pd.Period(end, freq=alias).ordinal
+        if first is None or last is None:
+            raise ValueError("no events and no start/end to define the calendar")
+
+        keep = (ordinals >= first) & (ordinals <= last)
+        codes, inverse = np.unique(ordinals[keep] - first, return_inverse=True)
+        totals = np.bincount(inverse, weights=qty[keep], minlength=len(codes))
+        nonzero = totals != 0
+
+        start_ts = pd.Period(ordinal=first, freq=alias).end_time.normalize()
+        return cls(codes[nonzero], totals[nonzero], start_ts, last - first + 1, freq)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.positions)
+
+    @property
+    def nbytes(self) -> int:
+        return self.positions.nbytes + self.values.nbytes
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """
+        Full calendar (built on demand).
+        """
+        return pd.date_range(self.start, periods=self.n_periods, freq=self.freq)
+
+    @property
+    def event_index(self) -> pd.DatetimeIndex:
+        start = pd.DatetimeIndex([self.start]).repeat(self.nnz)
+        return shift_dates(start, self.positions, self.freq)
+
+    @property
+    def last_date(self) -> pd.Timestamp:
+        return shift_dates([self.start], self.n_periods - 1, self.freq)[0]
+
+    def to_dense(self) -> pd.Series:
+        y = np.zeros(self.n_periods)
+        y[self.positions] = self.values
+        return pd.Series(y, index=self.index, name=self.name)
+
+    def __len__(self):
+        return self.n_periods
+
+    def __repr__(self):
+        return (
+            f"SparseSeries(name={self.name!r}, freq={self.freq!r}, "
+            f"n_periods={self.n_periods}, nnz={self.nnz})"
+        )
@@ -1,8 +1,31 @@
+import re
+
 import numpy as np
 import pandas as pd
-from xgboost import XGBRegressor
 
-from ..feature_engineering import make_time_features
+from ..feature_engineering import (
+    make_time_features,
+    make_origin_features,
+    make_direct_features,
+)
+from ..frequency import (
+    calendar_feature,
+    calendar_values,
+    future_index,
+    granularity,
+    resolve_freq,
+    shift_dates,
+)
+
+DEFAULT_MODEL_KWARGS = dict(
+    n_estimators=250,
+    max_depth=3,
+    learning_rate=0.08,
+    subsample=0.9,
+    colsample_bytree=0.9,
+    objective="reg:squarederror",
+    random_state=42,
+)
 
 
 def train_xgb(
@@ -10,22 +33,37 @@ def train_xgb(
     model_kwargs: dict = None,
     lags=(1, 2, 3),
     roll_windows=(3, 6),
+    feature_store=None,
+    sku=None,
+    freq: str = None,
 ):
     """
-    Train XGBoost baseline forecaster on monthly demand.
+    Train XGBoost baseline forecaster on monthly, weekly or daily demand.
+    With a FeatureStore (monthly only), demand_ts is appended to the store
+    under sku and the features are read back from it instead of being
+    recomputed.
     """
+    from xgboost import XGBRegressor
+
     if model_kwargs is None:
-        model_kwargs = dict(
-            n_estimators=250,
-            max_depth=3,
-            learning_rate=0.08,
-            subsample=0.9,
-            colsample_bytree=0.9,
-            objective="reg:squarederror",
-            random_state=42,
-        )
+        model_kwargs = dict(DEFAULT_MODEL_KWARGS)
 
-    df_model = make_time_features(demand_ts, lags=lags, roll_windows=roll_windows)
+    if feature_store is not None:
+        if sku is None:
+            raise ValueError("sku is required when training from a feature store")
+        if (feature_store.lags, feature_store.roll_windows) != (
+            tuple(lags),
+            tuple(roll_windows),
+        ):
+            raise ValueError("feature store was built with different lags/windows")
+        if granularity(resolve_freq(freq, demand_ts.index)) != "monthly":
+            raise ValueError("feature store only supports monthly series")
+        feature_store.update(sku, demand_ts)
+        df_model = feature_store.features(sku)
+    else:
+        df_model = make_time_features(
+            demand_ts, lags=lags, roll_windows=roll_windows, freq=freq
+        )
     features = [c for c in df_model.columns if c not in ("date", "y")]
 
     model = XGBRegressor(**model_kwargs)
@@ -34,11 +72,15 @@ def train_xgb(
     return model, df_model, features
 
 
-def forecast_xgb(model, df_model: pd.DataFrame, features: list, steps: int = 6):
+def forecast_xgb(
+    model, df_model: pd.DataFrame, features: list, steps: int = 6, freq: str = None
+):
     """
     Autoregressive rollout for XGB models using last known features.
-    Returns Series indexed by future month end.
+    Returns Series indexed by the future period ends.
     """
+    freq = resolve_freq(freq, df_model["date"])
+    calendar = calendar_feature(freq)
     last_row = df_model.iloc[-1].copy()
 
     t = int(last_row["t"])
@@ -58,13 +100,13 @@ def forecast_xgb(model, df_model: pd.DataFrame, features: list, steps: int = 6):
     future_rows = []
 
     for _ in range(steps):
-        current_date = current_date + pd.offsets.MonthEnd(1)
+        current_date = shift_dates([current_date], 1, freq)[0]
         t += 1
         trend += 1
 
         row_feat = {
             "t": t,
-            "month": current_date.month,
+            calendar: calendar_values([current_date], freq)[0],
             "lag1": lag1,
             "lag2": lag2,
             "lag3": lag3,
@@ -94,3 +136,325 @@ def forecast_xgb(model, df_model: pd.DataFrame, features: list, steps: int = 6):
 
     future_df = pd.DataFrame(future_rows).set_index("date")
     return future_df["y_pred_xgb"]
+
+
+def update_xgb(
+    model,
+    demand_ts: pd.Series,
+    since=None,
+    n_estimators: int = 25,
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Warm-start a fitted XGB model: continue boosting n_estimators more trees
+    on the feature rows of demand_ts dated after since (all rows if None).
+    Returns (model, df_model, features) like train_xgb; the input model is
+    returned unchanged when there are no new rows.
+    """
+    df_model = make_time_features(
+        demand_ts, lags=lags, roll_windows=roll_windows, freq=freq
+    )
+    features = [c for c in df_model.columns if c not in ("date", "y")]
+
+    new_rows = df_model
+    if since is not None:
+        new_rows = df_model[df_model["date"] > pd.Timestamp(since)]
+    if new_rows.empty:
+        return model, df_model, features
+
+    warm = continue_xgb(model, new_rows, features, n_estimators=n_estimators)
+    return warm, df_model, features
+
+
+def continue_xgb(model, rows: pd.DataFrame, features: list, n_estimators: int = 25):
+    """
+    New XGBRegressor that continues boosting model with n_estimators more
+    trees fitted on rows (feature columns plus y).
+    """
+    from xgboost import XGBRegressor
+
+    # unset (None) hyperparameters, e.g. of a booster loaded without its
+    # sidecar, fall back to the training defaults rather than XGBoost's
+    params = {k: v for k, v in model.get_params().items() if v is not None}
+    params = {**DEFAULT_MODEL_KWARGS, **params, "n_estimators": n_estimators}
+    warm = XGBRegressor(**params)
+    warm.fit(rows[features], rows["y"], xgb_model=model.get_booster())
+    return warm
+
+
+def train_xgb_direct(
+    demand_ts: pd.Series,
+    steps: int = 6,
+    model_kwargs: dict = None,
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Train a single direct multi-horizon XGBoost forecaster with the horizon
+    as a feature (see make_direct_features).
+    Returns (model, df_model, features) like train_xgb.
+    """
+    from xgboost import XGBRegressor
+
+    if model_kwargs is None:
+        model_kwargs = dict(DEFAULT_MODEL_KWARGS)
+
+    freq = resolve_freq(freq, demand_ts.index)
+    df_model = make_time_features(
+        demand_ts, lags=lags, roll_windows=roll_windows, freq=freq
+    )
+    df_direct = make_direct_features(df_model, steps=steps, freq=freq)
+    features = [c for c in df_direct.columns if c not in ("date", "y")]
+
+    model = XGBRegressor(**model_kwargs)
+    model.fit(df_direct[features], df_direct["y"])
+
+    return model, df_model, features
+
+
+def forecast_xgb_direct(
+    model,
+    demand_ts: pd.Series,
+    features: list,
+    steps: int = 6,
+    lags=(1, 2, 3),
+    roll_windows=(3, 6),
+    freq: str = None,
+):
+    """
+    Direct multi-horizon forecast: all steps are predicted in one call from
+    the features known at the end of demand_ts, without feeding predictions
+    back in. Returns Series indexed by the future period ends.
+    """
+    freq = resolve_freq(freq, demand_ts.index)
+    origin = make_origin_features(
+        demand_ts, lags=lags, roll_windows=roll_windows, freq=freq
+    )
+    rows = origin.loc[origin.index.repeat(steps)].reset_index(drop=True)
+
+    h = np.arange(1, steps + 1)
+    dates = pd.date_range(origin["date"].iloc[0], periods=steps, freq=freq)
+    rows["t"] += h - 1
+    rows["trend"] += h - 1
+    rows[calendar_feature(freq)] = calendar_values(dates, freq)
+    rows["horizon"] = h
+
+    y_pred = model.predict(rows[features])
+    return pd.Series(
+        y_pred.astype(float), index=dates.rename("date"), name="y_pred_xgb"
+    )
+
+
+_LAG_RE = re.compile(r"^lag(\d+)$")
+_ROLL_RE = re.compile(r"^rolling_(mean|std|min|max)_(\d+)$")
+
+
+class _RollingWindows:
+    """
+    Trailing windows over the last values of n series, advanced together.
+
+    Values live in a ring buffer (NaN marks periods not observed yet).
+    Mean/std come from running sums of deviations from a per-series shift,
+    the mean of the seed values, so the variance does not cancel
+    catastrophically at large demand levels with small spread. Min/max scan
+    the w ring slots of a window column by column into a reused buffer:
+    windows span a handful of periods, and this vectorises across series
+    where monotonic deques would need a Python loop per series. No method
+    allocates arrays.
+    """
+
+    def __init__(self, seed: np.ndarray, windows):
+        # seed: (n, max_w), oldest to newest, NaN-padded on the left
+        n, max_w = seed.shape
+        self.windows = sorted(set(windows))
+        self.size = max_w + 1
+        self.ring = np.full((n, self.size), np.nan)
+        self.ring[:, :max_w] = seed
+        self.pos = max_w  # slot of the next value
+
+        valid = ~np.isnan(seed)
+        count = valid.sum(axis=1)
+        total = np.where(valid, seed, 0.0).sum(axis=1)
+        self.shift = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+        dev = np.where(valid, seed - self.shift[:, None], 0.0)
+        self.sums = {w: dev[:, -w:].sum(axis=1) for w in self.windows}
+        self.sumsq = {w: (dev[:, -w:] ** 2).sum(axis=1) for w in self.windows}
+        self.counts = {w: valid[:, -w:].sum(axis=1) for w in self.windows}
+
+        self._new = np.empty(n)
+        self._new_sq = np.empty(n)
+        self._old = np.empty(n)
+        self._missing = np.empty(n, dtype=bool)
+
+    def _slot(self, back: int) -> int:
+        # ring column holding the value `back` periods before the newest
+        return (self.pos - 1 - back) % self.size
+
+    def push(self, y: np.ndarray):
+        np.subtract(y, self.shift, out=self._new)
+        np.multiply(self._new, self._new, out=self._new_sq)
+        for w in self.windows:
+            leaving = self.ring[:, (self.pos - w) % self.size]
+            np.isnan(leaving, out=self._missing)
+            np.subtract(leaving, self.shift, out=self._old)
+            np.copyto(self._old, 0.0, where=self._missing)
+            self.sums[w] += self._new
+            self.sums[w] -= self._old
+            self.sumsq[w] += self._new_sq
+            np.multiply(self._old, self._old, out=self._old)
+            self.sumsq[w] -= self._old
+            self.counts[w] += self._missing
+        self.ring[:, self.pos % self.size] = y
+        self.pos += 1
+
+    def mean(self, w: int, out: np.ndarray):
+        np.divide(self.sums[w], self.counts[w], out=out)
+        out += self.shift
+        return out
+
+    def std(self, w: int, out: np.ndarray):
+        # population std, like np.std in forecast_xgb
+        np.divide(self.sums[w], self.counts[w], out=out)
+        np.multiply(out, out, out=out)
+        np.divide(self.sumsq[w], self.counts[w], out=self._old)
+        np.subtract(self._old, out, out=out)
+        np.maximum(out, 0.0, out=out)
+        return np.sqrt(out, out=out)
+
+    def extreme(self, w: int, reduce, out: np.ndarray):
+        # reduce is np.fmin or np.fmax, which skip NaN like np.nanmin/nanmax
+        np.copyto(out, self.ring[:, self._slot(0)])
+        for back in range(1, w):
+            reduce(out, self.ring[:, self._slot(back)], out=out)
+        return out
+
+
+def _rollout(models: list, frames: list, features: list, steps: int):
+    """
+    Recursive rollout for many (model, df_model) pairs at once.
+
+    Lags and rolling windows are parsed from the feature names. Lag state
+    lives in a preallocated ring buffer shared by all series, rolling
+    statistics in a _RollingWindows, and every step predicts on one reused
+    float32 feature array via Booster.inplace_predict. The state is seeded
+    exactly like forecast_xgb, so results match it. The calendar column
+    (month, week or dayofweek) is advanced one period per step from each
+    series' last date.
+    Returns an array of shape (n_series, steps).
+    """
+    n = len(frames)
+    col = {f: j for j, f in enumerate(features)}
+    lags = sorted(int(m.group(1)) for m in map(_LAG_RE.match, features) if m)
+    rolls = [
+        (m.group(0), m.group(1), int(m.group(2)))
+        for m in map(_ROLL_RE.match, features)
+        if m
+    ]
+    max_lag = max(lags, default=1)
+    max_w = max((w for _, _, w in rolls), default=1)
+
+    X = np.empty((n, len(features)), dtype=np.float32)
+    lag_ring = np.full((n, max_lag), np.nan)
+    seed = np.full((n, max_w), np.nan)
+    t = np.empty(n)
+    trend = np.empty(n)
+    month0 = np.empty(n, dtype=int)
+    last_dates = np.empty(n, dtype="datetime64[ns]")
+
+    for i, df in enumerate(frames):
+        last = df.iloc[-1]
+        X[i] = last[features].to_numpy(dtype=np.float32)
+        t[i] = last["t"]
+        trend[i] = last["trend"] if "trend" in df else last["t"]
+        month0[i] = last["date"].month
+        # wall-clock date; tz-aware extract dates would warn on conversion
+        last_dates[i] = last["date"].tz_localize(None)
+
+        y = df["y"].to_numpy(dtype=float)
+        # lag_ring[-j] holds y[n - 1 - j]; the last observation itself is only
+        # reached through the rolling windows, as in forecast_xgb
+        for j in range(1, max_lag + 1):
+            if f"lag{j}" in df:
+                lag_ring[i, max_lag - j] = last[f"lag{j}"]
+            elif j < len(y):
+                lag_ring[i, max_lag - j] = y[-1 - j]
+        tail = y[-max_w:]
+        start = max_w - len(tail)
+        seed[i, start:] = tail
+
+    windows = _RollingWindows(seed, [w for _, _, w in rolls])
+    stat_buf = np.empty(n)
+
+    # rows sharing a booster (e.g. one global model) are predicted together
+    groups = {}
+    for i, m in enumerate(models):
+        booster = m.get_booster()
+        groups.setdefault(id(booster), (booster, []))[1].append(i)
+    groups = [(b, np.asarray(rows)) for b, rows in groups.values()]
+    out = np.empty((n, steps))
+    lag_pos = 0
+
+    for s in range(steps):
+        t += 1
+        trend += 1
+        if "t" in col:
+            X[:, col["t"]] = t
+        if "trend" in col:
+            X[:, col["trend"]] = trend
+        if "month" in col:
+            X[:, col["month"]] = (month0 + s) % 12 + 1
+        elif "week" in col:
+            ahead = pd.DatetimeIndex(last_dates + np.timedelta64(7 * (s + 1), "D"))
+            X[:, col["week"]] = ahead.isocalendar().week.to_numpy()
+        elif "dayofweek" in col:
+            ahead = pd.DatetimeIndex(last_dates + np.timedelta64(s + 1, "D"))
+            X[:, col["dayofweek"]] = ahead.dayofweek
+        if s > 0:
+            for k in lags:
+                X[:, col[f"lag{k}"]] = lag_ring[:, (lag_pos - k) % max_lag]
+            for name, stat, w in rolls:
+                if stat == "mean":
+                    windows.mean(w, stat_buf)
+                elif stat == "std":
+                    windows.std(w, stat_buf)
+                else:
+                    windows.extreme(w, np.fmin if stat == "min" else np.fmax, stat_buf)
+                X[:, col[name]] = stat_buf
+
+        if len(groups) == 1:
+            y_pred = groups[0][0].inplace_predict(X)
+        else:
+            y_pred = np.empty(n, dtype=np.float32)
+            for booster, rows in groups:
+                y_pred[rows] = booster.inplace_predict(X[rows])
+        out[:, s] = y_pred
+
+        lag_ring[:, lag_pos % max_lag] = y_pred
+        lag_pos += 1
+        windows.push(y_pred)
+
+    return out
+
+
+def forecast_xgb_fast(
+    model, df_model: pd.DataFrame, features: list, steps: int = 6, freq: str = None
+):
+    """
+    Allocation-free equivalent of forecast_xgb that also supports arbitrary
+    lags/roll_windows. Returns Series indexed by the future period ends.
+    """
+    y_pred = _rollout([model], [df_model], features, steps)[0]
+    freq = resolve_freq(freq, df_model["date"])
+    dates = future_index(df_model["date"].iloc[-1], steps, freq)
+    return pd.Series(y_pred, index=dates.rename("date"), name="y_pred_xgb")
+
+
+def forecast_xgb_many(models: list, frames: list, features: list, steps: int = 6):
+    """
+    Recursive rollout for one model per series, all series advanced together.
+    Returns an array of shape (n_series, steps).
+    """
+    return _rollout(models, frames, features, steps)
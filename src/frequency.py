@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+DEFAULT_FREQ = "ME"
+
+# calendar feature per granularity; monthly keeps the historical "month"
+CALENDAR_FEATURES = {"monthly": "month", "weekly": "week", "daily": "dayofweek"}
+CALENDAR_COLUMNS = tuple(CALENDAR_FEATURES.values())
+
+
+def granularity(freq) -> str:
+    """
+    "monthly", "weekly" or "daily" for a pandas frequency string/offset.
+    """
+    offset = to_offset(freq)
+    if isinstance(offset, (pd.offsets.MonthEnd, pd.offsets.MonthBegin)):
+        return "monthly"
+    if isinstance(offset, pd.offsets.Week):
+        return "weekly"
+    if isinstance(offset, pd.offsets.Day) and offset.n == 1:
+        return "daily"
+    raise ValueError(f"Unsupported frequency: {freq!r} (use ME, W or D)")
+
+
+def infer_freq(dates, default: str = DEFAULT_FREQ) -> str:
+    """
+    Frequency of a DatetimeIndex/Series of dates (e.g. a stacked panel
+    column): its own freq if set, otherwise pandas' inference on the
+    distinct dates, otherwise default (short or gappy input).
+    """
+    index = pd.DatetimeIndex(dates)
+    freq = index.freqstr
+    if freq is None and not (index.is_monotonic_increasing and index.is_unique):
+        index = index.unique().sort_values()
+    if freq is None and len(index) >= 3:
+        try:
+            freq = pd.infer_freq(index)
+        except (TypeError, ValueError):
+            freq = None
+    if freq is None:
+        return default
+    try:
+        granularity(freq)
+    except ValueError:
+        return default
+    return freq
+
+
+def resolve_freq(freq, dates) -> str:
+    return infer_freq(dates) if freq is None else freq
+
+
+def future_index(last, steps: int, freq: str = DEFAULT_FREQ) -> pd.DatetimeIndex:
+    """
+    The steps period ends following last.
+    """
+    return pd.date_range(last + to_offset(freq), periods=steps, freq=freq)
+
+
+def calendar_feature(freq) -> str:
+    return CALENDAR_FEATURES[granularity(freq)]
+
+
+def calendar_values(dates, freq) -> np.ndarray:
+    """
+    Seasonal position of each date: month (1-12), ISO week (1-53) or
+    day of week (0-6).
+    """
+    index = pd.DatetimeIndex(dates)
+    kind = granularity(freq)
+    if kind == "monthly":
+        return np.asarray(index.month)
+    if kind == "weekly":
+        return index.isocalendar().week.to_numpy(dtype=np.int64)
+    return np.asarray(index.dayofweek)
+
+
+def shift_dates(dates, periods, freq) -> pd.DatetimeIndex:
+    """
+    dates moved forward by periods (scalar or per-date) periods of freq.
+    """
+    index = pd.DatetimeIndex(dates)
+    offset = to_offset(freq)
+    kind = granularity(freq)
+    if kind != "monthly":
+        days = (7 if kind == "weekly" else 1) * offset.n
+        return index + pd.to_timedelta(np.asarray(periods) * days, unit="D")
+    if np.ndim(periods) == 0:
+        return index + offset * int(periods) if periods else index
+    # calendar offsets don't vectorise over per-row multiples; shift by group
+    periods = np.asarray(periods, dtype=np.int64)
+    out = index.to_numpy().copy()
+    for k in np.unique(periods[periods != 0]):
+        mask = periods == k
+        out[mask] = (index[mask] + offset * int(k)).to_numpy()
+    return pd.DatetimeIndex(out)
+
+
+def period_days(freq) -> float:
+    """
+    Length of one period in days as used for lead-time conversion (a month
+    counts as 30 days, as in the original monthly simulation).
+    """
+    return {"monthly": 30.0, "weekly": 7.0, "daily": 1.0}[granularity(freq)]
+
+
+def period_alias(freq) -> str:
+    """
+    pandas Period frequency matching a timestamp frequency (ME -> M).
+    """
+    kind = granularity(freq)
+    if kind == "monthly":
+        return "M"
+    if kind == "weekly":
+        return to_offset(freq).freqstr
+    return "D"
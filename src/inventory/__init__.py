@@ -1,9 +1,21 @@
-from .demand_reconstruction import reconstruct_demand  # noqa: F401
-from .safety_stock import compute_safety_stock  # noqa: F401
-from .inventory_simulation import simulate_inventory_with_rop  # noqa: F401
+from .demand_reconstruction import (  # noqa: F401
+    reconstruct_demand,
+    reconstruct_demand_fast,
+)
+from .safety_stock import (  # noqa: F401
+    compute_safety_stock,
+    compute_safety_stock_panel,
+)
+from .inventory_simulation import (  # noqa: F401
+    simulate_inventory_with_rop,
+    simulate_inventory_monte_carlo,
+)
 
 __all__ = [
     "reconstruct_demand",
+    "reconstruct_demand_fast",
     "compute_safety_stock",
+    "compute_safety_stock_panel",
     "simulate_inventory_with_rop",
+    "simulate_inventory_monte_carlo",
 ]
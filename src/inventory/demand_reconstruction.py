@@ -1,6 +1,19 @@
+import numpy as np
 import pandas as pd
 
 
+def _filter_purchases(purchase_df: pd.DataFrame, confirmed_only: bool = True):
+    df_p = purchase_df
+
+    if confirmed_only and "IsConfirmed" in df_p.columns:
+        df_p = df_p[df_p["IsConfirmed"]]
+
+    if "RestQuantity" in df_p.columns and "OrderedQuantity" in df_p.columns:
+        df_p = df_p[df_p["RestQuantity"] < df_p["OrderedQuantity"]]
+
+    return df_p
+
+
 def reconstruct_demand(
     sales_df: pd.DataFrame,
     purchase_df: pd.DataFrame,
@@ -12,13 +25,7 @@ def reconstruct_demand(
       purchase, sales_observed, inv_start, sales_served, lost_sales_est,
       inv_end, stockout_flag, true_demand_est
     """
-    df_p = purchase_df.copy()
-
-    if confirmed_only and "IsConfirmed" in df_p.columns:
-        df_p = df_p[df_p["IsConfirmed"]]
-
-    if "RestQuantity" in df_p.columns and "OrderedQuantity" in df_p.columns:
-        df_p = df_p[df_p["RestQuantity"] < df_p["OrderedQuantity"]]
+    df_p = _filter_purchases(purchase_df, confirmed_only)
 
     purchase_ts = (
         df_p.groupby(pd.Grouper(key="DeliveryDate", freq=freq))["DeliveredQuantity"]
@@ -74,3 +81,106 @@ def reconstruct_demand(
         inv = inv_end
 
     return pd.DataFrame(records).set_index("date")
+
+
+def _grouped_totals(df: pd.DataFrame, sku_col: str, freq: str):
+    """
+    Per-SKU periodic sums over each SKU's own contiguous calendar.
+    """
+    if df.empty:  # e.g. SKUs with purchases but no sales
+        index = pd.MultiIndex.from_arrays(
+            [df[sku_col], pd.DatetimeIndex(df["DeliveryDate"])], names=["sku", "date"]
+        )
+        return pd.Series(dtype=float, index=index, name="DeliveredQuantity")
+    return (
+        df.set_index("DeliveryDate")
+        .groupby(sku_col)["DeliveredQuantity"]
+        .resample(freq)
+        .sum()
+        .rename_axis(["sku", "date"])
+    )
+
+
+def reconstruct_demand_fast(
+    sales_df: pd.DataFrame,
+    purchase_df: pd.DataFrame,
+    freq: str = "ME",
+    confirmed_only: bool = True,
+    sku_col: str = None,
+):
+    """
+    Vectorized reconstruct_demand.
+
+    The carry-over recursion inv_end = max(inv_end_prev + purchase - sales, 0)
+    is solved in closed form as S - min(0, cummin(S)) with S the cumulative
+    net flow, so no Python loop runs per period. With sku_col the input may
+    hold many SKUs and the result is indexed by (sku, date). Returns the same
+    columns as reconstruct_demand (identical values for integer quantities).
+    """
+    df_p = _filter_purchases(purchase_df, confirmed_only)
+
+    if sku_col is None:
+        purchase_ts = (
+            df_p.groupby(pd.Grouper(key="DeliveryDate", freq=freq))["DeliveredQuantity"]
+            .sum()
+            .fillna(0)
+        )
+        sales_ts = (
+            sales_df.groupby(pd.Grouper(key="DeliveryDate", freq=freq))[
+                "DeliveredQuantity"
+            ]
+            .sum()
+            .asfreq(freq, fill_value=0)
+        )
+        all_idx = sales_ts.index.union(purchase_ts.index)
+        purchase = purchase_ts.reindex(all_idx).fillna(0).to_numpy(dtype=float)
+        sales = sales_ts.reindex(all_idx).fillna(0).to_numpy(dtype=float)
+
+        net_cum = np.cumsum(purchase - sales)
+        floor = np.minimum.accumulate(np.minimum(net_cum, 0.0))
+        index = all_idx.rename("date")
+    else:
+        df_inv = pd.concat(
+            [
+                _grouped_totals(sales_df, sku_col, freq).rename("sales"),
+                _grouped_totals(df_p, sku_col, freq).rename("purchase"),
+            ],
+            axis=1,
+        )
+        df_inv = df_inv.fillna(0).sort_index()
+        purchase = df_inv["purchase"].to_numpy(dtype=float)
+        sales = df_inv["sales"].to_numpy(dtype=float)
+
+        by_sku = df_inv.index.get_level_values("sku")
+        net_cum = pd.Series(purchase - sales).groupby(by_sku).cumsum()
+        floor = net_cum.clip(upper=0.0).groupby(by_sku).cummin().to_numpy()
+        net_cum = net_cum.to_numpy()
+        index = df_inv.index
+
+    inv_end = net_cum - floor
+    inv_prev = np.empty_like(inv_end)
+    inv_prev[1:] = inv_end[:-1]
+    inv_prev[:1] = 0.0
+    if sku_col is not None:
+        # carry-over restarts at zero for every SKU
+        first = np.r_[True, by_sku[1:] != by_sku[:-1]]
+        inv_prev[first] = 0.0
+
+    inv_start = inv_prev + purchase
+    stockout = inv_start < sales
+    sales_served = np.where(stockout, inv_start, sales)
+    lost_sales = np.where(stockout, sales - inv_start, 0.0)
+
+    return pd.DataFrame(
+        {
+            "purchase": purchase,
+            "sales_observed": sales,
+            "inv_start": inv_start,
+            "sales_served": sales_served,
+            "lost_sales_est": lost_sales,
+            "inv_end": inv_end,
+            "stockout_flag": stockout,
+            "true_demand_est": sales_served + lost_sales,
+        },
+        index=index,
+    )
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 
+from ..frequency import infer_freq, period_days
 from .reorder_point import reorder_point
 
 
@@ -9,14 +10,18 @@ def simulate_inventory_with_rop(
     forecast_series: pd.Series,
     safety_stock_units: float,
     lead_time_days: float,
-    review_period_days: float = 30.0,
+    review_period_days: float = None,
     initial_inventory: float = None,
     lot_size: float = None,
     min_order_qty: float = 0.0,
 ):
     """
-    Monthly inventory simulation with reorder point (ROP).
+    Inventory simulation with reorder point (ROP), one step per forecast
+    period. review_period_days defaults to the length of the forecast's
+    period (30 for monthly, 7 weekly, 1 daily).
     """
+    if review_period_days is None:
+        review_period_days = period_days(infer_freq(forecast_series.index))
     lead_time_periods = max(1, int(np.ceil(lead_time_days / review_period_days)))
     idx_future = forecast_series.index
 
@@ -76,3 +81,138 @@ def simulate_inventory_with_rop(
     sim_df["lead_time_periods"] = lead_time_periods
     sim_df["safety_stock_units"] = safety_stock_units
     return sim_df
+
+
+def simulate_inventory_monte_carlo(
+    history_df: pd.DataFrame,
+    forecast_series: pd.Series,
+    safety_stock_units: float,
+    lead_time_days: float,
+    review_period_days: float = None,
+    initial_inventory: float = None,
+    lot_size: float = None,
+    min_order_qty: float = 0.0,
+    n_scenarios: int = 1000,
+    demand_cv: float = 0.5,
+    lead_time_std_days: float = 0.0,
+    demand_scenarios: np.ndarray = None,
+    percentiles=(5, 50, 95),
+    seed: int = None,
+):
+    """
+    Stochastic ROP simulation over many scenarios at once.
+
+    Realised demand is gamma distributed around the forecast with
+    coefficient of variation demand_cv (or given as demand_scenarios,
+    shape scenarios x periods); every order draws its own lead time from
+    N(lead_time_days, lead_time_std_days). The ordering policy is the one of
+    simulate_inventory_with_rop, driven by the forecast. All scenarios
+    advance together and open orders sit in a circular (scenarios x slots)
+    pipeline array.
+
+    Returns dict with:
+      fill_rate_mean, fill_rate_percentiles, stockout_probability,
+      period_summary (DataFrame per forecast period with stockout_prob,
+      expected_lost_sales and order_qty_p* / inv_end_p* percentiles)
+    """
+    rng = np.random.default_rng(seed)
+    idx_future = forecast_series.index
+    forecast = forecast_series.to_numpy(dtype=float)
+    n_periods = len(forecast)
+
+    if review_period_days is None:
+        review_period_days = period_days(infer_freq(idx_future))
+    lead_time_periods = max(1, int(np.ceil(lead_time_days / review_period_days)))
+
+    if initial_inventory is None:
+        initial_inventory = (
+            float(history_df["inv_end"].iloc[-1])
+            if "inv_end" in history_df.columns
+            else 0.0
+        )
+
+    if demand_scenarios is None:
+        mean = np.broadcast_to(forecast, (n_scenarios, n_periods))
+        if demand_cv > 0:
+            shape = 1.0 / demand_cv**2
+            demand = rng.gamma(shape, np.maximum(mean, 1e-12) / shape)
+            demand[mean <= 0] = 0.0
+        else:
+            demand = mean.copy()
+    else:
+        demand = np.asarray(demand_scenarios, dtype=float)
+        n_scenarios = demand.shape[0]
+
+    max_lt_periods = lead_time_periods
+    if lead_time_std_days > 0:
+        lt_days = rng.normal(
+            lead_time_days, lead_time_std_days, size=(n_scenarios, n_periods)
+        )
+        lt_periods = np.maximum(
+            1, np.ceil(np.maximum(lt_days, 0.0) / review_period_days)
+        ).astype(int)
+        max_lt_periods = int(lt_periods.max())
+    else:
+        lt_periods = np.full((n_scenarios, n_periods), lead_time_periods)
+
+    n_slots = max_lt_periods + 1
+    pipeline = np.zeros((n_scenarios, n_slots))
+    rows = np.arange(n_scenarios)
+    inv = np.full(n_scenarios, float(initial_inventory))
+
+    served_total = np.zeros(n_scenarios)
+    lost = np.empty((n_scenarios, n_periods))
+    orders = np.empty((n_scenarios, n_periods))
+    inv_ends = np.empty((n_scenarios, n_periods))
+
+    for t in range(n_periods):
+        slot = t % n_slots
+        inv_start = inv + pipeline[:, slot]
+        pipeline[:, slot] = 0.0
+
+        served = np.minimum(inv_start, demand[:, t])
+        inv = inv_start - served
+        served_total += served
+        lost[:, t] = demand[:, t] - served
+
+        rop_val = reorder_point(forecast[t], lead_time_periods, safety_stock_units)
+        order_qty = np.where(
+            inv <= rop_val,
+            np.maximum(np.maximum(rop_val - inv, 0.0), min_order_qty),
+            0.0,
+        )
+        if lot_size is not None and lot_size > 0:
+            order_qty = np.ceil(order_qty / lot_size) * lot_size
+
+        pipeline[rows, (t + lt_periods[:, t]) % n_slots] += order_qty
+        orders[:, t] = order_qty
+        inv_ends[:, t] = inv
+
+    demand_total = demand.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fill_rate = np.where(demand_total > 0, served_total / demand_total, 1.0)
+
+    period_summary = pd.DataFrame(
+        {
+            "forecast_demand": forecast,
+            "stockout_prob": (lost > 1e-9).mean(axis=0),
+            "expected_lost_sales": lost.mean(axis=0),
+        },
+        index=idx_future,
+    )
+    for p in percentiles:
+        period_summary[f"order_qty_p{p}"] = np.percentile(orders, p, axis=0)
+    for p in percentiles:
+        period_summary[f"inv_end_p{p}"] = np.percentile(inv_ends, p, axis=0)
+
+    return {
+        "n_scenarios": n_scenarios,
+        "lead_time_periods": lead_time_periods,
+        "fill_rate_mean": float(fill_rate.mean()),
+        "fill_rate_percentiles": {
+            p: float(v)
+            for p, v in zip(percentiles, np.percentile(fill_rate, percentiles))
+        },
+        "stockout_probability": float((lost > 1e-9).any(axis=1).mean()),
+        "period_summary": period_summary,
+    }
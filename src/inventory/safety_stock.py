@@ -23,3 +23,190 @@ def compute_safety_stock(
 
     ss = z * np.sqrt((sigma_d**2) * lead_time_days + (mu_d**2) * (sigma_lt**2))
     return float(ss)
+
+
+def _per_sku(value, index, name):
+    """
+    Broadcast a scalar, dict or Series parameter to an array aligned with
+    index. A per-SKU parameter must cover every SKU: a missing entry would
+    otherwise turn into NaN and silently into zero safety stock.
+    """
+    if isinstance(value, dict):
+        value = pd.Series(value)
+    if isinstance(value, pd.Series):
+        aligned = value.reindex(index)
+        missing = aligned.index[aligned.isna()]
+        if len(missing):
+            shown = ", ".join(map(str, missing[:10]))
+            more = f" (+{len(missing) - 10} more)" if len(missing) > 10 else ""
+            raise ValueError(f"{name} has no value for SKUs {shown}{more}")
+        return aligned.to_numpy(dtype=float)
+    return np.full(len(index), float(value))
+
+
+def normal_loss(z):
+    """
+    Standard normal loss function G(z) = phi(z) - z * (1 - Phi(z)), the
+    expected shortage per unit of sigma when z sigmas of safety stock are held.
+    """
+    from scipy.special import ndtr
+
+    z = np.asarray(z, dtype=float)
+    return np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi) - z * ndtr(-z)
+
+
+def expected_fill_rate(z, sigma_l, cycle_demand):
+    """
+    Fill rate 1 - sigma_L * G(z) / Q for replenishment cycles of Q units.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fr = 1 - np.asarray(sigma_l) * normal_loss(z) / np.asarray(cycle_demand)
+    return np.clip(np.nan_to_num(fr, nan=1.0), 0.0, 1.0)
+
+
+def z_for_fill_rate(target, sigma_l, cycle_demand, z_min=0.0, z_max=6.0, iters=60):
+    """
+    Smallest z in [z_min, z_max] per SKU whose expected_fill_rate reaches
+    target. G is decreasing, so all SKUs are bisected at once.
+    """
+    sigma_l = np.asarray(sigma_l, dtype=float)
+    need = (1 - np.asarray(target, dtype=float)) * np.asarray(cycle_demand, float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g_target = np.where(sigma_l > 0, need / sigma_l, np.inf)
+
+    lo = np.full(sigma_l.shape, float(z_min))
+    hi = np.full(sigma_l.shape, float(z_max))
+    for _ in range(iters):
+        mid = 0.5 * (lo + hi)
+        ok = normal_loss(mid) <= g_target
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, mid)
+    # already met at z_min -> z_min; unreachable -> z_max
+    return np.where(normal_loss(lo) <= g_target, lo, hi)
+
+
+def z_for_budget(
+    budget, sigma_l, unit_cost=1.0, weight=1.0, z_min=0.0, z_max=6.0, iters=100
+):
+    """
+    Per-SKU z minimising total weighted expected shortage
+    sum(weight * sigma_L * G(z)) subject to sum(unit_cost * z * sigma_L) <= budget.
+
+    The optimality condition 1 - Phi(z_i) = lam * unit_cost_i / weight_i
+    gives every z in closed form for a multiplier lam, which is bisected on
+    a log scale until the budget is spent.
+    """
+    from scipy.special import ndtri
+
+    sigma_l = np.asarray(sigma_l, dtype=float)
+    cost = np.broadcast_to(np.asarray(unit_cost, float), sigma_l.shape)
+    weight = np.broadcast_to(np.asarray(weight, float), sigma_l.shape)
+
+    def z_of(log_lam):
+        tail = np.clip(np.exp(log_lam) * cost / weight, 1e-300, 1.0)
+        return np.clip(ndtri(1 - tail), z_min, z_max)
+
+    def spend(z):
+        return np.sum(cost * z * sigma_l)
+
+    if spend(np.full(sigma_l.shape, float(z_min))) >= budget:
+        return np.full(sigma_l.shape, float(z_min))
+    # lam -> 0 puts every SKU at z_max; at lam_hi every tail is >= 1 (z_min)
+    lo, hi = np.log(1e-300), np.log(np.max(weight / cost))
+    if spend(z_of(lo)) <= budget:
+        return z_of(lo)
+    for _ in range(iters):
+        mid = 0.5 * (lo + hi)
+        if spend(z_of(mid)) > budget:
+            lo = mid
+        else:
+            hi = mid
+    return z_of(hi)
+
+
+def compute_safety_stock_panel(
+    inv_all: pd.DataFrame,
+    lead_time_days=7.0,
+    tolerance_early_days=0.0,
+    tolerance_late_days=0.0,
+    z=2.05,
+    target_fill_rate=None,
+    budget_cost: float = None,
+    unit_cost=1.0,
+    shortage_weight=1.0,
+    cycle_demand=None,
+    sku_col: str = "sku",
+):
+    """
+    compute_safety_stock for every SKU of a multi-SKU reconstruction frame
+    (e.g. reconstruct_demand_fast(..., sku_col=...), indexed by sku or with
+    a sku column). Demand moments come from one groupby aggregation; lead
+    times, tolerances and costs may be scalars or per-SKU Series/dicts.
+
+    z is fixed (scalar or per SKU) unless one target is given:
+      target_fill_rate - smallest z per SKU reaching that fill rate
+                         (scalar or per SKU), with replenishment cycles of
+                         cycle_demand units (default: mean period demand);
+      budget_cost      - z minimising weighted expected shortage while
+                         sum(unit_cost * safety stock) stays within this
+                         cost budget.
+
+    Returns DataFrame indexed by sku with mu_d, sigma_d, sigma_lt, sigma_L,
+    z, safety_stock_units and expected_fill_rate.
+    """
+    if target_fill_rate is not None and budget_cost is not None:
+        raise ValueError("Pass either target_fill_rate or budget_cost, not both")
+
+    if sku_col in inv_all.columns:
+        keys = inv_all[sku_col]
+    else:
+        keys = inv_all.index.get_level_values(sku_col)
+    moments = (
+        inv_all["true_demand_est"]
+        .astype(float)
+        .groupby(keys, sort=False)
+        .agg(["mean", "std"])
+    )
+    moments.index.name = "sku"
+    skus = moments.index
+
+    mu_d = moments["mean"].to_numpy()
+    sigma_d = moments["std"].to_numpy()
+    lead = _per_sku(lead_time_days, skus, "lead_time_days")
+    tol_span = _per_sku(tolerance_early_days, skus, "tolerance_early_days") + _per_sku(
+        tolerance_late_days, skus, "tolerance_late_days"
+    )
+    sigma_lt = np.where(tol_span > 0, tol_span / np.sqrt(12), 0.0)
+    sigma_l = np.sqrt((sigma_d**2) * lead + (mu_d**2) * (sigma_lt**2))
+    sigma_l = np.nan_to_num(sigma_l)
+
+    if cycle_demand is None:
+        q = mu_d
+    else:
+        q = _per_sku(cycle_demand, skus, "cycle_demand")
+    if target_fill_rate is not None:
+        target = _per_sku(target_fill_rate, skus, "target_fill_rate")
+        z_vals = z_for_fill_rate(target, sigma_l, q)
+    elif budget_cost is not None:
+        z_vals = z_for_budget(
+            budget_cost,
+            sigma_l,
+            unit_cost=_per_sku(unit_cost, skus, "unit_cost"),
+            weight=_per_sku(shortage_weight, skus, "shortage_weight"),
+        )
+    else:
+        z_vals = _per_sku(z, skus, "z")
+
+    return pd.DataFrame(
+        {
+            "mu_d": mu_d,
+            "sigma_d": sigma_d,
+            "lead_time_days": lead,
+            "sigma_lt": sigma_lt,
+            "sigma_L": sigma_l,
+            "z": z_vals,
+            "safety_stock_units": z_vals * sigma_l,
+            "expected_fill_rate": expected_fill_rate(z_vals, sigma_l, q),
+        },
+        index=skus,
+    )
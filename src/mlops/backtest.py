@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.feature_engineering import make_time_features
+from src.forecasting.xgb_model import (
+    DEFAULT_MODEL_KWARGS,
+    continue_xgb,
+    forecast_xgb_fast,
+)
+from src.forecasting.croston import croston_sba
+from src.forecasting.hybrid_forecast import automatic_hybrid_weight
+from src.utils.metrics import mae, mape
+from src.frequency import resolve_freq
+
+
+def _run_fold(demand_ts, df_full, features, origin, horizon, params):
+    """
+    Fit and forecast one fold. The training rows are a positional slice of
+    the features computed once for the full series; each feature row only
+    uses observations before its own date, so no future data leaks in.
+    With warm_rounds > 0 the warm-start path is replayed as well: a cold
+    fit that stops warm_rounds rows before the origin, then one
+    continue_xgb round of warm_estimators trees per remaining row.
+    """
+    end = origin + 1
+    train_ts = demand_ts.iloc[:end]
+    actual = demand_ts.iloc[end:][:horizon]
+    n_train = int(df_full["date"].searchsorted(train_ts.index[-1], side="right"))
+    df_train = df_full.iloc[:n_train]
+
+    from xgboost import XGBRegressor
+
+    model = XGBRegressor(**params["model_kwargs"])
+    model.fit(df_train[features], df_train["y"])
+    xgb_pred = forecast_xgb_fast(
+        model, df_train, features, steps=horizon, freq=params["freq"]
+    ).values
+
+    _, future_sba = croston_sba(
+        train_ts, alpha=params["alpha"], h=horizon, freq=params["freq"]
+    )
+    sba_pred = future_sba.values
+    w, _ = automatic_hybrid_weight(train_ts, abc_class=params["abc_class"])
+
+    preds = {
+        "xgb": xgb_pred,
+        "croston": sba_pred,
+        "hybrid": w * xgb_pred + (1 - w) * sba_pred,
+    }
+
+    rounds = min(params["warm_rounds"], n_train - 1)
+    if rounds > 0:
+        n_base = n_train - rounds
+        warm = XGBRegressor(**params["model_kwargs"])
+        warm.fit(df_train[features].iloc[:n_base], df_train["y"].iloc[:n_base])
+        for i in range(n_base, n_train):
+            warm = continue_xgb(
+                warm, df_train.iloc[[i]], features, params["warm_estimators"]
+            )
+        warm_pred = forecast_xgb_fast(
+            warm, df_train, features, steps=horizon, freq=params["freq"]
+        ).values
+        preds["xgb_warm"] = warm_pred
+        preds["hybrid_warm"] = w * warm_pred + (1 - w) * sba_pred
+
+    return pd.DataFrame(
+        [
+            {
+                "origin": train_ts.index[-1],
+                "horizon": h + 1,
+                "model": name,
+                "y_true": float(actual.iloc[h]),
+                "y_pred": float(pred[h]),
+            }
+            for name, pred in preds.items()
+            for h in range(len(actual))
+        ]
+    )
+
+
+def rolling_origin_backtest(
+    demand_ts: pd.Series,
+    horizon: int = 3,
+    n_folds: int = 6,
+    min_train: int = 12,
+    abc_class: str = "A",
+    alpha: float = 0.1,
+    model_kwargs: dict = None,
+    n_jobs: int = 1,
+    freq: str = None,
+    warm_rounds: int = 0,
+    warm_estimators: int = 25,
+):
+    """
+    Rolling-origin cross-validation of train_xgb/forecast_xgb, croston_sba
+    and their hybrid blend.
+
+    The last n_folds origins that leave horizon actuals are evaluated (each
+    with at least min_train observations); features are computed once and
+    every fold trains on a slice of them. Folds run on n_jobs threads.
+    horizon and min_train count periods of freq (inferred when not given).
+    warm_rounds > 0 also evaluates the warm-start path of update_xgb
+    (models "xgb_warm" and "hybrid_warm"): per fold, warm_rounds
+    single-period updates of warm_estimators trees on top of a cold fit.
+
+    Returns (summary, folds): summary has MAE/MAPE per model and horizon,
+    folds holds origin, horizon, model, y_true, y_pred for every forecast.
+    """
+    if model_kwargs is None:
+        model_kwargs = dict(DEFAULT_MODEL_KWARGS)
+    if n_jobs > 1 and "n_jobs" not in model_kwargs:
+        model_kwargs = {**model_kwargs, "n_jobs": 1}
+
+    freq = resolve_freq(freq, demand_ts.index)
+    df_full = make_time_features(demand_ts, freq=freq)
+    features = [c for c in df_full.columns if c not in ("date", "y")]
+    first_feature_pos = len(demand_ts) - len(df_full)
+
+    n = len(demand_ts)
+    last_origin = n - horizon - 1
+    origins = [
+        o
+        for o in range(last_origin - n_folds + 1, last_origin + 1)
+        if o + 1 >= min_train and o >= first_feature_pos
+    ]
+    if not origins:
+        raise ValueError(
+            f"Series of length {n} is too short for horizon={horizon}, min_train={min_train}"
+        )
+
+    params = {
+        "model_kwargs": model_kwargs,
+        "alpha": alpha,
+        "abc_class": abc_class,
+        "freq": freq,
+        "warm_rounds": warm_rounds,
+        "warm_estimators": warm_estimators,
+    }
+    with ThreadPoolExecutor(max_workers=max(1, n_jobs)) as pool:
+        results = list(
+            pool.map(
+                lambda o: _run_fold(demand_ts, df_full, features, o, horizon, params),
+                origins,
+            )
+        )
+
+    folds = pd.concat(results, ignore_index=True)
+    summary = pd.DataFrame(
+        [
+            {
+                "model": model,
+                "horizon": h,
+                "MAE": float(mae(g["y_true"], g["y_pred"])),
+                "MAPE": float(mape(g["y_true"], g["y_pred"])),
+                "n_points": len(g),
+            }
+            for (model, h), g in folds.groupby(["model", "horizon"])
+        ]
+    )
+    return summary, folds
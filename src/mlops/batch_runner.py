@@ -0,0 +1,238 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.inventory.demand_reconstruction import reconstruct_demand_fast
+from src.forecasting.batch_forecast import hybrid_forecast_batch
+from src.forecasting.xgb_model import DEFAULT_MODEL_KWARGS
+from src.inventory.safety_stock import compute_safety_stock_panel
+from src.inventory.inventory_simulation import simulate_inventory_with_rop
+from src.frequency import period_days
+
+# chunks submitted but not finished, per worker; bounds the sales/purchase
+# slices pickled and held by the parent at any one time
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _init_worker(threads_per_worker: int):
+    """
+    Pin native thread pools so n_workers x threads does not oversubscribe.
+
+    numpy (and its BLAS) is already loaded when this runs, forked from the
+    parent or imported to unpickle the initializer, so its pools are
+    resized with threadpoolctl; the environment variables cover OpenMP
+    runtimes loaded later (e.g. by xgboost).
+    """
+    from threadpoolctl import threadpool_limits
+
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads_per_worker)
+    threadpool_limits(limits=threads_per_worker)
+
+
+def sku_pipeline(sales_df, purchase_df, params: dict) -> dict:
+    """
+    Reconstruction -> hybrid forecast -> safety stock -> simulation for the
+    SKUs of sales_df/purchase_df (see run_sku_pipeline for params).
+
+    Returns dict of tables: forecast (one row per SKU and date, with the
+    SKU's safety_stock_units), safety_stock (compute_safety_stock_panel,
+    indexed by SKU) and simulation (one row per SKU and date).
+    """
+    sku_col = params["sku_col"]
+
+    inv_all = reconstruct_demand_fast(
+        sales_df, purchase_df, freq=params["freq"], sku_col=sku_col
+    )
+    panel = inv_all["true_demand_est"].rename("demand").reset_index()
+
+    forecast_df, _ = hybrid_forecast_batch(
+        panel,
+        abc_class=params["abc_class"],
+        steps=params["steps"],
+        alpha=params["alpha"],
+        model_kwargs={
+            **DEFAULT_MODEL_KWARGS,
+            "n_jobs": params["threads_per_worker"],
+        },
+        freq=params["freq"],
+    )
+
+    safety = compute_safety_stock_panel(
+        inv_all,
+        params["lead_time_days"],
+        params["tolerance_early_days"],
+        params["tolerance_late_days"],
+        target_fill_rate=params["target_fill_rate"],
+    )
+    safety_units = safety["safety_stock_units"]
+
+    sims = []
+    for sku, fc in forecast_df.groupby("sku", sort=False):
+        sim_df = simulate_inventory_with_rop(
+            inv_all.loc[sku],
+            fc.set_index("date")["y_pred_hybrid"],
+            float(safety_units[sku]),
+            params["lead_time_days"],
+            review_period_days=period_days(params["freq"]),
+        )
+        sims.append(sim_df.rename_axis("date").reset_index().assign(sku=sku))
+
+    forecast_df["safety_stock_units"] = forecast_df["sku"].map(safety_units)
+    return {
+        "forecast": forecast_df,
+        "safety_stock": safety,
+        "simulation": pd.concat(sims, ignore_index=True),
+    }
+
+
+def _run_chunk(chunk_id: int, sales_df, purchase_df, output_dir, params: dict):
+    """
+    sku_pipeline for one chunk of SKUs. The forecast and simulation tables
+    are written to output_dir and only a summary is returned, unless
+    output_dir is None, in which case the summary carries the tables.
+    """
+    start = time.perf_counter()
+    tables = sku_pipeline(sales_df, purchase_df, params)
+    forecast_df = tables["forecast"]
+    summary = {
+        "chunk_id": chunk_id,
+        "n_skus": int(forecast_df["sku"].nunique()),
+    }
+
+    if output_dir is None:
+        summary["tables"] = tables
+    else:
+        out = Path(output_dir)
+        forecast_path = out / f"chunk_{chunk_id:05d}_forecast.csv"
+        sim_path = out / f"chunk_{chunk_id:05d}_simulation.csv"
+        forecast_df.to_csv(forecast_path, index=False)
+        tables["simulation"].to_csv(sim_path, index=False)
+        summary["paths"] = [str(forecast_path), str(sim_path)]
+
+    summary["elapsed_s"] = time.perf_counter() - start
+    return summary
+
+
+def _split_by_sku(df: pd.DataFrame, sku_col: str, chunks: list):
+    positions = df.groupby(sku_col, sort=False).indices
+    empty = np.empty(0, dtype=int)
+    for chunk in chunks:
+        rows = np.concatenate([positions.get(sku, empty) for sku in chunk])
+        yield df.iloc[np.sort(rows)]
+
+
+def run_sku_pipeline(
+    sales_df: pd.DataFrame,
+    purchase_df: pd.DataFrame,
+    sku_col: str = "sku",
+    output_dir: str = "artifacts/sku_runs",
+    n_workers: int = None,
+    threads_per_worker: int = 1,
+    chunk_size: int = 100,
+    steps: int = 6,
+    lead_time_days: float = 7,
+    tolerance_early_days: float = 2,
+    tolerance_late_days: float = 1,
+    target_fill_rate=None,
+    abc_class="A",
+    alpha: float = 0.1,
+    freq: str = "ME",
+):
+    """
+    Run reconstruction, hybrid forecast, safety stock and inventory
+    simulation (sku_pipeline) for every SKU of sales_df or purchase_df on a
+    process pool.
+
+    SKUs are submitted in chunks of chunk_size so worker start-up and
+    per-task overhead are amortised; at most IN_FLIGHT_PER_WORKER chunks
+    per worker are pending at a time, so the parent holds a bounded number
+    of pickled slices whatever the SKU count. Each worker pins XGBoost and
+    the BLAS pools to threads_per_worker threads and writes its chunk's
+    forecast and simulation CSVs to output_dir as soon as it finishes. With
+    output_dir=None nothing is written and the chunks' tables are
+    concatenated into the result instead. Safety stock uses the fixed z of
+    compute_safety_stock unless target_fill_rate is given.
+
+    Returns dict with n_skus, n_chunks, elapsed_s, skus_per_sec, chunks
+    (per-chunk summaries), errors (chunk_id -> message) and, when
+    output_dir is None, tables (forecast, safety_stock, simulation).
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # SKUs with purchases but no sales still get a (zero-demand) run
+    skus = pd.unique(pd.concat([sales_df[sku_col], purchase_df[sku_col]]))
+    n_chunks = max(1, int(np.ceil(len(skus) / chunk_size)))
+    chunks = [list(c) for c in np.array_split(skus, n_chunks)]
+    params = {
+        "sku_col": sku_col,
+        "threads_per_worker": threads_per_worker,
+        "steps": steps,
+        "lead_time_days": lead_time_days,
+        "tolerance_early_days": tolerance_early_days,
+        "tolerance_late_days": tolerance_late_days,
+        "target_fill_rate": target_fill_rate,
+        "abc_class": abc_class,
+        "alpha": alpha,
+        "freq": freq,
+    }
+
+    start = time.perf_counter()
+    done = []
+    errors = {}
+    pending = {}
+
+    def collect():
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in finished:
+            chunk_id = pending.pop(fut)
+            try:
+                done.append(fut.result())
+            except Exception as exc:  # keep the other chunks going
+                errors[chunk_id] = repr(exc)
+                continue
+            n_done = sum(c["n_skus"] for c in done)
+            rate = n_done / (time.perf_counter() - start)
+            print(f"chunk {chunk_id}: {n_done}/{len(skus)} SKUs, {rate:.1f} SKUs/sec")
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(threads_per_worker,),
+    ) as pool:
+        # slices are cut lazily, as chunks are submitted
+        slices = zip(
+            _split_by_sku(sales_df, sku_col, chunks),
+            _split_by_sku(purchase_df, sku_col, chunks),
+        )
+        for i, (s, p) in enumerate(slices):
+            while len(pending) >= IN_FLIGHT_PER_WORKER * n_workers:
+                collect()
+            pending[pool.submit(_run_chunk, i, s, p, output_dir, params)] = i
+        while pending:
+            collect()
+
+    elapsed = time.perf_counter() - start
+    n_done = sum(c["n_skus"] for c in done)
+    done = sorted(done, key=lambda c: c["chunk_id"])
+    result = {
+        "n_skus": n_done,
+        "n_chunks": len(chunks),
+        "elapsed_s": elapsed,
+        "skus_per_sec": n_done / elapsed if elapsed > 0 else float("nan"),
+        "chunks": done,
+        "errors": errors,
+    }
+    if output_dir is None:
+        parts = [c.pop("tables") for c in done]
+        result["tables"] = {
+            name: pd.concat([t[name] for t in parts]) if parts else None
+            for name in ("forecast", "safety_stock", "simulation")
+        }
+    return result
@@ -0,0 +1,135 @@
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _peak_rss_mb():
+    """
+    Process high-water resident set size in MB (ru_maxrss is KB on Linux,
+    bytes on macOS).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """
+    Wall time, CPU time and peak RSS per pipeline stage.
+
+        timer = StageTimer(profile_dir="artifacts/profiles")
+        with timer.stage("load"):
+            ...
+        timer.log_mlflow()
+        timer.save("artifacts/pipeline_trace.json")
+
+    Peak RSS is the process high-water mark when the stage ends, so
+    peak_rss_growth_mb is non-zero only for stages that raised it. With a
+    profile_dir every stage is profiled with cProfile (<stage>.prof) or
+    pyinstrument (<stage>.html, if installed).
+    """
+
+    def __init__(self, profile_dir=None, profiler: str = "cprofile"):
+        if profiler not in ("cprofile", "pyinstrument"):
+            raise ValueError(f"Unknown profiler: {profiler!r}")
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.profiler = profiler
+        self.stages = []
+        self.started = time.time()
+
+    def _start_profiler(self):
+        if self.profile_dir is None:
+            return None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            prof = Profiler()
+            prof.start()
+        else:
+            import cProfile
+
+            prof = cProfile.Profile()
+            prof.enable()
+        return prof
+
+    def _stop_profiler(self, prof, name):
+        if prof is None:
+            return None
+        if self.profiler == "pyinstrument":
+            prof.stop()
+            path = self.profile_dir / f"{name}.html"
+            path.write_text(prof.output_html())
+        else:
+            prof.disable()
+            path = self.profile_dir / f"{name}.prof"
+            prof.dump_stats(str(path))
+        return str(path)
+
+    @contextmanager
+    def stage(self, name: str):
+        rss_before = _peak_rss_mb()
+        prof = self._start_profiler()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            profile_path = self._stop_profiler(prof, name)
+            peak = _peak_rss_mb()
+            self.stages.append(
+                {
+                    "stage": name,
+                    "status": status,
+                    "wall_s": wall,
+                    "cpu_s": cpu,
+                    "peak_rss_mb": peak,
+                    "peak_rss_growth_mb": peak - rss_before,
+                    "profile": profile_path,
+                }
+            )
+
+    def metrics(self) -> dict:
+        """
+        Flat stage_<name>_<measure> dict suitable for mlflow.log_metrics.
+        """
+        out = {}
+        for s in self.stages:
+            for key in ("wall_s", "cpu_s", "peak_rss_mb"):
+                out[f"stage_{s['stage']}_{key}"] = s[key]
+        out["pipeline_wall_s"] = sum(s["wall_s"] for s in self.stages)
+        return out
+
+    def trace(self) -> dict:
+        return {
+            "started": self.started,
+            "total_wall_s": sum(s["wall_s"] for s in self.stages),
+            "stages": self.stages,
+        }
+
+    def save(self, path="artifacts/pipeline_trace.json"):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # replace rather than rewrite: earlier runs may hold a hardlink to it
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.trace(), indent=2))
+        tmp.replace(path)
+        return path
+
+    def log_mlflow(self):
+        import mlflow
+
+        mlflow.log_metrics(self.metrics())
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"{s['stage']:<14} {s['wall_s']:8.2f}s wall {s['cpu_s']:8.2f}s cpu "
+            f"{s['peak_rss_mb']:8.1f}MB peak rss"
+            for s in self.stages
+        )
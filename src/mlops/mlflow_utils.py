@@ -1,33 +1,111 @@
-import mlflow
-import mlflow.sklearn
+import numbers
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+# mlflow is imported inside the functions that use it: importing it costs
+# seconds, which every worker and CLI start would otherwise pay up front
+
+# server-side limits of a single log_batch request
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
 
 
 def start_mlflow_run(experiment_name="demand_forecasting", run_name="nightly_retrain"):
     """
     Starts or creates an MLflow experiment & run.
     """
+    import mlflow
+
     mlflow.set_tracking_uri("file:./mlruns")
     mlflow.set_experiment(experiment_name)
     return mlflow.start_run(run_name=run_name)
 
 
+def _log_batch(run_id: str, metrics: dict = None, params: dict = None):
+    """
+    Log metrics and params with as few log_batch calls as the limits allow.
+    Non-numeric metric values (labels such as "class" or "reason") are
+    skipped; they are kept in metrics.json.
+    """
+    from mlflow import MlflowClient
+    from mlflow.entities import Metric, Param
+
+    client = MlflowClient()
+    ts = int(time.time() * 1000)
+    metric_list = [
+        Metric(k, float(v), ts, 0)
+        for k, v in (metrics or {}).items()
+        if isinstance(v, numbers.Number)
+    ]
+    param_list = [Param(k, str(v)) for k, v in (params or {}).items()]
+    while metric_list or param_list:
+        client.log_batch(
+            run_id,
+            metrics=metric_list[:MAX_METRICS_PER_BATCH],
+            params=param_list[:MAX_PARAMS_PER_BATCH],
+        )
+        metric_list = metric_list[MAX_METRICS_PER_BATCH:]
+        param_list = param_list[MAX_PARAMS_PER_BATCH:]
+
+
+def _active_run_id():
+    import mlflow
+
+    run = mlflow.active_run() or mlflow.start_run()
+    return run.info.run_id
+
+
 def log_params(params: dict):
-    for k, v in params.items():
-        mlflow.log_param(k, v)
+    _log_batch(_active_run_id(), params=params)
 
 
 def log_metrics(metrics: dict):
-    for k, v in metrics.items():
-        mlflow.log_metric(k, float(v))
+    _log_batch(_active_run_id(), metrics=metrics)
 
 
 def log_artifact_file(path: str):
+    import mlflow
+
     mlflow.log_artifact(path)
 
 
+def link_artifact(
+    path, run_id: str = None, artifact_path: str = None, artifact_uri: str = None
+):
+    """
+    Attach an already written file to a run without another copy: with a
+    local artifact store the file is hardlinked into the run's artifact
+    directory, otherwise (or across filesystems) it is uploaded as usual.
+    The file must not be rewritten in place afterwards (see persist).
+    """
+    from mlflow import MlflowClient
+
+    client = MlflowClient()
+    run_id = run_id or _active_run_id()
+    uri = urlparse(artifact_uri or client.get_run(run_id).info.artifact_uri)
+    if uri.scheme in ("", "file"):
+        dest_dir = Path(url2pathname(uri.path)) / (artifact_path or "")
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        dest = dest_dir / Path(path).name
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(path, dest)
+            return str(dest)
+        except OSError:  # e.g. artifact store on another device
+            pass
+    client.log_artifact(run_id, str(path), artifact_path)
+    return None
+
+
 def log_artifact_dataframe(df: pd.DataFrame, name: str):
+    import mlflow
+
     temp_path = Path("artifacts") / f"{name}.csv"
     temp_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(temp_path)
@@ -35,6 +113,8 @@ def log_artifact_dataframe(df: pd.DataFrame, name: str):
 
 
 def log_artifact_series(series: pd.Series, name: str):
+    import mlflow
+
     temp_path = Path("artifacts") / f"{name}.csv"
     temp_path.parent.mkdir(parents=True, exist_ok=True)
     series.to_csv(temp_path, header=True)
@@ -45,8 +125,129 @@ def register_model(model_name: str, run_id: str, artifact_path="model"):
     """
     Register model in MLflow Model Registry.
     """
+    import mlflow
+
     result = mlflow.register_model(
         model_uri=f"runs:/{run_id}/{artifact_path}", name=model_name
     )
     print(f"Registered model version: {result.version}")
     return result
+
+
+class AsyncMlflowLogger:
+    """
+    Background MLflow logging for one run.
+
+    Artifacts are serialised to artifact_dir and uploaded on a small thread
+    pool; at most max_pending uploads are queued, further calls block until
+    one finishes. Params and metrics are only collected (later values win)
+    and written with log_batch from the calling thread by flush(), after
+    the uploads: the file store cannot be read while metric files are being
+    written, so tracking writes never run concurrently with anything else.
+    Call flush()/close() (or use as a context manager) before
+    mlflow.end_run(); close() re-raises the first upload failure. Leaving
+    the context on an exception still finishes the queued uploads and shuts
+    the pool down, without logging the collected params/metrics. Objects
+    handed over must not be modified afterwards.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        artifact_dir="artifacts",
+    ):
+        from mlflow import MlflowClient
+
+        self.run_id = run_id
+        self._client = MlflowClient()
+        # resolved up front: reading the run from worker threads races with
+        # the file store's metric writes
+        self.artifact_uri = self._client.get_run(run_id).info.artifact_uri
+        self.artifact_dir = Path(artifact_dir)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mlflow-log"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        self._params = {}
+        self._metrics = {}
+
+    def _submit(self, fn, *args):
+        self._slots.acquire()
+        try:
+            fut = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(fut)
+        return fut
+
+    def log_params(self, params: dict):
+        self._params.update(params)
+
+    def log_metrics(self, metrics: dict):
+        self._metrics.update(metrics)
+
+    def log_file(self, path: str, artifact_path: str = None):
+        return self._submit(
+            self._client.log_artifact, self.run_id, str(path), artifact_path
+        )
+
+    def link_file(self, path: str, artifact_path: str = None):
+        return self._submit(
+            link_artifact, str(path), self.run_id, artifact_path, self.artifact_uri
+        )
+
+    def log_dir(self, path: str, artifact_path: str = None):
+        return self._submit(
+            self._client.log_artifacts, self.run_id, str(path), artifact_path
+        )
+
+    def _write_and_upload(self, obj, name: str):
+        path = self.artifact_dir / f"{name}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(obj, pd.Series):
+            obj.to_csv(path, header=True)
+        else:
+            obj.to_csv(path)
+        self._client.log_artifact(self.run_id, str(path))
+
+    def log_dataframe(self, df: pd.DataFrame, name: str):
+        return self._submit(self._write_and_upload, df, name)
+
+    def log_series(self, series: pd.Series, name: str):
+        return self._submit(self._write_and_upload, series, name)
+
+    def flush(self):
+        """
+        Wait for all queued uploads, then write the collected params and
+        metrics; raise the first upload error, if any.
+        """
+        futures, self._futures = self._futures, []
+        errors = [f.exception() for f in futures]
+        errors = [e for e in errors if e is not None]
+        params, self._params = self._params, {}
+        metrics, self._metrics = self._metrics, {}
+        if params or metrics:
+            _log_batch(self.run_id, metrics, params)
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # keep the original error; queued uploads still run to completion
+            self._pool.shutdown(wait=True)
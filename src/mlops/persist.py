@@ -1,32 +1,190 @@
+import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
 import joblib
 import pandas as pd
 
 ARTIFACT_DIR = Path("artifacts")
 
+# suffix -> format; ".parquet" is compressed, ".arrow" is uncompressed Arrow
+# IPC that load_dataframe can map without copying
+TABLE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow"}
+BOOSTER_FORMATS = (".ubj", ".json")
+PARQUET_COMPRESSION = "zstd"
+
 
 def ensure_dir():
     ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def save_model(model, name="xgb_model.pkl"):
+@contextmanager
+def _replacing(path: Path):
+    """
+    Write to a temporary sibling and rename it over path. Artifacts are
+    hardlinked into MLflow runs, so files must be replaced, never rewritten
+    in place.
+    """
+    tmp = path.with_name(f".{path.stem}.tmp{path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _estimator_params(model) -> dict:
+    """
+    JSON-serialisable XGBRegressor hyperparameters. The native booster file
+    does not keep them, so they travel in the metadata sidecar.
+    """
+    return {
+        k: v
+        for k, v in model.get_params().items()
+        if v is None or isinstance(v, (bool, int, float, str))
+    }
+
+
+def save_model(model, name="xgb_model.pkl", metadata: dict = None):
+    """
+    Save a model. ".ubj"/".json" names use XGBoost's native booster format,
+    anything else is pickled with joblib. Returns the written path.
+    """
     ensure_dir()
-    joblib.dump(model, ARTIFACT_DIR / name)
+    path = ARTIFACT_DIR / name
+    with _replacing(path) as tmp:
+        if path.suffix in BOOSTER_FORMATS:
+            model.save_model(tmp)
+        else:
+            joblib.dump(model, tmp)
+    if path.suffix in BOOSTER_FORMATS:
+        metadata = {**(metadata or {}), "xgb_params": _estimator_params(model)}
+    if metadata is not None:
+        save_metrics(metadata, f"{Path(name).stem}.meta.json")
+    return path
+
+
+def load_model(name="xgb_model.pkl"):
+    """
+    Load a model written by save_model, or None if there is none yet.
+    Native booster files come back as XGBRegressor with the hyperparameters
+    recorded by save_model.
+    """
+    path = ARTIFACT_DIR / name
+    if not path.exists():
+        return None
+    if path.suffix in BOOSTER_FORMATS:
+        from xgboost import XGBRegressor
+
+        model = XGBRegressor(**load_model_metadata(name).get("xgb_params", {}))
+        model.load_model(path)
+        return model
+    return joblib.load(path)
+
+
+def load_model_metadata(name="xgb_model.pkl"):
+    return load_metrics(f"{Path(name).stem}.meta.json")
+
+
+def _table_format(name):
+    suffix = Path(name).suffix
+    if suffix not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported artifact format {suffix!r} for {name}")
+    return TABLE_FORMATS[suffix]
+
+
+def _index_sidecar(path: Path) -> Path:
+    # CSV has no schema metadata; the index levels of a CSV artifact with a
+    # MultiIndex are recorded next to it
+    return path.with_name(f"{path.name}.index.json")
+
+
+def _write_table(df: pd.DataFrame, path: Path):
+    fmt = _table_format(path)
+    with _replacing(path) as tmp:
+        if fmt == "parquet":
+            df.to_parquet(tmp, compression=PARQUET_COMPRESSION)
+        elif fmt == "arrow":
+            import pyarrow as pa
+            import pyarrow.feather as feather
+
+            # the pandas schema metadata restores every index level on load
+            table = pa.Table.from_pandas(df)
+            feather.write_feather(table, tmp, compression="uncompressed")
+        else:
+            df.to_csv(tmp)
+    if fmt == "csv":
+        sidecar = _index_sidecar(path)
+        if df.index.nlevels > 1:
+            sidecar.write_text(json.dumps({"nlevels": df.index.nlevels}))
+        else:
+            sidecar.unlink(missing_ok=True)
 
 
 def save_series(series: pd.Series, name="forecast.csv"):
+    """
+    Save a series as CSV, Parquet or Arrow depending on the name's suffix.
+    Returns the written path.
+    """
     ensure_dir()
-    series.to_csv(ARTIFACT_DIR / name, header=True)
+    path = ARTIFACT_DIR / name
+    if _table_format(name) == "csv":
+        with _replacing(path) as tmp:
+            series.to_csv(tmp, header=True)
+    else:
+        _write_table(series.to_frame(name=series.name or "value"), path)
+    return path
 
 
-def save_dataframe(df: pd.DataFrame, name="simulation.csv"):
-    ensure_dir()
-    df.to_csv(ARTIFACT_DIR / name)
+def save_dataframe(df: pd.DataFrame, name="simulation.csv", directory=None):
+    """
+    Save a frame as CSV, Parquet or Arrow depending on the name's suffix,
+    into directory (default ARTIFACT_DIR). Returns the written path.
+    """
+    directory = Path(directory) if directory is not None else ARTIFACT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    _write_table(df, path)
+    return path
+
+
+def load_dataframe(name="simulation.parquet", columns=None, directory=None):
+    """
+    Load a CSV, Parquet or Arrow artifact (from directory, default
+    ARTIFACT_DIR). Parquet and Arrow files are memory-mapped; Arrow files
+    need no decompression or decoding. All formats restore every level of a
+    MultiIndex.
+    """
+    path = (Path(directory) if directory is not None else ARTIFACT_DIR) / name
+    fmt = _table_format(name)
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns, memory_map=True)
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+        return df[columns] if columns is not None else df
+    sidecar = _index_sidecar(path)
+    nlevels = json.loads(sidecar.read_text())["nlevels"] if sidecar.exists() else 1
+    return pd.read_csv(path, index_col=list(range(nlevels)))
+
+
+def load_series(name="forecast.parquet"):
+    df = load_dataframe(name)
+    return df.iloc[:, 0]
 
 
 def save_metrics(metrics: dict, name="metrics.json"):
     ensure_dir()
-    import json
-
     with open(ARTIFACT_DIR / name, "w") as f:
         json.dump(metrics, f, indent=2)
+
+
+def load_metrics(name="metrics.json"):
+    path = ARTIFACT_DIR / name
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
@@ -1,22 +1,27 @@
-import pandas as pd
-import mlflow
-import mlflow.sklearn
-
 from src.data_loader import load_data
 from src.inventory.demand_reconstruction import reconstruct_demand
 from src.forecasting.hybrid_forecast import hybrid_forecast
+from src.forecasting.xgb_model import update_xgb
 from src.inventory.safety_stock import compute_safety_stock
 from src.inventory.inventory_simulation import simulate_inventory_with_rop
 from src.mlops.evaluate import evaluate_forecast, drift_check, promote_metrics
-from src.mlops.persist import save_model, save_series, save_dataframe, save_metrics
+from src.mlops.backtest import rolling_origin_backtest
+from src.mlops.instrumentation import StageTimer
+from src.mlops.persist import (
+    save_model,
+    save_series,
+    save_dataframe,
+    save_metrics,
+    load_model,
+    load_model_metadata,
+    load_metrics,
+)
 from src.mlops.mlflow_utils import (
     start_mlflow_run,
-    log_params,
-    log_metrics,
-    log_artifact_dataframe,
-    log_artifact_series,
-    log_artifact_file,
     register_model,
+    log_metrics,
+    link_artifact,
+    AsyncMlflowLogger,
 )
 
 
@@ -26,7 +31,26 @@ def run_training_pipeline(
     lead_time_days=7,
     tolerance_early_days=2,
     tolerance_late_days=1,
+    backtest_horizon=3,
+    backtest_folds=6,
+    warm_start=False,
+    warm_estimators=25,
+    max_warm_rounds=12,
+    profile_dir=None,
+    profiler="cprofile",
+    log_workers=2,
+    artifact_format="parquet",
+    model_format="ubj",
+    freq="ME",
 ):
+    # imported here so that importing the pipeline module stays cheap
+    import mlflow
+
+    # per-stage wall/CPU time and peak RSS, optionally profiled per stage
+    timer = StageTimer(profile_dir=profile_dir, profiler=profiler)
+    # artifacts are written once by persist and linked into the MLflow run
+    model_file = f"xgb_model.{model_format}"
+    table_ext = artifact_format
 
     # -------------------------------
     # 1) MLflow run start
@@ -34,89 +58,201 @@ def run_training_pipeline(
     run = start_mlflow_run(experiment_name="DemandForecast", run_name="NightlyRetrain")
     run_id = run.info.run_id
     print("MLflow run_id:", run_id)
+    # artifacts are uploaded in the background; params/metrics are written
+    # when the tracker is flushed. Leaving the block on an error still
+    # finishes queued uploads and shuts the pool down.
+    tracker = AsyncMlflowLogger(run_id, max_workers=log_workers)
+    with tracker:
+        # -------------------------------
+        # 2) Load data
+        # -------------------------------
+        with timer.stage("load"):
+            sales_df, purchase_df = load_data()
 
-    # -------------------------------
-    # 2) Load data
-    # -------------------------------
-    sales_df, purchase_df = load_data()
+        # -------------------------------
+        # 3) Reconstruct demand
+        # -------------------------------
+        with timer.stage("reconstruct"):
+            inv_df = reconstruct_demand(sales_df, purchase_df, freq=freq)
+            demand_ts = inv_df["true_demand_est"].asfreq(freq)
 
-    # -------------------------------
-    # 3) Reconstruct demand
-    # -------------------------------
-    inv_df = reconstruct_demand(sales_df, purchase_df)
-    demand_ts = inv_df["true_demand_est"].asfreq("ME")
+        # -------------------------------
+        # 4) Forecast (hybrid model)
+        # -------------------------------
+        with timer.stage("forecast"):
+            # warm start: keep boosting last night's model on the new periods unless
+            # the previous run flagged drift or too many warm rounds piled up
+            train_path, warm_model, warm_rounds = "cold", None, 0
+            if warm_start:
+                prev_model = load_model(model_file)
+                prev_meta = load_model_metadata(model_file)
+                if prev_model is None or "trained_until" not in prev_meta:
+                    train_path = "cold"
+                elif load_metrics("metrics.json").get("drift_flag"):
+                    train_path = "refit_drift"
+                elif prev_meta.get("warm_rounds", 0) >= max_warm_rounds:
+                    train_path = "refit_max_rounds"
+                else:
+                    warm_model, _, _ = update_xgb(
+                        prev_model,
+                        demand_ts,
+                        since=prev_meta["trained_until"],
+                        n_estimators=warm_estimators,
+                        freq=freq,
+                    )
+                    warm_rounds = prev_meta.get("warm_rounds", 0)
+                    if warm_model is prev_model:
+                        train_path = "reuse"
+                    else:
+                        train_path = "warm"
+                        warm_rounds += 1
+            print("XGB training path:", train_path)
 
-    # -------------------------------
-    # 4) Forecast (hybrid model)
-    # -------------------------------
-    future_forecast, debug = hybrid_forecast(demand_ts, steps=steps)
-    xgb_model = debug["xgb_model"]
+            future_forecast, debug = hybrid_forecast(
+                demand_ts, steps=steps, xgb_model=warm_model, freq=freq
+            )
+            xgb_model = debug["xgb_model"]
 
-    # -------------------------------
-    # 5) Metrics
-    # -------------------------------
-    backtest_n = 3
-    y_true = demand_ts.tail(backtest_n)
-    y_pred = pd.Series([demand_ts.mean()] * backtest_n, index=y_true.index)
-    metrics = evaluate_forecast(y_true, y_pred)
-    drift = drift_check(metrics)
-
-    full_metrics = {
-        **metrics,
-        **drift,
-        "w": debug["w"],
-        "ADI": debug["intermittency"]["ADI"],
-        "CV2": debug["intermittency"]["CV2"],
-        "class": debug["intermittency"]["class"],
-    }
+        # -------------------------------
+        # 5) Metrics (rolling-origin backtest)
+        # -------------------------------
+        with timer.stage("metrics"):
+            # evaluate the path that produced the forecast: a warm-updated
+            # (or reused warm) booster is replayed per fold; the cold hybrid
+            # is logged alongside for comparison
+            backtest_rounds = warm_rounds if train_path in ("warm", "reuse") else 0
+            backtest_summary, backtest_df = rolling_origin_backtest(
+                demand_ts,
+                horizon=backtest_horizon,
+                n_folds=backtest_folds,
+                freq=freq,
+                warm_rounds=backtest_rounds,
+                warm_estimators=warm_estimators,
+            )
+            evaluated = "hybrid_warm" if backtest_rounds else "hybrid"
+            hybrid_folds = backtest_df[backtest_df["model"] == evaluated]
+            metrics = evaluate_forecast(hybrid_folds["y_true"], hybrid_folds["y_pred"])
+            drift = drift_check(metrics)
 
-    # -------------------------------
-    # 6) Safety Stock
-    # -------------------------------
-    ss = compute_safety_stock(
-        inv_df, lead_time_days, tolerance_early_days, tolerance_late_days
-    )
+            horizon_metrics = {}
+            for row in backtest_summary[
+                backtest_summary["model"] == evaluated
+            ].itertuples():
+                horizon_metrics[f"MAE_h{row.horizon}"] = row.MAE
+                horizon_metrics[f"MAPE_h{row.horizon}"] = row.MAPE
+            if backtest_rounds:
+                cold_folds = backtest_df[backtest_df["model"] == "hybrid"]
+                cold = evaluate_forecast(cold_folds["y_true"], cold_folds["y_pred"])
+                horizon_metrics["MAE_cold"] = cold["MAE"]
+                horizon_metrics["MAPE_cold"] = cold["MAPE"]
 
-    # -------------------------------
-    # 7) Inventory simulation
-    # -------------------------------
-    sim_df = simulate_inventory_with_rop(inv_df, future_forecast, ss, lead_time_days)
+            full_metrics = {
+                **metrics,
+                **horizon_metrics,
+                **drift,
+                "w": debug["w"],
+                "ADI": debug["intermittency"]["ADI"],
+                "CV2": debug["intermittency"]["CV2"],
+                "class": debug["intermittency"]["class"],
+                "train_path": train_path,
+                "backtest_model": evaluated,
+            }
 
-    # -------------------------------
-    # 8) Save artifacts locally & MLflow
-    # -------------------------------
-    save_model(xgb_model, "xgb_model.pkl")
-    save_series(future_forecast, "forecast.csv")
-    save_dataframe(sim_df, "simulation.csv")
-    save_metrics(full_metrics, "metrics.json")
-
-    # MLflow logging
-    log_params(
-        {
-            "steps": steps,
-            "lead_time_days": lead_time_days,
-            "tolerance_early_days": tolerance_early_days,
-            "tolerance_late_days": tolerance_late_days,
-            "model_name": model_name,
-        }
-    )
-    log_metrics(full_metrics)
-
-    log_artifact_dataframe(inv_df, "inventory_history")
-    log_artifact_series(future_forecast, "forecast_future")
-    log_artifact_dataframe(sim_df, "inventory_sim_future")
-    log_artifact_file("artifacts/xgb_model.pkl")
+        # -------------------------------
+        # 6) Safety Stock
+        # -------------------------------
+        with timer.stage("safety_stock"):
+            ss = compute_safety_stock(
+                inv_df, lead_time_days, tolerance_early_days, tolerance_late_days
+            )
 
-    # -------------------------------
-    # 9) MLflow Model Registry
-    # -------------------------------
-    mlflow.sklearn.log_model(xgb_model, artifact_path="model")
-    registered = register_model(model_name, run_id)
+        # -------------------------------
+        # 7) Inventory simulation
+        # -------------------------------
+        with timer.stage("simulation"):
+            sim_df = simulate_inventory_with_rop(
+                inv_df, future_forecast, ss, lead_time_days
+            )
 
-    # -------------------------------
-    # 10) Promote previous metrics
-    # -------------------------------
-    promote_metrics()
+        # -------------------------------
+        # 8) Save artifacts locally & MLflow
+        # -------------------------------
+        with timer.stage("persist"):
+            model_path = save_model(
+                xgb_model,
+                model_file,
+                metadata={
+                    "trained_until": str(demand_ts.index[-1]),
+                    "train_path": train_path,
+                    "warm_rounds": warm_rounds,
+                },
+            )
+            artifact_paths = [
+                model_path,
+                save_series(future_forecast, f"forecast.{table_ext}"),
+                save_dataframe(sim_df, f"simulation.{table_ext}"),
+                save_dataframe(inv_df, f"inventory_history.{table_ext}"),
+                save_dataframe(backtest_summary, f"backtest_summary.{table_ext}"),
+            ]
+            save_metrics(full_metrics, "metrics.json")
+
+        # MLflow logging
+        with timer.stage("mlflow_logging"):
+            tracker.log_params(
+                {
+                    "steps": steps,
+                    "lead_time_days": lead_time_days,
+                    "tolerance_early_days": tolerance_early_days,
+                    "tolerance_late_days": tolerance_late_days,
+                    "model_name": model_name,
+                    "backtest_horizon": backtest_horizon,
+                    "backtest_folds": backtest_folds,
+                    "train_path": train_path,
+                    "artifact_format": artifact_format,
+                    "model_format": model_format,
+                    "freq": freq,
+                }
+            )
+            tracker.log_metrics(full_metrics)
+            for path in artifact_paths:
+                tracker.link_file(path)
+
+        # -------------------------------
+        # 9) MLflow Model Registry
+        # -------------------------------
+        with timer.stage("registry"):
+            if model_format in ("ubj", "json"):
+                import mlflow.xgboost
+
+                mlflow.xgboost.log_model(
+                    xgb_model, artifact_path="model", model_format=model_format
+                )
+            else:
+                import mlflow.sklearn
+
+                mlflow.sklearn.log_model(
+                    xgb_model,
+                    artifact_path="model",
+                    serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE,
+                )
+            registered = register_model(model_name, run_id)
+
+        # -------------------------------
+        # 10) Promote previous metrics
+        # -------------------------------
+        with timer.stage("promote"):
+            promote_metrics()
+
+        with timer.stage("flush_logging"):
+            tracker.close()
+
+    # the trace goes last, once every stage (including the flush) is known
+    trace_path = timer.save("artifacts/pipeline_trace.json")
+    log_metrics(timer.metrics())
+    link_artifact(trace_path, run_id)
+    if profile_dir is not None:
+        mlflow.log_artifacts(str(profile_dir), artifact_path="profiles")
+    print(timer.summary())
 
     mlflow.end_run()
     return registered
@@ -2,7 +2,6 @@ from forecasting.hybrid_forecast import hybrid_forecast
 from inventory.demand_reconstruction import reconstruct_demand
 from inventory.safety_stock import compute_safety_stock
 from inventory.inventory_simulation import simulate_inventory_with_rop
-from utils.plots import plot_history_and_forecast
 from data_loader import load_data
 
 
@@ -30,6 +29,8 @@ def main():
     print("Intermittency:", debug["intermittency"], "w=", debug["w"])
     print(sim_df)
 
+    from utils.plots import plot_history_and_forecast
+
     plot_history_and_forecast(
         inv_df,
         forecast_future,
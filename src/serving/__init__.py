@@ -0,0 +1,4 @@
+from .service import ForecastService, UnknownSkuError  # noqa: F401
+from .http import make_server, serve  # noqa: F401
+
+__all__ = ["ForecastService", "UnknownSkuError", "make_server", "serve"]
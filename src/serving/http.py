@@ -0,0 +1,99 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .service import UnknownSkuError
+
+
+def _handler(service):
+    class ForecastHandler(BaseHTTPRequestHandler):
+        """
+        GET  /forecast/<sku>?steps=6
+        POST /forecast  {"sku": ..., "steps": 6, "overrides": {"2025-01-31": 12}}
+        GET  /metrics   latency percentiles and batch sizes
+        GET  /health
+        Unexpected errors are answered with a JSON 500.
+        """
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _forecast(self, sku, steps, overrides=None):
+            try:
+                self._send(200, service.forecast(sku, steps=steps, overrides=overrides))
+            except UnknownSkuError as exc:
+                self._send(404, {"error": str(exc.args[0])})
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc)})
+            except TimeoutError as exc:
+                self._send(503, {"error": str(exc)})
+
+        def _safely(self, handle):
+            try:
+                handle()
+            except Exception as exc:  # never leave a client without a reply
+                self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+        def do_GET(self):
+            self._safely(self._get)
+
+        def do_POST(self):
+            self._safely(self._post)
+
+        def _get(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send(200, {"status": "ok", "n_skus": len(service.states)})
+            elif url.path == "/metrics":
+                self._send(200, service.stats())
+            elif url.path.startswith("/forecast/"):
+                query = parse_qs(url.query)
+                try:
+                    steps = int(query.get("steps", ["6"])[0])
+                except ValueError:
+                    return self._send(400, {"error": "steps must be an integer"})
+                sku = url.path.split("/", 2)[2]
+                self._forecast(sku, steps)
+            else:
+                self._send(404, {"error": f"Unknown path {url.path}"})
+
+        def _post(self):
+            if urlparse(self.path).path != "/forecast":
+                return self._send(404, {"error": f"Unknown path {self.path}"})
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                sku, steps = body["sku"], int(body.get("steps", 6))
+            except (ValueError, KeyError) as exc:
+                return self._send(400, {"error": f"Bad request: {exc}"})
+            self._forecast(sku, steps, body.get("overrides"))
+
+        def log_message(self, format, *args):  # keep request logs off stderr
+            pass
+
+    return ForecastHandler
+
+
+def make_server(service, host: str = "127.0.0.1", port: int = 8080):
+    """
+    Threading HTTP server in front of a ForecastService; each connection
+    gets its own thread, so concurrent requests reach the micro-batcher
+    together. Call serve_forever() on the result (port=0 picks a free port).
+    """
+    return ThreadingHTTPServer((host, port), _handler(service))
+
+
+def serve(service, host: str = "127.0.0.1", port: int = 8080):
+    server = make_server(service, host, port)
+    print(
+        f"Serving forecasts for {len(service.states)} SKUs on http://{host}:{server.server_port}"
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
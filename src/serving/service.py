@@ -0,0 +1,328 @@
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from ..feature_engineering import make_time_features, make_panel_time_features
+from ..forecasting.xgb_model import DEFAULT_MODEL_KWARGS, forecast_xgb_many
+from ..forecasting.croston import croston_sba, croston_sba_matrix
+from ..forecasting.hybrid_forecast import (
+    automatic_hybrid_weight,
+    automatic_hybrid_weight_panel,
+)
+from ..frequency import future_index, resolve_freq
+
+_STOP = object()  # queue sentinel that ends the worker thread
+
+
+class UnknownSkuError(KeyError):
+    """
+    forecast() was asked for a SKU that is not loaded. A KeyError subclass,
+    so the HTTP layer can tell it apart from KeyErrors raised by bugs.
+    """
+
+
+class _Request:
+    __slots__ = ("sku", "steps", "state", "done", "result", "error")
+
+    def __init__(self, sku, steps, state):
+        self.sku = sku
+        self.steps = steps
+        self.state = state
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ForecastService:
+    """
+    In-memory hybrid forecast service.
+
+    Everything hybrid_forecast derives from history (feature frame, Croston
+    SBA forecast, blend weight, fitted booster) is computed once per SKU at
+    startup. Concurrent forecast() calls are queued and a worker thread
+    rolls up to max_batch of them forward together, waiting at most
+    max_wait_ms for a batch to fill; SKUs sharing a booster are predicted
+    in one call per step. What-if requests pass overrides ({date: demand})
+    and are rebuilt on the fly against the preloaded booster.
+
+    close() (or leaving a with block) stops the worker thread; requests
+    still queued at that point fail with RuntimeError.
+    """
+
+    def __init__(
+        self,
+        states: dict,
+        features: list,
+        alpha: float = 0.1,
+        max_steps: int = 12,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+        latency_window: int = 10000,
+    ):
+        self.states = states
+        self.features = features
+        self.alpha = alpha
+        self.max_steps = max_steps
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="forecast-batcher", daemon=True
+        )
+        self._worker.start()
+
+    # ------------------------------------------------------------------
+    # loading
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_panel(
+        cls,
+        panel: pd.DataFrame,
+        models=None,
+        abc_class="A",
+        alpha: float = 0.1,
+        max_steps: int = 12,
+        model_kwargs: dict = None,
+        sku_col: str = "sku",
+        date_col: str = "date",
+        value_col: str = "demand",
+        freq: str = None,
+        **service_kwargs,
+    ):
+        """
+        Preload every SKU of a long-format panel. models is a mapping
+        sku -> fitted booster, one booster shared by all SKUs (e.g. the
+        registered model from persist.load_model), or None to fit one per
+        SKU now. SKUs are routed with automatic_hybrid_weight_panel exactly
+        as in hybrid_forecast_batch: SKUs routed to "croston" get no booster
+        and w = 0. freq (ME, W or D) is inferred from the panel dates when
+        not given.
+        """
+        freq = resolve_freq(freq, panel[date_col])
+        panel_feats = make_panel_time_features(
+            panel, sku_col=sku_col, date_col=date_col, value_col=value_col, freq=freq
+        )
+        features = [c for c in panel_feats.columns if c not in ("sku", "date", "y")]
+        frames = {
+            sku: g.drop(columns="sku").reset_index(drop=True)
+            for sku, g in panel_feats.groupby("sku", sort=False)
+        }
+        ordered = panel.sort_values([sku_col, date_col], kind="stable")
+        series = {
+            sku: pd.Series(
+                g[value_col].to_numpy(dtype=float),
+                index=pd.DatetimeIndex(g[date_col].to_numpy()),
+            )
+            for sku, g in ordered.groupby(sku_col, sort=False)
+        }
+
+        n_max = max(len(ts) for ts in series.values())
+        Y = np.zeros((len(series), n_max))
+        for i, ts in enumerate(series.values()):
+            start = n_max - len(ts)
+            Y[i, start:] = ts.values
+        _, sba = croston_sba_matrix(Y, alpha=alpha, h=max_steps)
+        segments = automatic_hybrid_weight_panel(
+            panel, abc_class=abc_class, sku_col=sku_col, value_col=value_col
+        )
+
+        from xgboost import XGBRegressor
+
+        kwargs = model_kwargs or dict(DEFAULT_MODEL_KWARGS)
+        states = {}
+        for i, (sku, ts) in enumerate(series.items()):
+            frame = frames.get(sku)
+            segment = segments.loc[sku]
+            if isinstance(models, dict):
+                model = models.get(sku)
+            else:
+                model = models
+            if segment["route"] != "hybrid":
+                model = None
+            elif model is None and frame is not None:
+                model = XGBRegressor(**kwargs).fit(frame[features], frame["y"])
+            klass = (
+                abc_class.get(sku, "A") if isinstance(abc_class, dict) else abc_class
+            )
+            states[sku] = cls._state(
+                ts, frame, model, sba[i], klass, freq, segment=segment
+            )
+        return cls(states, features, alpha=alpha, max_steps=max_steps, **service_kwargs)
+
+    @staticmethod
+    def _state(demand_ts, frame, model, sba_future, abc_class, freq, segment=None):
+        if segment is None:
+            w, info = automatic_hybrid_weight(demand_ts, abc_class=abc_class)
+        else:
+            w = float(segment["w"])
+            info = {k: segment[k] for k in ("ADI", "CV2", "class")}
+        # same rule as automatic_hybrid_weight_panel: no positive demand,
+        # nothing for XGB to learn
+        route = "hybrid" if np.isfinite(info["ADI"]) else "croston"
+        usable = (
+            route == "hybrid"
+            and frame is not None
+            and len(frame) > 0
+            and model is not None
+        )
+        return {
+            "demand_ts": demand_ts,
+            "frame": frame if usable else None,
+            "model": model,
+            "sba_future": np.asarray(sba_future, dtype=float),
+            "w": w if usable else 0.0,
+            "info": info,
+            "route": route,
+            "abc_class": abc_class,
+            "freq": freq,
+        }
+
+    def what_if_state(self, sku, overrides: dict):
+        """
+        State for sku with observations replaced/appended from overrides.
+        The preloaded booster is reused; nothing is retrained.
+        """
+        base = self.states[sku]
+        ts = base["demand_ts"].copy()
+        for date, value in overrides.items():
+            ts.loc[pd.Timestamp(date)] = float(value)
+        ts = ts.sort_index()
+        freq = base["freq"]
+        frame = make_time_features(ts, freq=freq)
+        _, sba = croston_sba(ts, alpha=self.alpha, h=self.max_steps, freq=freq)
+        return self._state(
+            ts, frame, base["model"], sba.values, base["abc_class"], freq
+        )
+
+    # ------------------------------------------------------------------
+    # serving
+    # ------------------------------------------------------------------
+    def forecast(self, sku, steps: int = 6, overrides: dict = None, timeout=10.0):
+        """
+        Hybrid forecast for sku as a dict with dates, y_pred_xgb,
+        y_pred_sba, y_pred_hybrid, w and the intermittency class.
+        """
+        start = time.perf_counter()
+        if self._closed:
+            raise RuntimeError("ForecastService is closed")
+        if sku not in self.states:
+            raise UnknownSkuError(f"Unknown SKU: {sku!r}")
+        if not 1 <= steps <= self.max_steps:
+            raise ValueError(f"steps must be between 1 and {self.max_steps}")
+        state = self.what_if_state(sku, overrides) if overrides else self.states[sku]
+
+        req = _Request(sku, steps, state)
+        self._queue.put(req)
+        if not req.done.wait(timeout):
+            raise TimeoutError(f"Forecast for {sku!r} timed out")
+        if req.error is not None:
+            raise req.error
+        self.latencies.append(time.perf_counter() - start)
+        return req.result
+
+    def close(self, timeout: float = None):
+        """
+        Stop the worker thread once the batch in flight is done and fail
+        every request still queued. Further forecast() calls raise
+        RuntimeError. Safe to call more than once.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join(timeout)
+        while True:
+            try:
+                req = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if req is not _STOP:
+                req.error = RuntimeError("ForecastService is closed")
+                req.done.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            req = self._queue.get()
+            if req is _STOP:
+                break
+            batch = [req]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    req = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if req is _STOP:
+                    stop = True
+                    break
+                batch.append(req)
+            try:
+                self._process(batch)
+            except Exception as exc:  # fail the batch, keep serving
+                for req in batch:
+                    req.error = exc
+            finally:
+                self.batch_sizes.append(len(batch))
+                for req in batch:
+                    req.done.set()
+
+    def _process(self, batch):
+        steps = max(req.steps for req in batch)
+        xgb_reqs = [req for req in batch if req.state["frame"] is not None]
+        xgb = {}
+        if xgb_reqs:
+            preds = forecast_xgb_many(
+                [req.state["model"] for req in xgb_reqs],
+                [req.state["frame"] for req in xgb_reqs],
+                self.features,
+                steps=steps,
+            )
+            xgb = {id(req): row for req, row in zip(xgb_reqs, preds)}
+
+        for req in batch:
+            state = req.state
+            y_xgb = xgb.get(id(req), np.zeros(steps))[: req.steps]
+            y_sba = state["sba_future"][: req.steps]
+            w = state["w"]
+            last = state["demand_ts"].index[-1]
+            dates = future_index(last, req.steps, state["freq"])
+            req.result = {
+                "sku": req.sku,
+                "dates": [d.isoformat() for d in dates],
+                "y_pred_xgb": y_xgb.astype(float).tolist(),
+                "y_pred_sba": y_sba.tolist(),
+                "y_pred_hybrid": (w * y_xgb + (1 - w) * y_sba).tolist(),
+                "w": w,
+                "class": state["info"]["class"],
+            }
+
+    def stats(self) -> dict:
+        """
+        Latency percentiles (ms) over the last requests and mean batch size.
+        """
+        lat = np.asarray(self.latencies) * 1000
+        return {
+            "n_requests": len(lat),
+            "p50_ms": float(np.percentile(lat, 50)) if len(lat) else None,
+            "p99_ms": float(np.percentile(lat, 99)) if len(lat) else None,
+            "mean_batch_size": (
+                float(np.mean(self.batch_sizes)) if self.batch_sizes else None
+            ),
+            "n_skus": len(self.states),
+        }
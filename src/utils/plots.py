@@ -1,6 +1,3 @@
-import matplotlib.pyplot as plt
-
-
 def plot_history_and_forecast(
     inv_df,
     forecast_series,
@@ -8,6 +5,8 @@ def plot_history_and_forecast(
     sim_df=None,
     title="Demand Forecast",
 ):
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(16, 9))
 
     plt.plot(
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from src.mlops.backtest import rolling_origin_backtest
+
+
+def test_rolling_origin_backtest():
+    idx = pd.date_range("2021-01-31", periods=30, freq="ME")
+    demand_ts = pd.Series(
+        np.random.default_rng(5).poisson(6, 30).astype(float), index=idx
+    )
+
+    summary, folds = rolling_origin_backtest(demand_ts, horizon=3, n_folds=4, n_jobs=2)
+
+    assert set(summary["model"]) == {"xgb", "croston", "hybrid"}
+    assert set(summary["horizon"]) == {1, 2, 3}
+    assert (summary["n_points"] == 4).all()
+    assert folds["origin"].nunique() == 4
+    assert folds["origin"].max() == idx[-4]
+    assert (summary["MAE"] >= 0).all()
+
+    # the last fold's horizon-1 target is the third-to-last observation
+    last = folds[(folds["origin"] == idx[-4]) & (folds["horizon"] == 1)]
+    assert (last["y_true"] == demand_ts.iloc[-3]).all()
+
+
+def test_backtest_replays_warm_start_path():
+    idx = pd.date_range("2021-01-31", periods=30, freq="ME")
+    demand_ts = pd.Series(
+        np.random.default_rng(6).poisson(6, 30).astype(float), index=idx
+    )
+
+    summary, folds = rolling_origin_backtest(
+        demand_ts, horizon=2, n_folds=3, warm_rounds=2, warm_estimators=10
+    )
+
+    assert set(summary["model"]) == {
+        "xgb",
+        "croston",
+        "hybrid",
+        "xgb_warm",
+        "hybrid_warm",
+    }
+    warm = folds[folds["model"] == "xgb_warm"]["y_pred"].to_numpy()
+    cold = folds[folds["model"] == "xgb"]["y_pred"].to_numpy()
+    assert len(warm) == len(cold) == 3 * 2
+    assert not np.allclose(warm, cold)
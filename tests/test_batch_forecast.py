@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from src.forecasting.batch_forecast import hybrid_forecast_batch
+from src.forecasting.hybrid_forecast import hybrid_forecast
+
+
+def _panel():
+    rng = np.random.default_rng(0)
+    frames = []
+    for sku, n in [("A1", 18), ("B2", 24), ("C3", 4)]:
+        idx = pd.date_range("2022-01-31", periods=n, freq="ME")
+        frames.append(
+            pd.DataFrame({"sku": sku, "date": idx, "demand": rng.poisson(4, n)})
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_batch_matches_single_series():
+    panel = _panel()
+    forecast_df, debug = hybrid_forecast_batch(panel, steps=4)
+
+    assert set(forecast_df["sku"]) == {"A1", "B2", "C3"}
+    assert len(forecast_df) == 3 * 4
+    assert not forecast_df["y_pred_hybrid"].isna().any()
+
+    for sku in ("A1", "B2"):
+        g = panel[panel["sku"] == sku]
+        ts = pd.Series(g["demand"].values.astype(float), index=g["date"].values)
+        ref, ref_debug = hybrid_forecast(ts.asfreq("ME"), steps=4)
+        got = forecast_df[forecast_df["sku"] == sku]
+        np.testing.assert_allclose(got["y_pred_hybrid"].values, ref.values)
+        assert debug[sku]["w"] == ref_debug["w"]
+
+    # too short for XGB features -> pure Croston
+    assert debug["C3"]["w"] == 0.0
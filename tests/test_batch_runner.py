@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_info
+from src.mlops import batch_runner
+from src.mlops.batch_runner import _init_worker, run_sku_pipeline
+
+
+def _orders(rng, sku, n):
+    dates = pd.Timestamp("2022-01-01") + pd.to_timedelta(
+        rng.integers(0, 600, n), unit="D"
+    )
+    return pd.DataFrame(
+        {"sku": sku, "DeliveryDate": dates, "DeliveredQuantity": rng.integers(1, 20, n)}
+    )
+
+
+def test_run_sku_pipeline(tmp_path):
+    rng = np.random.default_rng(3)
+    skus = ["A1", "B2", "C3"]
+    sales_df = pd.concat([_orders(rng, s, 120) for s in skus], ignore_index=True)
+    purchase_df = pd.concat(
+        [_orders(rng, s, 30).assign(IsConfirmed=True) for s in skus],
+        ignore_index=True,
+    )
+
+    summary = run_sku_pipeline(
+        sales_df, purchase_df, output_dir=tmp_path, n_workers=2, chunk_size=2, steps=3
+    )
+
+    assert summary["errors"] == {}
+    assert summary["n_skus"] == 3
+    assert summary["n_chunks"] == 2
+    assert summary["skus_per_sec"] > 0
+
+    forecasts = pd.concat(pd.read_csv(c["paths"][0]) for c in summary["chunks"])
+    assert set(forecasts["sku"]) == set(skus)
+    assert len(forecasts) == 3 * 3
+    assert forecasts["safety_stock_units"].notna().all()
+
+
+def _blas_threads():
+    return {info["num_threads"] for info in threadpool_info()}
+
+
+def test_worker_initializer_limits_loaded_blas_pools():
+    # BLAS is already loaded in the worker by the time the initializer runs
+    with ProcessPoolExecutor(1, initializer=_init_worker, initargs=(3,)) as pool:
+        assert pool.submit(_blas_threads).result() == {3}
+
+
+def test_run_sku_pipeline_bounds_in_flight_chunks(tmp_path, monkeypatch):
+    rng = np.random.default_rng(4)
+    sales_df = pd.concat([_orders(rng, s, 80) for s in "ABC"], ignore_index=True)
+    # D only has purchases: it is still run, as a zero-demand SKU
+    purchase_df = pd.concat(
+        [_orders(rng, s, 20).assign(IsConfirmed=True) for s in "ABCD"],
+        ignore_index=True,
+    )
+    in_flight = []
+    real_wait = batch_runner.wait
+    monkeypatch.setattr(
+        batch_runner,
+        "wait",
+        lambda fs, **kw: in_flight.append(len(fs)) or real_wait(fs, **kw),
+    )
+
+    summary = run_sku_pipeline(
+        sales_df, purchase_df, output_dir=None, n_workers=1, chunk_size=1, steps=2
+    )
+
+    assert summary["errors"] == {}
+    assert summary["n_chunks"] == 4
+    assert max(in_flight) <= batch_runner.IN_FLIGHT_PER_WORKER
+    forecast = summary["tables"]["forecast"]
+    assert sorted(forecast["sku"].unique()) == list("ABCD")
+    assert (forecast.loc[forecast["sku"] == "D", "y_pred_hybrid"] == 0).all()
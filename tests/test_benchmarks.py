@@ -0,0 +1,31 @@
+import json
+
+from benchmarks.run import run_benchmarks, main
+from benchmarks.compare import compare
+from benchmarks.synthetic import make_panel, make_orders
+
+
+def test_synthetic_panel_shape():
+    panel = make_panel(5, 24, seed=3)
+    assert len(panel) == 5 * 24
+    assert panel["sku"].nunique() == 5
+    sales, purchase = make_orders(panel)
+    assert {"sku", "DeliveryDate", "DeliveredQuantity"} <= set(sales.columns)
+    assert "IsConfirmed" in purchase.columns
+
+
+def test_run_benchmarks_writes_comparable_json(tmp_path):
+    out = tmp_path / "bench.json"
+    cases = "croston_sba make_time_features reconstruct_demand_fast"
+    main(f"--skus 2 --periods 24 --cases {cases} --repeat 1 --out {out}".split())
+    doc = json.loads(out.read_text())
+    assert len(doc["results"]) == 3
+    assert all("error" not in r for r in doc["results"])
+    assert all(r["peak_mem_mb"] >= 0 for r in doc["results"])
+
+    slower = run_benchmarks(
+        [2], [24], cases=["croston_sba"], repeat=1, log=lambda s: None
+    )
+    slower["results"][0]["wall_s_min"] = 1e6
+    rows = compare(doc, slower)
+    assert len(rows) == 1 and rows[0][3]
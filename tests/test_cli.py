@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.cli import main
+
+
+def _write_extracts(path, rng, skus, n=150):
+    sales, purchase = [], []
+    for sku in skus:
+        dates = pd.Timestamp("2022-01-01") + pd.to_timedelta(
+            np.sort(rng.integers(0, 600, n)), unit="D"
+        )
+        sales.append(
+            pd.DataFrame(
+                {
+                    "Sku__c": sku,
+                    "DeliveredQuantity__c": rng.integers(1, 10, n),
+                    "DeliveryDate__c": dates,
+                }
+            )
+        )
+        purchase.append(
+            pd.DataFrame(
+                {
+                    "IsConfirmed__c": True,
+                    "RestQuantity__c": 0,
+                    "OrderedQuantity__c": 40,
+                    "DeliveredQuantity__c": 40,
+                    "DeliveryDate__c": dates[::10],
+                    "Sku__c": sku,
+                }
+            )
+        )
+    pd.concat(sales).to_csv(path / "sales.csv", index=False)
+    pd.concat(purchase).to_csv(path / "purchase.csv", index=False)
+
+
+def test_cli_only_changed_and_dry_run(tmp_path, capsys):
+    rng = np.random.default_rng(0)
+    _write_extracts(tmp_path, rng, ["A1", "B2", "C3"])
+    argv = [
+        "--sales",
+        str(tmp_path / "sales.csv"),
+        "--purchases",
+        str(tmp_path / "purchase.csv"),
+        "--sku-col",
+        "Sku",
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        "--output-dir",
+        str(tmp_path / "out"),
+        "--steps",
+        "3",
+        "--workers",
+        "2",
+        "--chunk-size",
+        "2",
+        "--only-changed",
+    ]
+
+    assert main(argv + ["--profile"]) == 0
+    first = pd.read_parquet(tmp_path / "out" / "forecast.parquet")
+    assert sorted(first.index.unique()) == ["A1", "B2", "C3"]
+    assert "forecast" in capsys.readouterr().out
+    safety = pd.read_parquet(tmp_path / "out" / "safety_stock.parquet")
+    expected = safety["safety_stock_units"].reindex(first.index)
+    assert (first["safety_stock_units"] == expected).all()
+
+    # only B2's sales change: the dry run plans B2 alone and writes nothing
+    sales = pd.read_csv(tmp_path / "sales.csv")
+    sales.loc[sales["Sku__c"] == "B2", "DeliveredQuantity__c"] += 5
+    sales.to_csv(tmp_path / "sales.csv", index=False)
+    main(argv + ["--dry-run"])
+    assert "would run 1, skipped 2" in capsys.readouterr().out
+
+    main(argv)
+    second = pd.read_parquet(tmp_path / "out" / "forecast.parquet")
+    assert "ran 1, skipped 2" in capsys.readouterr().out
+    assert sorted(second.index.unique()) == ["A1", "B2", "C3"]
+    pd.testing.assert_frame_equal(second.loc[["A1"]], first.loc[["A1"]])
+    assert not np.allclose(
+        second.loc["B2", "y_pred_sba"], first.loc["B2", "y_pred_sba"]
+    )
+
+    # a new output format has no previous files to copy from: rerun everything
+    main(argv + ["--format", "csv"])
+    assert "ran 3, skipped 0" in capsys.readouterr().out
+    third = pd.read_csv(tmp_path / "out" / "forecast.csv", index_col=0)
+    assert sorted(third.index.unique()) == ["A1", "B2", "C3"]
+
+
+def test_cli_requires_input_paths(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(["--output-dir", str(tmp_path / "out")])
+    assert "--sales" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
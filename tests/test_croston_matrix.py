@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from src.forecasting.croston import (
+    croston_sba,
+    croston_sba_matrix,
+    croston_matrix,
+    tsb_matrix,
+)
+
+
+def test_croston_sba_matrix_matches_scalar():
+    rng = np.random.default_rng(1)
+    Y = rng.poisson(0.6, (20, 30)) * rng.integers(1, 20, (20, 30))
+    Y[3] = 0
+    alpha = rng.uniform(0.05, 0.4, 20)
+    idx = pd.date_range("2021-01-31", periods=30, freq="ME")
+
+    fitted, future = croston_sba_matrix(Y, alpha=alpha, h=4)
+
+    assert fitted.shape == (20, 30)
+    assert future.shape == (20, 4)
+    for i in range(len(Y)):
+        f, fu = croston_sba(pd.Series(Y[i], index=idx), alpha=alpha[i], h=4)
+        np.testing.assert_array_equal(fitted[i], f.values)
+        np.testing.assert_array_equal(future[i], fu.values)
+
+
+def test_croston_and_tsb_matrix():
+    Y = np.array([[0, 5, 0, 0, 10, 0], [0, 0, 0, 0, 0, 0]])
+
+    fitted, future = croston_matrix(Y, alpha=0.1, h=3)
+    sba_fitted, _ = croston_sba_matrix(Y, alpha=0.1, h=3)
+    np.testing.assert_allclose(sba_fitted, fitted * 0.95)
+    assert (future[1] == 0).all()
+
+    tsb_fitted, tsb_future = tsb_matrix(Y, alpha=0.1, beta=0.2, h=3)
+    assert tsb_future.shape == (2, 3)
+    assert (tsb_fitted >= 0).all()
+    # probability decays over the trailing zero period
+    assert tsb_fitted[0, -1] < tsb_fitted[0, -2]
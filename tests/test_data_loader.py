@@ -0,0 +1,115 @@
+import os
+import shutil
+
+import pandas as pd
+from src.data_loader import (
+    DATA_DIR,
+    load_data,
+    load_data_fast,
+    load_periodic_totals,
+)
+from src.inventory.demand_reconstruction import reconstruct_demand
+
+
+def test_load_data_fast_matches_csv_loader(tmp_path):
+    sales_df, purchase_df = load_data()
+    sales_fast, purchase_fast = load_data_fast(cache_dir=tmp_path)
+
+    assert list(sales_fast.columns) == ["DeliveryDate", "DeliveredQuantity"]
+    assert purchase_fast["IsConfirmed"].dtype == bool
+    assert len(sales_fast) == len(sales_df)
+    assert len(purchase_fast) == len(purchase_df)
+    assert sales_fast["DeliveredQuantity"].sum() == sales_df["DeliveredQuantity"].sum()
+    pd.testing.assert_series_equal(
+        sales_fast["DeliveryDate"].sort_values(ignore_index=True),
+        sales_df["DeliveryDate"].sort_values(ignore_index=True),
+        check_dtype=False,
+    )
+
+
+def test_load_data_fast_cache_survives_touch(tmp_path):
+    sales_path = tmp_path / "sales.csv"
+    shutil.copy(DATA_DIR / "sample_sales.csv", sales_path)
+    cache_dir = tmp_path / "cache"
+
+    load_data_fast(sales_path=sales_path, cache_dir=cache_dir)
+    cached = sorted(p.name for p in cache_dir.glob("*.parquet"))
+
+    os.utime(sales_path)
+    load_data_fast(sales_path=sales_path, cache_dir=cache_dir)
+    assert sorted(p.name for p in cache_dir.glob("*.parquet")) == cached
+
+
+def test_load_data_fast_date_pushdown(tmp_path):
+    sales_df, _ = load_data_fast(
+        start="2024-01-01", end="2024-06-30", cache_dir=tmp_path
+    )
+
+    assert len(sales_df) > 0
+    assert sales_df["DeliveryDate"].min() >= pd.Timestamp("2024-01-01", tz="UTC")
+    assert sales_df["DeliveryDate"].max() < pd.Timestamp("2024-07-01", tz="UTC")
+
+
+def test_load_data_fast_date_only_end_includes_whole_day(tmp_path):
+    sales_path = tmp_path / "sales.csv"
+    sales_path.write_text(
+        "DeliveryDate,DeliveredQuantity\n"
+        "2024-06-29T23:00:00+0000,1\n"
+        "2024-06-30T00:00:00+0000,2\n"
+        "2024-06-30T17:45:00+0000,4\n"
+        "2024-07-01T00:00:00+0000,8\n"
+    )
+    cache_dir = tmp_path / "cache"
+
+    sales_df, _ = load_data_fast(
+        sales_path=sales_path, end="2024-06-30", cache_dir=cache_dir
+    )
+    assert sales_df["DeliveredQuantity"].sum() == 1 + 2 + 4
+
+    sales_df, _ = load_data_fast(
+        sales_path=sales_path, end="2024-06-30 12:00", cache_dir=cache_dir
+    )
+    assert sales_df["DeliveredQuantity"].sum() == 1 + 2
+
+
+def test_periodic_totals_streaming_matches_full_load():
+    sales_df, purchase_df = load_data()
+    sales_tot, purchase_tot = load_periodic_totals(chunksize=100)
+
+    assert len(sales_tot) < len(sales_df)
+    pd.testing.assert_frame_equal(
+        reconstruct_demand(sales_tot, purchase_tot),
+        reconstruct_demand(sales_df, purchase_df),
+        check_dtype=False,
+    )
+
+
+def test_periodic_totals_parse_confirmed_flags(tmp_path):
+    sales_path = tmp_path / "sales.csv"
+    sales_path.write_text("DeliveryDate,DeliveredQuantity\n2024-01-03,1\n")
+    purchase_path = tmp_path / "purchase.csv"
+    purchase_path.write_text(
+        "IsConfirmed,RestQuantity,OrderedQuantity,DeliveredQuantity,DeliveryDate\n"
+        "true,0,5,5,2024-01-03\n"
+        "false,0,7,7,2024-01-04\n"
+        ",0,9,9,2024-01-05\n"
+        "False,0,11,11,2024-01-06\n"
+        "1,0,13,13,2024-01-07\n"
+        "0,0,17,17,2024-01-08\n"
+    )
+
+    _, purchase_df = load_data(sales_path, purchase_path)
+    assert purchase_df["IsConfirmed"].tolist() == [
+        True,
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+    for chunksize in (2, 100):
+        _, purchase_tot = load_periodic_totals(
+            sales_path, purchase_path, chunksize=chunksize
+        )
+        assert purchase_tot["DeliveredQuantity"].tolist() == [5 + 13]
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
-from src.inventory.demand_reconstruction import reconstruct_demand
+from src.inventory.demand_reconstruction import (
+    reconstruct_demand,
+    reconstruct_demand_fast,
+)
 
 
 def test_demand_reconstruction():
@@ -28,3 +32,41 @@ def test_demand_reconstruction():
     assert "true_demand_est" in inv_df.columns
     assert len(inv_df) == 3
     assert inv_df["sales_served"].iloc[0] == 10
+
+
+def _random_orders(rng, n, start="2022-01-01", days=700):
+    dates = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, n), unit="D")
+    return pd.DataFrame(
+        {"DeliveryDate": dates, "DeliveredQuantity": rng.integers(0, 30, n)}
+    )
+
+
+def test_reconstruct_demand_fast_matches_loop():
+    rng = np.random.default_rng(7)
+    frames_s, frames_p = [], []
+    for sku in ("A1", "B2", "C3"):
+        sales = _random_orders(rng, 150).assign(sku=sku)
+        purchase = _random_orders(rng, 40).assign(
+            sku=sku,
+            IsConfirmed=rng.random(40) > 0.1,
+            RestQuantity=0,
+            OrderedQuantity=30,
+        )
+        frames_s.append(sales)
+        frames_p.append(purchase)
+
+        for freq in ("ME", "W"):
+            ref = reconstruct_demand(sales, purchase, freq=freq)
+            fast = reconstruct_demand_fast(sales, purchase, freq=freq)
+            pd.testing.assert_frame_equal(fast, ref, check_freq=False)
+
+    sales_all = pd.concat(frames_s, ignore_index=True)
+    purchase_all = pd.concat(frames_p, ignore_index=True)
+    panel = reconstruct_demand_fast(sales_all, purchase_all, sku_col="sku")
+
+    assert panel.index.names == ["sku", "date"]
+    for sku, sales, purchase in zip(("A1", "B2", "C3"), frames_s, frames_p):
+        ref = reconstruct_demand(sales, purchase)
+        pd.testing.assert_frame_equal(
+            panel.loc[sku], ref, check_freq=False, check_names=False
+        )
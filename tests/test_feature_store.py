@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from src.feature_engineering import make_time_features
+from src.feature_store import FeatureStore
+from src.forecasting.xgb_model import train_xgb
+
+
+def test_feature_store_incremental_matches_full(tmp_path):
+    idx = pd.date_range("2021-01-31", periods=24, freq="ME")
+    ts = pd.Series(np.random.default_rng(0).poisson(5, 24).astype(float), index=idx)
+
+    store = FeatureStore(tmp_path / "fs")
+    assert store.update("A1", ts.iloc[:18]) == 18
+    assert store.update("A1", ts) == 6
+    assert store.update("A1", ts) == 0
+
+    reopened = FeatureStore(tmp_path / "fs")
+    pd.testing.assert_frame_equal(reopened.features("A1"), make_time_features(ts))
+
+    # a revised history rebuilds the SKU
+    revised = ts.copy()
+    revised.iloc[3] = 42.0
+    reopened.update("A1", revised)
+    reopened.compact()
+    pd.testing.assert_frame_equal(reopened.features("A1"), make_time_features(revised))
+
+
+def test_train_xgb_from_feature_store(tmp_path):
+    idx = pd.date_range("2022-01-31", periods=12, freq="ME")
+    ts = pd.Series([10, 12, 15, 13, 14, 16, 18, 17, 19, 21, 20, 22], index=idx)
+
+    store = FeatureStore(tmp_path / "fs")
+    _, df_store, features = train_xgb(ts, feature_store=store, sku="A1")
+    _, df_ref, _ = train_xgb(ts)
+
+    pd.testing.assert_frame_equal(df_store, df_ref, check_dtype=False)
+    assert "lag1" in features
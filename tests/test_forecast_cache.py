@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+from src.forecasting.cache import ForecastCache
+from src.forecasting.hybrid_forecast import hybrid_forecast
+
+
+def _series(seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    return pd.Series(rng.poisson(4, 24).astype(float), index=idx)
+
+
+def test_hybrid_forecast_cache_hit_and_miss(tmp_path):
+    cache = ForecastCache(tmp_path)
+    ts = _series()
+
+    first, _ = hybrid_forecast(ts, steps=3, cache=cache)
+    second, debug = hybrid_forecast(ts, steps=3, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    pd.testing.assert_series_equal(first, second)
+    assert "xgb_model" in debug
+
+    hybrid_forecast(ts, steps=4, cache=cache)
+    changed = ts.copy()
+    changed.iloc[-1] += 1
+    hybrid_forecast(changed, steps=3, cache=cache)
+    assert cache.misses == 3
+    assert cache.stats()["entries"] == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ForecastCache(tmp_path, max_bytes=10**9)
+    blob = np.zeros(1000)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, blob)
+        os.utime(tmp_path / f"{key}.pkl", (1000 + i, 1000 + i))
+    cache.get("a")  # refresh a, b is now the oldest
+
+    entry = cache.size_bytes() // 3
+    cache.max_bytes = 2 * entry
+    cache.evict()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_cache_tracks_size_and_skips_corrupt_entries(tmp_path, monkeypatch):
+    cache = ForecastCache(tmp_path, max_bytes=10**9)
+    scans = []
+    real_evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda *a: scans.append(a) or real_evict(*a))
+    for i in range(20):
+        cache.put(str(i), np.zeros(100))
+    assert scans == []  # under budget: no directory scans on put
+    assert cache.stats()["entries"] == 20
+    assert cache.stats()["size_bytes"] == cache.size_bytes()
+
+    # over budget: one eviction down to EVICT_TO * max_bytes frees room for
+    # the next few puts
+    cache.max_bytes = cache.size_bytes()
+    cache.put("20", np.zeros(100))
+    cache.put("21", np.zeros(100))
+    assert len(scans) == 1
+    assert cache.stats()["size_bytes"] == cache.size_bytes() <= cache.max_bytes
+
+    (tmp_path / "20.pkl").write_bytes(b"not a pickle")
+    assert cache.get("20") is None
+    assert not (tmp_path / "20.pkl").exists()
+    assert cache.stats()["entries"] == len(list(tmp_path.glob("*.pkl")))
+
+
+def test_cache_key_includes_frequency(tmp_path):
+    cache = ForecastCache(tmp_path)
+    idx = pd.date_range("2022-01-02", periods=40, freq="W-SUN")
+    ts = pd.Series(np.random.default_rng(1).poisson(4, 40).astype(float), index=idx)
+
+    weekly, _ = hybrid_forecast(ts, steps=3, cache=cache, freq="W")
+    daily, _ = hybrid_forecast(ts, steps=3, cache=cache, freq="D")
+    assert cache.misses == 2
+    assert daily.index[0] == idx[-1] + pd.Timedelta(days=1)
+    assert weekly.index[0] == idx[-1] + pd.Timedelta(weeks=1)
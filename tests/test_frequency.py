@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.forecasting.croston import croston_sba, croston_sba_sparse
+from src.forecasting.hybrid_forecast import classify_adi_cv2, hybrid_forecast
+from src.forecasting.sparse import SparseSeries
+from src.forecasting.xgb_model import train_xgb, forecast_xgb, forecast_xgb_fast
+from src.frequency import infer_freq, period_days
+
+
+def _series(freq, n=80, p=0.4, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2023-01-01", periods=n, freq=freq)
+    y = np.where(rng.random(n) < p, rng.integers(1, 10, n), 0).astype(float)
+    return pd.Series(y, index=idx)
+
+
+def test_weekly_and_daily_forecasts():
+    for freq, calendar in (("W", "week"), ("D", "dayofweek")):
+        ts = _series(freq)
+        assert period_days(infer_freq(ts.index)) == (7.0 if freq == "W" else 1.0)
+
+        model, df_model, features = train_xgb(ts)
+        assert calendar in features and "month" not in features
+        ref = forecast_xgb(model, df_model, features, steps=5)
+        fast = forecast_xgb_fast(model, df_model, features, steps=5)
+        assert np.allclose(ref.values, fast.values, atol=1e-5)
+
+        expected = pd.date_range(ts.index[-1], periods=6, freq=freq)[1:]
+        for strategy in ("recursive", "direct"):
+            fc, _ = hybrid_forecast(ts, steps=5, strategy=strategy)
+            assert (fc.index == expected).all()
+
+
+def test_sparse_series_matches_dense():
+    ts = _series("D", n=365, p=0.05, seed=3)
+    sparse = SparseSeries.from_series(ts)
+    assert sparse.nnz == int((ts > 0).sum())
+    assert sparse.nbytes < ts.to_numpy().nbytes / 5
+    assert sparse.to_dense().equals(ts)
+    assert classify_adi_cv2(sparse) == classify_adi_cv2(ts)
+
+    fitted, future = croston_sba(ts, h=4)
+    s_fitted, s_future = croston_sba_sparse(sparse, h=4)
+    assert np.allclose(fitted.loc[s_fitted.index], s_fitted)
+    assert np.allclose(future, s_future) and (future.index == s_future.index).all()
+
+    # raw order lines aggregate straight into the sparse form
+    events = ts[ts > 0]
+    dates = events.index.repeat(2) + pd.Timedelta(hours=6)
+    orders = SparseSeries.from_events(
+        dates, np.repeat(events.values / 2, 2), "D", start=ts.index[0], end=ts.index[-1]
+    )
+    assert np.array_equal(orders.to_dense().values, ts.values)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from src.forecasting.batch_forecast import hybrid_forecast_batch
+from src.forecasting.global_model import train_global_xgb, forecast_global_xgb
+
+
+def _panel():
+    rng = np.random.default_rng(1)
+    frames = []
+    for sku, cat, n in [
+        ("A1", "x", 24),
+        ("B2", "x", 30),
+        ("C3", "y", 20),
+        ("D4", "y", 4),
+    ]:
+        idx = pd.date_range("2022-01-31", periods=n, freq="ME")
+        frames.append(
+            pd.DataFrame(
+                {"sku": sku, "cat": cat, "date": idx, "demand": rng.poisson(5, n)}
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_global_model_one_booster_all_skus():
+    panel = _panel()
+    model, features, sku_info = train_global_xgb(
+        panel, steps=3, category_col="cat", model_kwargs={"n_estimators": 20}
+    )
+    assert {"horizon", "sku_code", "category_code", "ADI", "CV2"} <= set(features)
+
+    preds = forecast_global_xgb(model, panel, features, sku_info, steps=3)
+    assert set(preds["sku"]) == {"A1", "B2", "C3"}
+    assert len(preds) == 3 * 3
+    last_a1 = panel.loc[panel["sku"] == "A1", "date"].max()
+    dates = preds.loc[preds["sku"] == "A1", "date"]
+    assert dates.iloc[0] == last_a1 + pd.offsets.MonthEnd(1)
+    assert not preds["y_pred_xgb"].isna().any()
+
+
+def test_batch_global_mode():
+    forecast_df, debug = hybrid_forecast_batch(
+        _panel(), steps=3, mode="global", model_kwargs={"n_estimators": 20}
+    )
+    assert len(forecast_df) == 4 * 3
+    assert debug["A1"]["xgb_model"] is debug["B2"]["xgb_model"]
+    assert debug["D4"]["w"] == 0.0
+    assert not forecast_df["y_pred_hybrid"].isna().any()
+
+
+def test_global_model_with_zero_demand_sku():
+    panel = _panel()
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    zero = pd.DataFrame({"sku": "Z9", "cat": "y", "date": idx, "demand": 0})
+    panel = pd.concat([panel, zero], ignore_index=True)
+
+    model, features, sku_info = train_global_xgb(
+        panel, steps=3, model_kwargs={"n_estimators": 20}
+    )
+    # infinite ADI/CV2 of a SKU without demand are passed to XGB as missing
+    assert sku_info.loc["Z9", ["ADI", "CV2"]].isna().all()
+    assert np.isfinite(sku_info[["ADI", "CV2"]].fillna(0)).all().all()
+
+    preds = forecast_global_xgb(model, panel, features, sku_info, steps=3)
+    assert not preds["y_pred_xgb"].isna().any()
+    assert "Z9" in set(preds["sku"])
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.forecasting.hierarchy import Hierarchy, hierarchical_forecast, reconcile
+
+
+def _hierarchy(levels=("family", "warehouse"), total=True):
+    mapping = pd.DataFrame(
+        {
+            "sku": list("abcdef"),
+            "family": list("xxxyyy"),
+            "warehouse": list("pqpqpq"),
+        }
+    )
+    return Hierarchy.from_frame(mapping, list(levels), total=total)
+
+
+def test_reconcile_matches_dense_mint_and_is_coherent():
+    h = _hierarchy()
+    S = h.S.toarray()
+    assert S.shape == (11, 6) and (S[0] == 1).all()
+
+    rng = np.random.default_rng(0)
+    crossed = _hierarchy(["family", "warehouse", ("family", "warehouse")])
+    for hier in (h, crossed):
+        S_h = hier.S.toarray()
+        base = pd.DataFrame(rng.random((len(hier.nodes), 3)) * 10, index=hier.nodes)
+        for weights, w in (("ols", np.ones(len(S_h))), ("struct", S_h.sum(axis=1))):
+            W_inv = np.diag(1 / w)
+            P = np.linalg.solve(S_h.T @ W_inv @ S_h, S_h.T @ W_inv)
+            got = reconcile(hier, base, method="mint", weights=weights)
+            assert np.allclose(got.to_numpy(), S_h @ P @ base.to_numpy())
+
+    base = pd.DataFrame(rng.random((len(h.nodes), 3)) * 10, index=h.nodes)
+
+    bottom_up = reconcile(h, base.loc[h.bottom], method="bottom_up")
+    assert np.allclose(bottom_up.loc["family=x"], base.loc[list("abc")].sum())
+
+    shares = pd.Series(1 / 6, index=h.bottom)
+    top_down = reconcile(h, base.loc[["total"]], "top_down", proportions=shares)
+    assert np.allclose(top_down.loc["total"], base.loc["total"])
+
+    with pytest.raises(ValueError):
+        reconcile(h, base.loc[["total"]], method="bottom_up")
+
+
+def test_hierarchical_forecast_end_to_end():
+    h = _hierarchy()
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    rng = np.random.default_rng(1)
+    panel = pd.concat(
+        pd.DataFrame({"sku": sku, "date": idx, "demand": rng.poisson(5, len(idx))})
+        for sku in h.bottom
+    )
+    fc, debug = hierarchical_forecast(
+        panel, h, method="mint", steps=3, model_kwargs={"n_estimators": 20}
+    )
+    wide = fc.pivot(index="node", columns="date", values="y_pred_reconciled")
+    wide = wide.reindex(h.nodes)
+    assert np.allclose(h.S @ wide.loc[h.bottom].to_numpy(), wide.to_numpy())
+    assert fc["y_pred_base"].notna().all()
+    assert set(debug["base"]["sku"]) == set(h.nodes)
+
+
+def test_top_down_without_total_node_raises():
+    h = _hierarchy(total=False)
+    idx = pd.date_range("2022-01-31", periods=12, freq="ME")
+    panel = pd.concat(
+        pd.DataFrame({"sku": sku, "date": idx, "demand": 1.0}) for sku in h.bottom
+    )
+    with pytest.raises(ValueError, match="total"):
+        hierarchical_forecast(panel, h, method="top_down", steps=2)
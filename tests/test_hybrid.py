@@ -1,5 +1,12 @@
+import numpy as np
 import pandas as pd
-from src.forecasting.hybrid_forecast import hybrid_forecast
+import pytest
+from src.forecasting.hybrid_forecast import (
+    automatic_hybrid_weight,
+    automatic_hybrid_weight_panel,
+    classify_adi_cv2_panel,
+    hybrid_forecast,
+)
 
 
 def test_hybrid_forecast_output():
@@ -12,3 +19,52 @@ def test_hybrid_forecast_output():
     assert "w" in debug
     assert debug["w"] > 0
     assert not future.isna().any()
+
+
+def test_hybrid_forecast_direct_strategy():
+    idx = pd.date_range("2023-01-31", periods=12, freq="ME")
+    demand_ts = pd.Series([0, 5, 0, 10, 0, 3, 0, 12, 0, 5, 0, 1], index=idx)
+
+    future, debug = hybrid_forecast(demand_ts, steps=4, strategy="direct")
+
+    assert len(future) == 4
+    assert debug["strategy"] == "direct"
+    assert not future.isna().any()
+
+    # a fitted (e.g. warm-started) recursive model must not be dropped silently
+    _, recursive = hybrid_forecast(demand_ts, steps=4)
+    with pytest.raises(ValueError, match="direct"):
+        hybrid_forecast(
+            demand_ts, steps=4, strategy="direct", xgb_model=recursive["xgb_model"]
+        )
+
+
+def test_panel_classification_matches_per_series():
+    rng = np.random.default_rng(4)
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    series = {
+        "smooth": pd.Series(rng.integers(5, 8, 24), index=idx),
+        "lumpy": pd.Series((rng.random(24) < 0.3) * rng.integers(1, 50, 24), index=idx),
+        "empty": pd.Series(np.zeros(24), index=idx),
+    }
+    panel = pd.concat(
+        pd.DataFrame({"sku": sku, "date": idx, "demand": ts.values})
+        for sku, ts in series.items()
+    )
+    abc = {"smooth": "A", "lumpy": "C"}
+
+    table = automatic_hybrid_weight_panel(panel, abc_class=abc)
+
+    for sku, ts in series.items():
+        w, info = automatic_hybrid_weight(ts, abc_class=abc.get(sku, "A"))
+        assert table.loc[sku, "class"] == info["class"]
+        assert table.loc[sku, "w"] == pytest.approx(w)
+        assert table.loc[sku, "ADI"] == pytest.approx(info["ADI"])
+    assert table.loc["empty", "route"] == "croston"
+    assert table.loc["smooth", "route"] == "hybrid"
+
+    # the same SKUs as a NaN-padded array
+    Y = np.full((3, 30), np.nan)
+    Y[:, 6:] = np.vstack([ts.values for ts in series.values()])
+    array_table = classify_adi_cv2_panel(Y, index=list(series))
+    assert (array_table["class"] == table.loc[list(series), "class"]).all()
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = (
+    "xgboost",
+    "mlflow",
+    "matplotlib",
+    "statsmodels",
+    "sklearn",
+    "scipy.signal",
+    "scipy.special",
+)
+# pandas alone accounts for most of this; eager xgboost/mlflow took seconds
+IMPORT_BUDGET_S = 2.0
+
+SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import src.forecasting, src.inventory, src.serving
+import src.mlops.train_pipeline, src.mlops.batch_runner
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {HEAVY!r} if m in sys.modules]}}))
+"""
+
+
+def test_package_import_is_light():
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_S
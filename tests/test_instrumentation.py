@@ -0,0 +1,24 @@
+import json
+
+import pytest
+from src.mlops.instrumentation import StageTimer
+
+
+def test_stage_timer_trace_and_profiles(tmp_path):
+    timer = StageTimer(profile_dir=tmp_path / "profiles")
+    with timer.stage("load"):
+        sum(range(10000))
+    with pytest.raises(RuntimeError):
+        with timer.stage("forecast"):
+            raise RuntimeError("boom")
+
+    assert [s["status"] for s in timer.stages] == ["ok", "error"]
+    metrics = timer.metrics()
+    assert {"stage_load_wall_s", "stage_load_cpu_s", "stage_load_peak_rss_mb"} <= set(
+        metrics
+    )
+    assert metrics["stage_load_peak_rss_mb"] > 0
+    assert (tmp_path / "profiles" / "load.prof").exists()
+
+    trace = json.loads(timer.save(tmp_path / "trace.json").read_text())
+    assert [s["stage"] for s in trace["stages"]] == ["load", "forecast"]
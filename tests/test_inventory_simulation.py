@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
-from src.inventory.inventory_simulation import simulate_inventory_with_rop
+from src.inventory.inventory_simulation import (
+    simulate_inventory_with_rop,
+    simulate_inventory_monte_carlo,
+)
 
 
 def test_inventory_simulation():
@@ -26,3 +30,37 @@ def test_inventory_simulation():
     assert len(sim_df) == 3
     assert "recommended_order" in sim_df.columns
     assert (sim_df["inv_end"] >= 0).all()
+
+
+def test_monte_carlo_simulation():
+    history_df = pd.DataFrame(
+        {"inv_end": [10, 0, 5, 3]},
+        index=pd.date_range("2023-01-31", periods=4, freq="ME"),
+    )
+    forecast_series = pd.Series(
+        [10, 12, 14, 9, 20, 3],
+        index=pd.date_range("2023-05-31", periods=6, freq="ME"),
+    )
+
+    # without noise every scenario follows the deterministic path
+    det = simulate_inventory_with_rop(history_df, forecast_series, 5, 45, lot_size=4)
+    res = simulate_inventory_monte_carlo(
+        history_df, forecast_series, 5, 45, lot_size=4, demand_cv=0, n_scenarios=8
+    )
+    summary = res["period_summary"]
+    np.testing.assert_allclose(summary["order_qty_p50"], det["recommended_order"])
+    np.testing.assert_allclose(summary["inv_end_p50"], det["inv_end"])
+
+    res = simulate_inventory_monte_carlo(
+        history_df,
+        forecast_series,
+        5,
+        45,
+        n_scenarios=500,
+        lead_time_std_days=10,
+        seed=0,
+    )
+    assert 0 <= res["fill_rate_mean"] <= 1
+    assert 0 <= res["stockout_probability"] <= 1
+    assert len(res["period_summary"]) == 6
+    assert (res["period_summary"]["stockout_prob"].between(0, 1)).all()
@@ -0,0 +1,75 @@
+import os
+
+import mlflow
+import pandas as pd
+import pytest
+from mlflow import MlflowClient
+from src.mlops.mlflow_utils import AsyncMlflowLogger, link_artifact, log_metrics
+
+
+def test_async_logger_flushes_batches_and_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file:{tmp_path / 'mlruns'}")
+    with mlflow.start_run() as run:
+        run_id = run.info.run_id
+        log_metrics({"MAE": 1.5, "class": "X"})
+        with AsyncMlflowLogger(
+            run_id, max_pending=1, artifact_dir=tmp_path / "artifacts"
+        ) as tracker:
+            tracker.log_params({f"p{i}": i for i in range(150)})
+            tracker.log_metrics({"MAPE": 12.0, "reason": "none"})
+            tracker.log_dataframe(pd.DataFrame({"a": [1, 2]}), "frame")
+            tracker.log_series(pd.Series([1.0], name="y"), "series")
+
+        failing = AsyncMlflowLogger(run_id)
+        failing.log_file(tmp_path / "missing.csv")
+        with pytest.raises(Exception):
+            failing.close()
+
+    data = MlflowClient().get_run(run_id).data
+    assert data.metrics == {"MAE": 1.5, "MAPE": 12.0}
+    assert len(data.params) == 150
+    artifacts = {a.path for a in MlflowClient().list_artifacts(run_id)}
+    assert {"frame.csv", "series.csv"} <= artifacts
+
+
+def test_link_artifact_hardlinks_into_local_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file:{tmp_path / 'mlruns'}")
+    src = tmp_path / "forecast.parquet"
+    src.write_bytes(b"data")
+    with mlflow.start_run() as run:
+        dest = link_artifact(src, run.info.run_id)
+    assert dest is not None
+    assert os.path.samefile(dest, src)
+
+
+def test_async_logger_defers_tracking_writes_and_cleans_up_on_error(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file:{tmp_path / 'mlruns'}")
+    client = MlflowClient()
+    with mlflow.start_run() as run:
+        run_id = run.info.run_id
+        tracker = AsyncMlflowLogger(run_id, artifact_dir=tmp_path / "artifacts")
+        with pytest.raises(RuntimeError):
+            with tracker:
+                tracker.log_metrics({"MAE": 1.0})
+                tracker.log_metrics({"MAE": 2.0})
+                tracker.log_dataframe(pd.DataFrame({"a": [1]}), "partial")
+                # nothing is written to the store until the flush
+                assert client.get_run(run_id).data.metrics == {}
+                raise RuntimeError("stage failed")
+
+    # the queued upload finished and the pool no longer accepts work
+    artifacts = {a.path for a in client.list_artifacts(run_id)}
+    assert "partial.csv" in artifacts
+    with pytest.raises(RuntimeError):
+        tracker.log_file(tmp_path / "artifacts" / "partial.csv")
+
+    tracker = AsyncMlflowLogger(run_id)
+    tracker.log_metrics({"MAE": 1.0})
+    tracker.log_metrics({"MAE": 2.0})
+    tracker.close()
+    assert client.get_run(run_id).data.metrics == {"MAE": 2.0}
@@ -0,0 +1,88 @@
+import pandas as pd
+from src.forecasting.xgb_model import DEFAULT_MODEL_KWARGS, train_xgb, update_xgb
+from src.mlops import persist
+
+
+def test_model_roundtrip_with_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(persist, "ARTIFACT_DIR", tmp_path)
+    assert persist.load_model("xgb_model.pkl") is None
+    assert persist.load_model_metadata("xgb_model.pkl") == {}
+
+    idx = pd.date_range("2022-01-31", periods=12, freq="ME")
+    demand_ts = pd.Series([10, 12, 15, 13, 14, 16, 18, 17, 19, 21, 20, 22], index=idx)
+    model, df_model, features = train_xgb(demand_ts)
+
+    persist.save_model(model, "xgb_model.pkl", metadata={"warm_rounds": 2})
+
+    loaded = persist.load_model("xgb_model.pkl")
+    assert (
+        loaded.predict(df_model[features]) == model.predict(df_model[features])
+    ).all()
+    assert persist.load_model_metadata("xgb_model.pkl") == {"warm_rounds": 2}
+
+
+def test_binary_artifacts_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(persist, "ARTIFACT_DIR", tmp_path)
+    idx = pd.date_range("2022-01-31", periods=12, freq="ME", name="date")
+    demand_ts = pd.Series(range(12), index=idx, dtype=float, name="y_pred_hybrid")
+    frame = pd.DataFrame({"inv_end": demand_ts * 2, "ROP": 3.0}, index=idx)
+
+    for ext in ("parquet", "arrow"):
+        persist.save_series(demand_ts, f"forecast.{ext}")
+        pd.testing.assert_series_equal(
+            persist.load_series(f"forecast.{ext}"), demand_ts, check_freq=False
+        )
+        first = persist.save_dataframe(frame, f"simulation.{ext}")
+        linked = tmp_path / f"linked.{ext}"
+        linked.hardlink_to(first)
+        persist.save_dataframe(frame * 2, f"simulation.{ext}")
+        # rewritten by replacement, so an earlier hardlink keeps its content
+        pd.testing.assert_frame_equal(
+            persist.load_dataframe(f"linked.{ext}"), frame, check_freq=False
+        )
+
+    model, df_model, features = train_xgb(demand_ts)
+    persist.save_model(model, "xgb_model.ubj")
+    loaded = persist.load_model("xgb_model.ubj")
+    assert (
+        loaded.predict(df_model[features]) == model.predict(df_model[features])
+    ).all()
+
+
+def test_booster_params_survive_warm_update(tmp_path, monkeypatch):
+    monkeypatch.setattr(persist, "ARTIFACT_DIR", tmp_path)
+    idx = pd.date_range("2022-01-31", periods=18, freq="ME")
+    demand_ts = pd.Series(range(18), index=idx, dtype=float)
+    kwargs = {**DEFAULT_MODEL_KWARGS, "max_depth": 2}
+    model, _, _ = train_xgb(demand_ts.iloc[:12], model_kwargs=kwargs)
+
+    persist.save_model(model, "xgb_model.ubj", metadata={"warm_rounds": 0})
+    loaded = persist.load_model("xgb_model.ubj")
+    assert persist.load_model_metadata("xgb_model.ubj")["warm_rounds"] == 0
+
+    warm, _, _ = update_xgb(loaded, demand_ts, since=idx[11], n_estimators=5)
+    params = warm.get_params()
+    for key in ("max_depth", "learning_rate", "subsample", "random_state"):
+        assert params[key] == kwargs[key]
+    assert params["n_estimators"] == 5
+
+
+def test_multiindex_frames_roundtrip_in_every_table_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(persist, "ARTIFACT_DIR", tmp_path)
+    idx = pd.date_range("2022-01-31", periods=4, freq="ME")
+    index = pd.MultiIndex.from_product([["A", "B"], idx], names=["sku", "date"])
+    frame = pd.DataFrame({"inv_end": range(8), "ROP": 3.0}, index=index)
+
+    for suffix in persist.TABLE_FORMATS:
+        name = f"inventory_history{suffix}"
+        persist.save_dataframe(frame, name)
+        loaded = persist.load_dataframe(name)
+        if suffix == ".csv":  # CSV does not keep dtypes
+            loaded.index = loaded.index.set_levels(
+                pd.to_datetime(loaded.index.levels[1]), level="date"
+            )
+        pd.testing.assert_frame_equal(loaded, frame, check_dtype=suffix != ".csv")
+
+        # a later single-index save of the same name loads as such again
+        persist.save_dataframe(frame.loc["A"], name)
+        assert persist.load_dataframe(name).index.nlevels == 1
@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-from src.inventory.safety_stock import compute_safety_stock
+import pytest
+from src.inventory.safety_stock import compute_safety_stock, compute_safety_stock_panel
 
 
 def test_safety_stock():
@@ -12,3 +14,55 @@ def test_safety_stock():
 
     assert ss > 0
     assert ss < 1000
+
+
+def _panel_inv():
+    idx = pd.date_range("2023-01-31", periods=6, freq="ME")
+    frames = {
+        "A": [10, 15, 12, 20, 17, 19],
+        "B": [0, 3, 0, 0, 8, 1],
+        "C": [100, 90, 120, 110, 95, 105],
+    }
+    return pd.concat(
+        {
+            sku: pd.DataFrame({"true_demand_est": v}, index=idx)
+            for sku, v in frames.items()
+        },
+        names=["sku", "date"],
+    )
+
+
+def test_safety_stock_panel_matches_scalar_and_targets():
+    inv_all = _panel_inv()
+    table = compute_safety_stock_panel(
+        inv_all, lead_time_days=7, tolerance_early_days=2, tolerance_late_days=1
+    )
+    for sku in ("A", "B", "C"):
+        ref = compute_safety_stock(inv_all.loc[sku], 7, 2, 1)
+        assert np.isclose(table.loc[sku, "safety_stock_units"], ref)
+
+    fill = compute_safety_stock_panel(inv_all, lead_time_days=7, target_fill_rate=0.98)
+    assert (fill["expected_fill_rate"] >= 0.98 - 1e-9).all()
+    # tighter targets never need less stock
+    fill_99 = compute_safety_stock_panel(
+        inv_all, lead_time_days=7, target_fill_rate=0.99
+    )
+    assert (fill_99["z"] >= fill["z"]).all()
+
+    costs = pd.Series({"A": 1.0, "B": 1.0, "C": 5.0})
+    budget = compute_safety_stock_panel(
+        inv_all, lead_time_days=7, budget_cost=100.0, unit_cost=costs
+    )
+    spent = (budget["safety_stock_units"] * costs).sum()
+    assert np.isclose(spent, 100.0, rtol=1e-6)
+    assert budget.loc["C", "z"] < budget.loc["A", "z"]
+
+
+def test_safety_stock_panel_rejects_missing_per_sku_values():
+    inv_all = _panel_inv()
+    with pytest.raises(ValueError, match="lead_time_days .* B"):
+        compute_safety_stock_panel(inv_all, lead_time_days={"A": 7, "C": 7})
+    with pytest.raises(ValueError, match="unit_cost"):
+        compute_safety_stock_panel(
+            inv_all, budget_cost=100.0, unit_cost=pd.Series({"A": 1.0, "B": 1.0})
+        )
@@ -0,0 +1,131 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.forecasting.batch_forecast import hybrid_forecast_batch
+from src.serving import ForecastService, make_server
+
+
+def _panel():
+    rng = np.random.default_rng(2)
+    frames = []
+    for i, n in enumerate([24, 30, 18, 4]):
+        idx = pd.date_range("2022-01-31", periods=n, freq="ME")
+        frames.append(
+            pd.DataFrame({"sku": f"S{i}", "date": idx, "demand": rng.poisson(5, n)})
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_service_matches_batch_and_micro_batches():
+    panel = _panel()
+    service = ForecastService.from_panel(panel, max_wait_ms=50)
+    expected, _ = hybrid_forecast_batch(panel, steps=4)
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(
+            pool.map(lambda s: service.forecast(s, steps=4), ["S0", "S1", "S2", "S3"])
+        )
+
+    for res in results:
+        ref = expected[expected["sku"] == res["sku"]]
+        np.testing.assert_allclose(
+            res["y_pred_hybrid"], ref["y_pred_hybrid"], rtol=1e-6
+        )
+    assert results[3]["w"] == 0.0
+    assert max(service.batch_sizes) > 1
+
+    what_if = service.forecast("S0", steps=4, overrides={"2024-01-31": 80})
+    assert what_if["dates"][0].startswith("2024-02-29")
+    assert service.stats()["p99_ms"] >= service.stats()["p50_ms"] > 0
+
+
+def test_http_api():
+    service = ForecastService.from_panel(_panel(), models=None)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        res = json.load(urlopen(f"{base}/forecast/S1?steps=3"))
+        assert len(res["y_pred_hybrid"]) == 3
+
+        req = Request(
+            f"{base}/forecast",
+            data=json.dumps(
+                {"sku": "S1", "steps": 2, "overrides": {"2024-07-31": 0}}
+            ).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        assert len(json.load(urlopen(req))["dates"]) == 2
+        assert json.load(urlopen(f"{base}/metrics"))["n_requests"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_zero_demand_sku_is_routed_to_croston_like_batch():
+    panel = _panel()
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    zero = pd.DataFrame({"sku": "Z", "date": idx, "demand": 0})
+    panel = pd.concat([panel, zero], ignore_index=True)
+    expected, _ = hybrid_forecast_batch(panel, steps=3)
+
+    shared = ForecastService.from_panel(_panel()).states["S0"]["model"]
+    for models in (None, shared):
+        with ForecastService.from_panel(panel, models=models) as service:
+            res = service.forecast("Z", steps=3)
+            what_if = service.forecast("Z", steps=3, overrides={"2022-03-31": 0})
+        ref = expected[expected["sku"] == "Z"]
+        assert res["w"] == what_if["w"] == ref["w"].iloc[0] == 0.0
+        assert res["y_pred_xgb"] == [0.0] * 3
+        np.testing.assert_allclose(res["y_pred_hybrid"], ref["y_pred_hybrid"])
+
+
+def test_closed_service_answers_http_500():
+    service = ForecastService.from_panel(_panel())
+    service.close()
+    assert not service._worker.is_alive()
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(HTTPError) as err:
+            urlopen(f"http://127.0.0.1:{server.server_port}/forecast/S1")
+        assert err.value.code == 500
+        assert "closed" in json.load(err.value)["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_404_only_for_unknown_skus(monkeypatch):
+    service = ForecastService.from_panel(_panel())
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    def broken(sku, overrides):
+        raise KeyError("true_demand_est")
+
+    monkeypatch.setattr(service, "what_if_state", broken)
+    try:
+        with pytest.raises(HTTPError) as err:
+            urlopen(f"{base}/forecast/nope")
+        assert err.value.code == 404
+
+        req = Request(
+            f"{base}/forecast",
+            data=json.dumps({"sku": "S1", "overrides": {"2024-07-31": 0}}).encode(),
+        )
+        with pytest.raises(HTTPError) as err:
+            urlopen(req)
+        assert err.value.code == 500
+        assert "KeyError" in json.load(err.value)["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
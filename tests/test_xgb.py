@@ -1,5 +1,14 @@
+import numpy as np
 import pandas as pd
-from src.forecasting.xgb_model import train_xgb, forecast_xgb
+from src.forecasting.xgb_model import (
+    _RollingWindows,
+    train_xgb,
+    forecast_xgb,
+    forecast_xgb_fast,
+    train_xgb_direct,
+    forecast_xgb_direct,
+    update_xgb,
+)
 
 
 def test_xgb_training_and_forecast():
@@ -15,3 +24,78 @@ def test_xgb_training_and_forecast():
     future = forecast_xgb(model, df_model, features, steps=3)
     assert len(future) == 3
     assert not future.isna().any()
+
+
+def test_xgb_direct_training_and_forecast():
+    idx = pd.date_range("2022-01-31", periods=24, freq="ME")
+    demand_ts = pd.Series(
+        [10, 12, 15, 13, 14, 16, 18, 17, 19, 21, 20, 22] * 2, index=idx
+    )
+
+    model, df_model, features = train_xgb_direct(demand_ts, steps=3)
+    assert "horizon" in features
+
+    future = forecast_xgb_direct(model, demand_ts, features, steps=3)
+    assert len(future) == 3
+    assert future.index[0] == pd.Timestamp("2024-01-31")
+    assert not future.isna().any()
+
+
+def test_xgb_fast_rollout_matches_reference():
+    idx = pd.date_range("2022-01-31", periods=20, freq="ME")
+    demand_ts = pd.Series([3, 0, 5, 8, 2, 0, 7, 9, 4, 1] * 2, index=idx)
+
+    model, df_model, features = train_xgb(demand_ts)
+    ref = forecast_xgb(model, df_model, features, steps=5)
+    fast = forecast_xgb_fast(model, df_model, features, steps=5)
+    pd.testing.assert_series_equal(fast, ref, check_freq=False)
+
+    # non-default lags/windows are supported by the fast path only
+    model, df_model, features = train_xgb(demand_ts, lags=(1, 4), roll_windows=(2,))
+    future = forecast_xgb_fast(model, df_model, features, steps=5)
+    assert len(future) == 5
+    assert not future.isna().any()
+
+
+def test_xgb_warm_start_update():
+    idx = pd.date_range("2022-01-31", periods=15, freq="ME")
+    demand_ts = pd.Series(
+        [10, 12, 15, 13, 14, 16, 18, 17, 19, 21, 20, 22, 23, 21, 24], index=idx
+    )
+
+    model, _, _ = train_xgb(demand_ts.iloc[:13])
+    n_trees = model.get_booster().num_boosted_rounds()
+
+    warm, df_model, features = update_xgb(
+        model, demand_ts, since=idx[12], n_estimators=10
+    )
+    assert warm.get_booster().num_boosted_rounds() == n_trees + 10
+    assert df_model["date"].iloc[-1] == idx[-1]
+
+    # nothing new since the last training date -> model is reused as is
+    same, _, _ = update_xgb(warm, demand_ts, since=idx[-1])
+    assert same is warm
+
+
+def test_rolling_windows_are_exact_at_large_levels():
+    rng = np.random.default_rng(4)
+    values = 1e9 + rng.integers(0, 4, size=(3, 12)).astype(float)
+    seed = values[:, :6].copy()
+    seed[1, :4] = np.nan  # a short series, padded on the left
+    windows = _RollingWindows(seed, [3, 6])
+    out = np.empty(3)
+
+    history = [seed[:, j] for j in range(6)]
+    for j in range(6, 12):
+        windows.push(values[:, j])
+        history.append(values[:, j])
+        for w in (3, 6):
+            recent = np.column_stack(history[-w:])
+            np.testing.assert_allclose(
+                windows.mean(w, out), np.nanmean(recent, axis=1), rtol=1e-12
+            )
+            np.testing.assert_allclose(
+                windows.std(w, out), np.nanstd(recent, axis=1), atol=1e-6
+            )
+            assert (windows.extreme(w, np.fmin, out) == np.nanmin(recent, axis=1)).all()
+            assert (windows.extreme(w, np.fmax, out) == np.nanmax(recent, axis=1)).all()